@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+from .routes import activity_logs, activity_rollups, calendar, notifications
+
+api_router = APIRouter()
+
+api_router.include_router(activity_logs.router)
+api_router.include_router(activity_rollups.router)
+api_router.include_router(calendar.router)
+api_router.include_router(notifications.router)
@@ -0,0 +1,74 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from ....core.activity_stream import activity_stream_hub, is_stream_id, StreamOverflow
+from ....core.config import settings
+from ....core.log_search import LogSearchError, build_search_params
+from ....core.loggers import get_log_search_client
+from ....core.security import Principal, require_dashboard_access
+from ....schemas.activity_logs import ActionType
+from ....schemas.logs import ActivityLogFilters, ActivityLogTotalCountListResponseSchema
+from ....utils.responses import bad_request_response, service_unavailable_response
+
+router = APIRouter(prefix="/activity-logs", tags=["Activity Logs"])
+
+
+@router.get("/stream")
+async def stream_activity_logs(
+    request: Request,
+    user_uuid: Optional[str] = Query(None, description="Only stream actions by this user"),
+    entity: Optional[str] = Query(None, description="Only stream actions on this entity type"),
+    action: Optional[ActionType] = Query(None, description="Only stream this action type"),
+    last_event_id: Optional[str] = Query(None, description="Resume after this stream event ID"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    principal: Principal = Depends(require_dashboard_access),
+):
+    """
+    Live tail of activity logs as Server-Sent Events.
+    Reconnecting clients resume from the Last-Event-ID they last saw.
+    """
+    filters = {"user_uuid": user_uuid, "entity": entity, "action": action}
+    resume_from = last_event_id or last_event_id_header
+    if resume_from and not is_stream_id(resume_from):
+        return bad_request_response("Last-Event-ID must be a stream entry ID such as 1700000000000-0")
+
+    async def event_source():
+        try:
+            async for event in activity_stream_hub.tail(filters, resume_from):
+                if await request.is_disconnected():
+                    break
+                yield activity_stream_hub.to_sse(event)
+        except StreamOverflow:
+            # Client reconnects with its Last-Event-ID and catches up
+            yield b"event: overflow\ndata: {}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/search", response_model=ActivityLogTotalCountListResponseSchema)
+async def search_activity_logs(
+    filters: ActivityLogFilters = Depends(),
+    principal: Principal = Depends(require_dashboard_access),
+):
+    """Search indexed logs (Meilisearch or the local SQLite index)."""
+    client = get_log_search_client()
+    if client is None:
+        return service_unavailable_response("Log search is not configured")
+    try:
+        query, opt_params = build_search_params(filters)
+        # Both clients are synchronous
+        result = await run_in_threadpool(client.index(settings.MEILI_SEARCH_INDEX).search, query, opt_params)
+    except LogSearchError as exc:
+        return bad_request_response(str(exc))
+    return ActivityLogTotalCountListResponseSchema(
+        status=200,
+        detail="Logs fetched successfully",
+        total_count=result.get("estimatedTotalHits", len(result["hits"])),
+        data=result["hits"],
+    )
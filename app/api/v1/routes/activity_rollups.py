@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ....core.security import Principal, require_dashboard_access
+from ....cruds.activity_rollups import activity_rollup_crud, to_utc
+from ....database.database import get_async_session
+from ....schemas.activity_rollups import (
+    ActiveUserListResponseSchema,
+    ActivityRollupFilters,
+    ActivityRollupListResponseSchema,
+)
+from ....utils.responses import bad_request_response
+
+router = APIRouter(prefix="/activity-rollups", tags=["Activity Rollups"])
+
+
+def _window(filters: ActivityRollupFilters):
+    start, end = to_utc(filters.start_date), to_utc(filters.end_date)
+    if start >= end:
+        return bad_request_response("start_date must be before end_date")
+    return start, end
+
+
+@router.get("", response_model=ActivityRollupListResponseSchema)
+async def get_activity_rollups(
+    filters: ActivityRollupFilters = Depends(),
+    principal: Principal = Depends(require_dashboard_access),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Action counts per entity and bucket, read from the rollup tables."""
+    start, end = _window(filters)
+    rows = await activity_rollup_crud.actions_per_entity(
+        db, start, end, granularity=filters.granularity, entity=filters.entity, action=filters.action
+    )
+    return ActivityRollupListResponseSchema(status=200, detail="Activity rollups fetched successfully", data=rows)
+
+
+@router.get("/active-users", response_model=ActiveUserListResponseSchema)
+async def get_most_active_users(
+    filters: ActivityRollupFilters = Depends(),
+    principal: Principal = Depends(require_dashboard_access),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Users with the most actions in the window (daily rollups)."""
+    start, end = _window(filters)
+    rows = await activity_rollup_crud.most_active_users(
+        db, start, end, limit=filters.limit or 10, entity=filters.entity
+    )
+    return ActiveUserListResponseSchema(status=200, detail="Most active users fetched successfully", data=rows)
@@ -0,0 +1,87 @@
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ....core.calendar_feed import calendar_feed
+from ....core.config import settings
+from ....core.security import Principal, get_current_principal, load_user_flags
+from ....database.database import get_async_session
+from ....schemas.meetings import CalendarFeedURLResponseSchema, CalendarFeedURLSchema
+from ....utils.responses import not_found_response
+
+router = APIRouter(prefix="/calendar", tags=["Calendar"])
+
+ICS_MEDIA_TYPE = "text/calendar; charset=utf-8"
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+async def _feed_response(request: Request, db: AsyncSession, user_uuid: str) -> Response:
+    etag = await calendar_feed.version(db, user_uuid)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    body = await calendar_feed.cached(user_uuid, etag)
+    if body is not None:
+        return Response(body, media_type=ICS_MEDIA_TYPE, headers=headers)
+    # Release the request's connection; the stream opens its own session
+    await db.close()
+    return StreamingResponse(calendar_feed.stream(user_uuid, etag), media_type=ICS_MEDIA_TYPE, headers=headers)
+
+
+@router.get("/feed.ics")
+async def get_my_calendar_feed(
+    request: Request,
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """The current user's meetings as iCalendar; honours If-None-Match."""
+    return await _feed_response(request, db, principal.user_uuid)
+
+
+def _feed_url_response(user_uuid: str, token: str, detail: str) -> CalendarFeedURLResponseSchema:
+    url = f"{settings.BASE_API_URL}/api/v1/calendar/{user_uuid}/feed.ics?token={token}"
+    return CalendarFeedURLResponseSchema(status=200, detail=detail, data=CalendarFeedURLSchema(url=url))
+
+
+@router.get("/feed-url", response_model=CalendarFeedURLResponseSchema)
+async def get_calendar_feed_url(
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Subscription URL for calendar apps, which cannot send a bearer token."""
+    token = await calendar_feed.current_token(db, principal.user_uuid)
+    return _feed_url_response(principal.user_uuid, token, "Calendar feed URL")
+
+
+@router.post("/feed-url/rotate", response_model=CalendarFeedURLResponseSchema)
+async def rotate_calendar_feed_url(
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Issue a new subscription URL; the previous one stops working."""
+    token = await calendar_feed.rotate_token(db, principal.user_uuid)
+    return _feed_url_response(principal.user_uuid, token, "Calendar feed URL rotated")
+
+
+@router.get("/{user_uuid}/feed.ics")
+async def get_calendar_feed(
+    request: Request,
+    user_uuid: str,
+    token: str = Query(..., description="Feed token from /calendar/feed-url"),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """A user's meetings as iCalendar, authenticated by the feed token."""
+    if not await calendar_feed.verify_token(db, user_uuid, token):
+        return not_found_response("Calendar feed not found")
+    flags = await load_user_flags(db, user_uuid)
+    if flags is None or not flags[0]:
+        return not_found_response("Calendar feed not found")
+    return await _feed_response(request, db, user_uuid)
@@ -0,0 +1,35 @@
+import jwt
+from fastapi import APIRouter, Depends, Query, WebSocket, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ....core.notifications import notification_hub
+from ....core.security import authenticate_token, token_cache
+from ....database.database import get_async_session
+
+router = APIRouter(prefix="/notifications", tags=["Notifications"])
+
+
+@router.websocket("/ws")
+async def notifications_socket(
+    websocket: WebSocket,
+    token: str = Query(..., description="Access token"),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Live notifications for the current user. Each frame is a JSON array of
+    {"kind", "data", "sent_at"} events. Closed with 1013 when the client
+    falls behind (reconnect and refetch), and with 1008 once the token
+    expires or is revoked (reconnect with a fresh token).
+    """
+    principal = await authenticate_token(db, token)
+    # Do not hold a database connection for the life of the socket
+    await db.close()
+    try:
+        # Served from the token cache; the hub closes the socket at `exp`
+        claims = token_cache.decode(token) if principal is not None else None
+    except jwt.InvalidTokenError:
+        claims = None
+    if claims is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Not authenticated")
+        return
+    await notification_hub.serve(websocket, principal.user_uuid, claims)
@@ -0,0 +1,105 @@
+"""
+Cost of authenticating a request with and without the token and
+principal caches. Requests pick one of --users access tokens with a
+Zipf-like skew (a few users make most requests). Token decoding is
+timed with plain JWT verification and through TokenCache; principal
+flags are loaded through load_user_flags against a simulated database
+round trip of --db-ms, with the principal cache off (TTL 0) and on.
+
+Usage:
+    python -m app.commands.auth_cache_benchmark --users 5000 --requests 200000 --db-ms 1
+"""
+import argparse
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+from typing import List
+
+from app.core.config import settings
+from app.core.security import (
+    TokenCache,
+    create_access_token,
+    decode_access_token,
+    load_user_flags,
+    principal_cache,
+)
+
+
+class _SimulatedSession:
+    """Stands in for AsyncSession: every query costs one round trip."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.queries = 0
+
+    async def execute(self, _query):
+        self.queries += 1
+        await asyncio.sleep(self.latency)
+        row = SimpleNamespace(is_active=True, is_verified=True, soft_deleted=False)
+        return SimpleNamespace(first=lambda: row)
+
+
+def _workload(users: int, requests: int) -> List[int]:
+    weights = [1 / rank for rank in range(1, users + 1)]
+    return random.choices(range(users), weights=weights, k=requests)
+
+
+def bench_tokens(tokens: List[str], picks: List[int], cache_size: int) -> None:
+    started = time.perf_counter()
+    for index in picks:
+        decode_access_token(tokens[index])
+    plain = time.perf_counter() - started
+
+    cache = TokenCache(max_entries=cache_size)
+    started = time.perf_counter()
+    for index in picks:
+        cache.decode(tokens[index])
+    cached = time.perf_counter() - started
+
+    print(f"{'token decode':<22}{'us/request':>12}{'requests/s':>13}{'hit rate':>10}")
+    print(f"{'jwt.decode':<22}{plain / len(picks) * 1e6:>12.1f}{len(picks) / plain:>13.0f}{'-':>10}")
+    hit_rate = cache.hits / max(cache.hits + cache.misses, 1)
+    print(f"{'TokenCache':<22}{cached / len(picks) * 1e6:>12.1f}{len(picks) / cached:>13.0f}{hit_rate:>10.1%}")
+
+
+async def bench_principals(user_uuids: List[str], picks: List[int], concurrency: int, db_ms: float) -> None:
+    print(f"{'principal flags':<22}{'us/request':>12}{'requests/s':>13}{'queries':>10}")
+    for label, ttl in (("no cache", 0.0), ("PrincipalCache", settings.AUTH_PRINCIPAL_CACHE_TTL)):
+        principal_cache.ttl = ttl
+        for user_uuid in user_uuids:
+            principal_cache.discard(user_uuid)
+        db = _SimulatedSession(db_ms / 1000)
+        slots = asyncio.Semaphore(concurrency)
+
+        async def request(index: int) -> None:
+            async with slots:
+                await load_user_flags(db, user_uuids[index])
+
+        started = time.perf_counter()
+        await asyncio.gather(*[request(index) for index in picks])
+        elapsed = time.perf_counter() - started
+        print(f"{label:<22}{elapsed / len(picks) * 1e6:>12.1f}{len(picks) / elapsed:>13.0f}{db.queries:>10}")
+
+
+async def run(users: int, requests: int, concurrency: int, db_ms: float) -> None:
+    user_uuids = [f"bench-user-{index}" for index in range(users)]
+    tokens = [create_access_token(user_uuid) for user_uuid in user_uuids]
+    picks = _workload(users, requests)
+    print(f"{users} users, {requests} requests, {len(set(picks))} distinct users seen")
+    bench_tokens(tokens, picks, settings.AUTH_TOKEN_CACHE_SIZE)
+    await bench_principals(user_uuids, picks, concurrency, db_ms)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--concurrency", type=int, default=100, help="Principal lookups in flight at once")
+    parser.add_argument("--db-ms", type=float, default=1.0, help="Simulated latency of one user query")
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.requests, args.concurrency, args.db_ms))
+
+
+if __name__ == "__main__":
+    main()
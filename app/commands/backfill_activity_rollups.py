@@ -0,0 +1,43 @@
+"""
+Backfill / catch up activity rollups from activity_logs in chunks.
+
+Usage:
+    python -m app.commands.backfill_activity_rollups --batch-size 5000
+    python -m app.commands.backfill_activity_rollups --until-id 1200000
+
+When ACTIVITY_ROLLUP_INLINE is enabled, pass --until-id with the last log id
+written before inline counting was switched on so rows are not counted twice;
+without it the catch-up refuses to run.
+"""
+import argparse
+import asyncio
+import time
+
+from app.cruds.activity_rollups import activity_rollup_crud
+from app.database.database import AsyncSessionLocal
+from app.core.loggers import db_logger as logger
+
+
+async def run(batch_size: int, until_id: int | None) -> None:
+    started = time.monotonic()
+    async with AsyncSessionLocal() as db:
+        total = await activity_rollup_crud.catch_up(
+            db, batch_size=batch_size, until_id=until_id
+        )
+
+    logger.info(
+        f"Activity rollup backfill finished: {total} rows in "
+        f"{time.monotonic() - started:.1f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--until-id", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(run(args.batch_size, args.until_id))
+
+
+if __name__ == "__main__":
+    main()
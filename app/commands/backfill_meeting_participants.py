@@ -0,0 +1,81 @@
+"""
+Fill meeting_participants from the free-text Meeting.participant column.
+
+Meetings are read in primary-key order, one chunk per transaction: the
+chunk's emails are parsed, resolved to users with a single IN query and
+inserted with INSERT IGNORE, so the command can be stopped and re-run
+(--after resumes from a logged key). Meetings created or edited while it
+runs are kept in sync by the CRUD layer.
+
+Usage:
+    python -m app.commands.backfill_meeting_participants --batch-size 1000
+"""
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy import insert, select
+
+from app.core.calendar_versions import calendar_feed_versions
+from app.cruds.meetings import parse_participant_emails, resolve_user_emails
+from app.database.database import AsyncSessionLocal, engine
+from app.models.meeting_participants import MeetingParticipant
+from app.models.meetings import Meeting
+from app.core.loggers import db_logger as logger
+
+
+async def backfill(batch_size: int, after: Optional[str], pause: float) -> None:
+    meetings = inserted = 0
+    started = time.monotonic()
+    while True:
+        async with AsyncSessionLocal() as db:
+            query = select(Meeting.uuid, Meeting.participant).order_by(Meeting.uuid).limit(batch_size)
+            if after:
+                query = query.where(Meeting.uuid > after)
+            chunk = (await db.execute(query)).all()
+            if not chunk:
+                break
+
+            parsed = [(meeting_uuid, parse_participant_emails(participant)) for meeting_uuid, participant in chunk]
+            users = await resolve_user_emails(db, {email for _, emails in parsed for email in emails})
+            rows = [
+                {"meeting_uuid": meeting_uuid, "email": email, "user_uuid": users.get(email)}
+                for meeting_uuid, emails in parsed
+                for email in emails
+            ]
+            added = 0
+            if rows:
+                result = await db.execute(insert(MeetingParticipant).prefix_with("IGNORE"), rows)
+                added = result.rowcount
+                inserted += added
+            await db.commit()
+            if added:
+                # Invitees now see these meetings in their calendar feeds
+                await calendar_feed_versions.touch(row["user_uuid"] for row in rows)
+
+        meetings += len(chunk)
+        after = chunk[-1][0]
+        logger.info(f"Participant backfill: {meetings} meetings, {inserted} rows, last uuid {after}")
+        if len(chunk) < batch_size:
+            break
+        await asyncio.sleep(pause)
+
+    await engine.dispose()
+    logger.info(
+        f"Participant backfill finished: {meetings} meetings, {inserted} rows "
+        f"in {time.monotonic() - started:.1f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--after", default=None, help="Resume after this meeting uuid")
+    parser.add_argument("--pause", type=float, default=0.05, help="Seconds between chunks")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.batch_size, args.after, args.pause))
+
+
+if __name__ == "__main__":
+    main()
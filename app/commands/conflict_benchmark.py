@@ -0,0 +1,78 @@
+"""
+Benchmark meeting conflict checks for users holding many meetings:
+naive scan of every meeting vs the in-memory IntervalIndex used for
+bulk scheduling. Runs without a database.
+
+Usage:
+    python -m app.commands.conflict_benchmark --users 20 --meetings 10000 --checks 20000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from app.utils.intervals import ScheduleIndex
+
+
+def generate(users: int, meetings: int, seed: int):
+    random.seed(seed)
+    origin = datetime(2025, 1, 1)
+    rows = []
+    for user in range(users):
+        for index in range(meetings):
+            start = origin + timedelta(minutes=15 * random.randrange(0, 4 * 24 * 365))
+            rows.append((f"user-{user}", start, start + timedelta(minutes=random.choice((15, 30, 60, 90))), index))
+    return origin, rows
+
+
+def run(users: int, meetings: int, checks: int, participants: int, seed: int) -> None:
+    origin, rows = generate(users, meetings, seed)
+    user_ids = [f"user-{user}" for user in range(users)]
+    candidates = []
+    for _ in range(checks):
+        start = origin + timedelta(minutes=15 * random.randrange(0, 4 * 24 * 365))
+        candidates.append((random.sample(user_ids, min(participants, users)), start, start + timedelta(minutes=30)))
+
+    by_user = {}
+    for user_uuid, start, end, key in rows:
+        by_user.setdefault(user_uuid, []).append((start, end, key))
+
+    started = time.perf_counter()
+    naive_conflicts = 0
+    for attendees, start, end in candidates[: max(checks // 20, 1)]:
+        naive_conflicts += sum(
+            1 for user in attendees for s, e, _ in by_user[user] if s < end and e > start
+        )
+    naive_time = (time.perf_counter() - started) / max(checks // 20, 1)
+
+    started = time.perf_counter()
+    index = ScheduleIndex().load(rows)
+    build_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    indexed_conflicts = 0
+    for attendees, start, end in candidates[: max(checks // 20, 1)]:
+        indexed_conflicts += sum(len(found) for found in index.conflicts(attendees, start, end).values())
+    assert indexed_conflicts == naive_conflicts, "index and scan disagree"
+    for attendees, start, end in candidates:
+        index.conflicts(attendees, start, end)
+    indexed_time = (time.perf_counter() - started) / (checks + max(checks // 20, 1))
+
+    print(f"{users} users x {meetings} meetings, {min(participants, users)} attendees per check")
+    print(f"naive scan:      {naive_time * 1e6:10.1f} us/check")
+    print(f"interval index:  {indexed_time * 1e6:10.1f} us/check (build {build_time:.2f}s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--meetings", type=int, default=10_000)
+    parser.add_argument("--checks", type=int, default=20_000)
+    parser.add_argument("--participants", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.users, args.meetings, args.checks, args.participants, args.seed)
+
+
+if __name__ == "__main__":
+    main()
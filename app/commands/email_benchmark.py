@@ -0,0 +1,59 @@
+"""
+Measure SMTP delivery throughput against the local SMTP stand-in
+(no database, no external mail server).
+
+Usage:
+    python -m app.commands.email_benchmark --messages 5000 --batch-size 50 --concurrency 4
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.mailer import LocalSMTPServer, OutgoingEmail, SMTPSender
+
+
+async def run(messages: int, batch_size: int, concurrency: int, latency: float) -> None:
+    server = LocalSMTPServer(port=0, latency=latency)
+    await server.start()
+    sender = SMTPSender(
+        host=server.host, port=server.port,
+        from_addr="bench@automeet.local", from_name="Automeet",
+        start_tls=False,
+    )
+    sender.batch_size = batch_size
+    slots = asyncio.Semaphore(concurrency)
+    emails = [
+        OutgoingEmail(id=index, recipient=f"user{index}@example.com", subject="Benchmark", html="<p>Hi</p>")
+        for index in range(messages)
+    ]
+
+    async def send(chunk):
+        async with slots:
+            return await sender.send_batch(chunk)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*[
+        send(emails[start:start + batch_size]) for start in range(0, messages, batch_size)
+    ])
+    elapsed = time.perf_counter() - started
+    await server.stop()
+
+    failed = sum(1 for chunk in results for error in chunk if error is not None)
+    print(
+        f"{messages} messages in {elapsed:.2f}s ({messages / elapsed:.0f}/s), "
+        f"received={server.received} failed={failed}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0, help="Server delay per message (s)")
+    args = parser.parse_args()
+    asyncio.run(run(args.messages, args.batch_size, args.concurrency, args.latency))
+
+
+if __name__ == "__main__":
+    main()
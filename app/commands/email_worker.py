@@ -0,0 +1,41 @@
+"""
+Run the email outbox worker as its own process.
+
+Usage:
+    python -m app.commands.email_worker
+    python -m app.commands.email_worker --requeue-dead
+
+Set EMAIL_OUTBOX_WORKER=false on the API processes when delivery runs here.
+"""
+import argparse
+import asyncio
+
+from app.core.email_outbox import email_outbox_worker
+from app.cruds.email_outbox import email_outbox_crud
+from app.database.database import AsyncSessionLocal
+from app.core.loggers import app_logger as logger
+
+
+async def run(requeue_dead: bool) -> None:
+    if requeue_dead:
+        async with AsyncSessionLocal() as db:
+            count = await email_outbox_crud.requeue_dead(db)
+        logger.info(f"Email outbox: {count} dead-lettered emails requeued")
+        return
+
+    logger.info("Email outbox worker started")
+    try:
+        await email_outbox_worker.run()
+    finally:
+        await email_outbox_worker.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requeue-dead", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args.requeue_dead))
+
+
+if __name__ == "__main__":
+    main()
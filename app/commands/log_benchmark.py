@@ -0,0 +1,123 @@
+"""
+Throughput of queued log dispatch against handlers called inline.
+Concurrent tasks on one event loop log records of --message-bytes to a
+rotating file handler in a scratch directory, either straight through
+the handler ("direct") or through the QueueHandler / QueueListener pair
+SetupLogger uses ("queued"). Reports caller-side records per second and
+per-call latency, the worst event loop stall seen by a 10 ms ticker,
+and how long the listener needs to drain what was queued.
+
+Usage:
+    python -m app.commands.log_benchmark --tasks 50 --records 2000 --message-bytes 200
+"""
+import argparse
+import asyncio
+import logging
+import os
+import queue
+import tempfile
+import time
+from logging.handlers import QueueListener
+from typing import List
+
+from app.core.loggers import TimedRotatingFileHandlerWithSize, _ContextQueueHandler, _LoggerRouter
+
+MODES = ("direct", "queued")
+
+
+async def _ticker(stalls: List[float], interval: float = 0.01) -> None:
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        stalls.append(time.perf_counter() - started - interval)
+
+
+async def bench(mode: str, directory: str, tasks: int, records: int, message_bytes: int, max_bytes: int) -> dict:
+    handler = TimedRotatingFileHandlerWithSize(
+        os.path.join(directory, f"{mode}.log"), backupCount=3, encoding="utf-8", maxBytes=max_bytes
+    )
+    handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s"))
+    logger = logging.getLogger(f"log_benchmark.{mode}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    listener = None
+    if mode == "queued":
+        records_queue: queue.SimpleQueue = queue.SimpleQueue()
+        router = _LoggerRouter()
+        router.routes[logger.name] = [handler]
+        logger.addHandler(_ContextQueueHandler(records_queue))
+        listener = QueueListener(records_queue, router)
+        listener.start()
+    else:
+        logger.addHandler(handler)
+
+    message = "x" * message_bytes
+    call_times: List[float] = []
+    stalls: List[float] = []
+
+    async def worker(index: int) -> None:
+        for sequence in range(records):
+            started = time.perf_counter()
+            logger.info(f"task={index} seq={sequence} {message}")
+            call_times.append(time.perf_counter() - started)
+            if sequence % 10 == 0:
+                await asyncio.sleep(0)
+
+    ticker = asyncio.create_task(_ticker(stalls))
+    started = time.perf_counter()
+    await asyncio.gather(*[worker(index) for index in range(tasks)])
+    elapsed = time.perf_counter() - started
+    ticker.cancel()
+    await asyncio.gather(ticker, return_exceptions=True)
+
+    drained = time.perf_counter()
+    if listener is not None:
+        listener.stop()
+    drain_time = time.perf_counter() - drained
+    for attached in list(logger.handlers):
+        logger.removeHandler(attached)
+    handler.close()
+
+    total = tasks * records
+    call_times.sort()
+    return {
+        "mode": mode,
+        "records_per_s": total / elapsed,
+        "call_p50_us": call_times[len(call_times) // 2] * 1e6,
+        "call_p99_us": call_times[min(len(call_times) - 1, int(len(call_times) * 0.99))] * 1e6,
+        "max_stall_ms": max(stalls, default=0.0) * 1000,
+        "drain_s": drain_time,
+        "end_to_end_per_s": total / (elapsed + drain_time),
+    }
+
+
+async def run(tasks: int, records: int, message_bytes: int, max_bytes: int) -> None:
+    with tempfile.TemporaryDirectory(prefix="log_benchmark_") as directory:
+        results = [await bench(mode, directory, tasks, records, message_bytes, max_bytes) for mode in MODES]
+
+    print(f"{tasks} tasks x {records} records, {message_bytes}-byte messages")
+    print(
+        f"{'mode':<8}{'caller rec/s':>14}{'p50 us':>9}{'p99 us':>9}"
+        f"{'max stall ms':>14}{'drain s':>9}{'total rec/s':>13}"
+    )
+    for result in results:
+        print(
+            f"{result['mode']:<8}{result['records_per_s']:>14.0f}{result['call_p50_us']:>9.1f}"
+            f"{result['call_p99_us']:>9.1f}{result['max_stall_ms']:>14.1f}{result['drain_s']:>9.2f}"
+            f"{result['end_to_end_per_s']:>13.0f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=50, help="Concurrent logging tasks")
+    parser.add_argument("--records", type=int, default=2000, help="Records per task")
+    parser.add_argument("--message-bytes", type=int, default=200)
+    parser.add_argument("--max-bytes", type=int, default=5 * 1024 * 1024, help="Size that triggers a rollover")
+    args = parser.parse_args()
+    asyncio.run(run(args.tasks, args.records, args.message_bytes, args.max_bytes))
+
+
+if __name__ == "__main__":
+    main()
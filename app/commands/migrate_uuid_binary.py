@@ -0,0 +1,217 @@
+"""
+Online migration of UUID columns from VARCHAR(36) to BINARY(16) (MySQL 8).
+
+Run the phases in order:
+    python -m app.commands.migrate_uuid_binary prepare    # shadow columns + sync triggers
+    python -m app.commands.migrate_uuid_binary backfill --batch-size 5000
+    python -m app.commands.migrate_uuid_binary verify
+    python -m app.commands.migrate_uuid_binary cutover    # short write pause
+    # deploy with DB_UUID_STORAGE=binary
+    python -m app.commands.migrate_uuid_binary cleanup    # drop old string columns
+
+prepare and backfill run while the application keeps writing: triggers
+fill the shadow column for new and updated rows, backfill converts old
+rows in small committed batches. cutover swaps the columns and rebuilds
+keys, indexes and foreign keys; stop writers for its duration and start
+them again with DB_UUID_STORAGE=binary. Add --dry-run to print the SQL.
+"""
+import argparse
+import asyncio
+import importlib
+import pkgutil
+import time
+from typing import Dict, List
+
+from sqlalchemy import text
+
+import app.models
+from app.database.base_class import Base
+from app.database.database import engine
+from app.database.types import UUIDType
+from app.core.loggers import db_logger as logger
+
+SHADOW = "{}__bin"
+LEGACY = "{}__str"
+
+
+def uuid_columns() -> Dict[str, List[str]]:
+    """{table: [column, ...]} for every UUIDType column in the models."""
+    for module in pkgutil.iter_modules(app.models.__path__):
+        importlib.import_module(f"app.models.{module.name}")
+    columns: Dict[str, List[str]] = {}
+    for table in Base.metadata.sorted_tables:
+        names = [column.name for column in table.columns if isinstance(column.type, UUIDType)]
+        if names:
+            columns[table.name] = names
+    return columns
+
+
+async def execute(conn, sql: str, dry_run: bool) -> int:
+    if dry_run:
+        print(f"{sql};")
+        return 0
+    result = await conn.execute(text(sql))
+    return result.rowcount
+
+
+async def prepare(dry_run: bool) -> None:
+    async with engine.begin() as conn:
+        for table, columns in uuid_columns().items():
+            adds = ", ".join(f"ADD COLUMN `{SHADOW.format(c)}` BINARY(16) NULL" for c in columns)
+            await execute(conn, f"ALTER TABLE `{table}` {adds}, ALGORITHM=INSTANT", dry_run)
+            sets = "; ".join(f"SET NEW.`{SHADOW.format(c)}` = UUID_TO_BIN(NEW.`{c}`)" for c in columns)
+            for action in ("INSERT", "UPDATE"):
+                trigger = f"{table}_uuid_bin_{action.lower()}"
+                await execute(conn, f"DROP TRIGGER IF EXISTS `{trigger}`", dry_run)
+                await execute(
+                    conn,
+                    f"CREATE TRIGGER `{trigger}` BEFORE {action} ON `{table}` "
+                    f"FOR EACH ROW BEGIN {sets}; END",
+                    dry_run,
+                )
+    logger.info("UUID migration: shadow columns and triggers created")
+
+
+async def backfill(batch_size: int, pause: float, dry_run: bool) -> None:
+    for table, columns in uuid_columns().items():
+        pending = " OR ".join(
+            f"(`{SHADOW.format(c)}` IS NULL AND `{c}` IS NOT NULL)" for c in columns
+        )
+        sets = ", ".join(f"`{SHADOW.format(c)}` = UUID_TO_BIN(`{c}`)" for c in columns)
+        total = 0
+        while True:
+            async with engine.begin() as conn:
+                count = await execute(
+                    conn, f"UPDATE `{table}` SET {sets} WHERE {pending} LIMIT {batch_size}", dry_run
+                )
+            total += count
+            if dry_run or count < batch_size:
+                break
+            await asyncio.sleep(pause)
+        logger.info(f"UUID migration: {table} backfilled ({total} rows)")
+
+
+async def verify() -> bool:
+    ok = True
+    async with engine.connect() as conn:
+        for table, columns in uuid_columns().items():
+            mismatch = " OR ".join(
+                f"NOT (`{SHADOW.format(c)}` <=> UUID_TO_BIN(`{c}`))" for c in columns
+            )
+            count = (await conn.execute(text(f"SELECT COUNT(*) FROM `{table}` WHERE {mismatch}"))).scalar()
+            logger.info(f"UUID migration: {table} mismatched rows = {count}")
+            ok = ok and count == 0
+    return ok
+
+
+async def _schema(conn, table: str, columns: List[str]):
+    """Indexes and outgoing/incoming foreign keys that involve `columns`."""
+    indexes: Dict[str, Dict] = {}
+    rows = (await conn.execute(text(
+        "SELECT INDEX_NAME, NON_UNIQUE, COLUMN_NAME, SEQ_IN_INDEX FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table ORDER BY INDEX_NAME, SEQ_IN_INDEX"
+    ), {"table": table})).all()
+    for name, non_unique, column, _ in rows:
+        entry = indexes.setdefault(name, {"unique": not non_unique, "columns": []})
+        entry["columns"].append(column)
+    indexes = {name: entry for name, entry in indexes.items() if set(entry["columns"]) & set(columns)}
+
+    foreign_keys = (await conn.execute(text(
+        "SELECT k.CONSTRAINT_NAME, k.TABLE_NAME, k.COLUMN_NAME, k.REFERENCED_TABLE_NAME, "
+        "k.REFERENCED_COLUMN_NAME, r.DELETE_RULE, r.UPDATE_RULE "
+        "FROM information_schema.KEY_COLUMN_USAGE k "
+        "JOIN information_schema.REFERENTIAL_CONSTRAINTS r "
+        "ON r.CONSTRAINT_SCHEMA = k.CONSTRAINT_SCHEMA AND r.CONSTRAINT_NAME = k.CONSTRAINT_NAME "
+        "WHERE k.TABLE_SCHEMA = DATABASE() AND k.TABLE_NAME = :table AND k.REFERENCED_TABLE_NAME IS NOT NULL"
+    ), {"table": table})).all()
+    foreign_keys = [fk for fk in foreign_keys if fk.COLUMN_NAME in columns]
+
+    nullable = dict((await conn.execute(text(
+        "SELECT COLUMN_NAME, IS_NULLABLE = 'YES' FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+    ), {"table": table})).all())
+    return indexes, foreign_keys, nullable
+
+
+async def cutover(dry_run: bool) -> None:
+    tables = uuid_columns()
+    async with engine.begin() as conn:
+        plan = {table: await _schema(conn, table, columns) for table, columns in tables.items()}
+
+        # Foreign keys first: both sides of every reference change type
+        for table, (_, foreign_keys, _) in plan.items():
+            for fk in foreign_keys:
+                await execute(conn, f"ALTER TABLE `{table}` DROP FOREIGN KEY `{fk.CONSTRAINT_NAME}`", dry_run)
+
+        for table, columns in tables.items():
+            indexes, _, nullable = plan[table]
+            parts = []
+            for action in ("insert", "update"):
+                await execute(conn, f"DROP TRIGGER IF EXISTS `{table}_uuid_bin_{action}`", dry_run)
+            for name in indexes:
+                parts.append("DROP PRIMARY KEY" if name == "PRIMARY" else f"DROP INDEX `{name}`")
+            for column in columns:
+                parts.append(f"RENAME COLUMN `{column}` TO `{LEGACY.format(column)}`")
+                parts.append(f"RENAME COLUMN `{SHADOW.format(column)}` TO `{column}`")
+            for column in columns:
+                null = "NULL" if nullable.get(column, True) else "NOT NULL"
+                parts.append(f"MODIFY `{column}` BINARY(16) {null}")
+                parts.append(f"MODIFY `{LEGACY.format(column)}` VARCHAR(36) NULL")
+            for name, entry in indexes.items():
+                cols = ", ".join(f"`{c}`" for c in entry["columns"])
+                if name == "PRIMARY":
+                    parts.append(f"ADD PRIMARY KEY ({cols})")
+                else:
+                    parts.append(f"ADD {'UNIQUE ' if entry['unique'] else ''}INDEX `{name}` ({cols})")
+            await execute(conn, f"ALTER TABLE `{table}` {', '.join(parts)}", dry_run)
+
+        for table, (_, foreign_keys, _) in plan.items():
+            for fk in foreign_keys:
+                await execute(
+                    conn,
+                    f"ALTER TABLE `{table}` ADD CONSTRAINT `{fk.CONSTRAINT_NAME}` "
+                    f"FOREIGN KEY (`{fk.COLUMN_NAME}`) REFERENCES `{fk.REFERENCED_TABLE_NAME}` "
+                    f"(`{fk.REFERENCED_COLUMN_NAME}`) ON DELETE {fk.DELETE_RULE} ON UPDATE {fk.UPDATE_RULE}",
+                    dry_run,
+                )
+    logger.info("UUID migration: cutover complete; set DB_UUID_STORAGE=binary")
+
+
+async def cleanup(dry_run: bool) -> None:
+    async with engine.begin() as conn:
+        for table, columns in uuid_columns().items():
+            drops = ", ".join(f"DROP COLUMN `{LEGACY.format(c)}`" for c in columns)
+            await execute(conn, f"ALTER TABLE `{table}` {drops}", dry_run)
+    logger.info("UUID migration: legacy string columns dropped")
+
+
+async def run(args) -> None:
+    started = time.monotonic()
+    if args.phase == "prepare":
+        await prepare(args.dry_run)
+    elif args.phase == "backfill":
+        await backfill(args.batch_size, args.pause, args.dry_run)
+    elif args.phase == "verify":
+        if not await verify():
+            raise SystemExit("Shadow columns do not match; re-run backfill")
+    elif args.phase == "cutover":
+        if not args.dry_run and not await verify():
+            raise SystemExit("Shadow columns do not match; re-run backfill")
+        await cutover(args.dry_run)
+    elif args.phase == "cleanup":
+        await cleanup(args.dry_run)
+    await engine.dispose()
+    logger.info(f"UUID migration: {args.phase} finished in {time.monotonic() - started:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("phase", choices=["prepare", "backfill", "verify", "cutover", "cleanup"])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--pause", type=float, default=0.05, help="Seconds between backfill batches")
+    parser.add_argument("--dry-run", action="store_true")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
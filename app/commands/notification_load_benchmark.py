@@ -0,0 +1,192 @@
+"""
+Benchmark the WebSocket notification hub on one worker. A child process
+serves the hub with uvicorn; this process opens idle and active client
+sockets against it and publishes events addressed to every active user.
+Slow clients never read, to exercise the backpressure path. Reports
+connect time, server memory, delivery latency and frames per event.
+With --redis, events go through Redis pub/sub instead of straight into
+the hub (needs REDIS_URL).
+
+Usage:
+    python -m app.commands.notification_load_benchmark --idle 10000 --active 1000 --events 50 --rate 10
+"""
+import argparse
+import asyncio
+import multiprocessing
+import resource
+import statistics
+import time
+from contextlib import asynccontextmanager
+from typing import List
+
+import httpx
+import orjson
+import uvicorn
+import websockets
+from fastapi import FastAPI, Request, WebSocket
+
+from app.core.config import settings
+from app.core.notifications import NotificationHub
+
+
+def _raise_fd_limit() -> int:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return hard
+
+
+def _serve(port: int, active: int, slow: int, max_connections: int, use_redis: bool) -> None:
+    _raise_fd_limit()
+    hub = NotificationHub(
+        channel=f"{settings.NOTIFICATION_CHANNEL}:load_test",
+        max_connections=max_connections,
+        max_pending=settings.NOTIFICATION_MAX_PENDING,
+        batch_size=settings.NOTIFICATION_BATCH_SIZE,
+        flush_interval=settings.NOTIFICATION_FLUSH_INTERVAL,
+        send_timeout=settings.NOTIFICATION_SEND_TIMEOUT,
+    )
+    recipients = [f"active-{index}" for index in range(active)] + [f"slow-{index}" for index in range(slow)]
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if use_redis:
+            await hub.start()
+        yield
+        await hub.stop()
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.websocket("/ws/{user_uuid}")
+    async def socket(websocket: WebSocket, user_uuid: str):
+        await hub.serve(websocket, user_uuid)
+
+    @app.post("/publish")
+    async def publish(request: Request):
+        data = orjson.loads(await request.body())
+        if use_redis:
+            await hub.send(recipients, "load_test", data)
+        else:
+            event = {"kind": "load_test", "data": data, "sent_at": ""}
+            hub.deliver(orjson.dumps({"users": recipients, "event": event}).decode())
+        return {}
+
+    @app.get("/stats")
+    async def stats():
+        rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return {"connections": hub.connection_count, "max_rss_mb": round(rss_mb, 1), **hub.stats}
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", ws_ping_interval=None)
+
+
+async def _connect_all(url: str, prefix: str, count: int, concurrency: int, max_queue: int) -> list:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def connect(index: int):
+        async with slots:
+            return await websockets.connect(f"{url}/ws/{prefix}-{index}", max_queue=max_queue, ping_interval=None)
+
+    return await asyncio.gather(*[connect(index) for index in range(count)])
+
+
+async def run(idle: int, active: int, slow: int, events: int, rate: float, payload_bytes: int, port: int, use_redis: bool) -> None:
+    _raise_fd_limit()
+    server = multiprocessing.Process(
+        target=_serve, args=(port, active, slow, idle + active + slow + 100, use_redis), daemon=True
+    )
+    server.start()
+    base = f"http://127.0.0.1:{port}"
+    url = f"ws://127.0.0.1:{port}"
+    async with httpx.AsyncClient(base_url=base, timeout=30) as http:
+        for _ in range(100):
+            try:
+                await http.get("/stats")
+                break
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+        baseline = (await http.get("/stats")).json()["max_rss_mb"]
+
+        started = time.perf_counter()
+        idle_sockets = await _connect_all(url, "idle", idle, 200, 16)
+        idle_connect = time.perf_counter() - started
+        started = time.perf_counter()
+        active_sockets = await _connect_all(url, "active", active, 200, 1024)
+        slow_sockets = await _connect_all(url, "slow", slow, 50, 1)
+        active_connect = time.perf_counter() - started
+        connected = (await http.get("/stats")).json()
+        print(
+            f"connected idle={idle} in {idle_connect:.1f}s, active={active} slow={slow} in {active_connect:.1f}s; "
+            f"server connections={connected['connections']} rss={connected['max_rss_mb']}MB "
+            f"(+{connected['max_rss_mb'] - baseline:.1f}MB)"
+        )
+
+        latencies: List[float] = []
+        frames = 0
+        received = 0
+        done = asyncio.Event()
+
+        async def consume(socket) -> None:
+            nonlocal frames, received
+            async for frame in socket:
+                now = time.time()
+                batch = orjson.loads(frame)
+                frames += 1
+                received += len(batch)
+                latencies.extend(now - event["data"]["sent_at"] for event in batch)
+                if received >= events * active:
+                    done.set()
+
+        consumers = [asyncio.create_task(consume(socket)) for socket in active_sockets]
+        padding = "x" * payload_bytes
+        started = time.perf_counter()
+        for _ in range(events):
+            await http.post("/publish", content=orjson.dumps({"sent_at": time.time(), "padding": padding}))
+            if rate:
+                await asyncio.sleep(1 / rate)
+        try:
+            await asyncio.wait_for(done.wait(), timeout=30)
+        except asyncio.TimeoutError:
+            pass
+        elapsed = time.perf_counter() - started
+        stats = (await http.get("/stats")).json()
+
+        for task in consumers:
+            task.cancel()
+        await asyncio.gather(*consumers, return_exceptions=True)
+        for socket in idle_sockets + active_sockets + slow_sockets:
+            await socket.close()
+
+    server.terminate()
+    server.join()
+
+    expected = events * active
+    latencies.sort()
+    if latencies:
+        p50 = statistics.median(latencies) * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        print(f"latency p50={p50:.1f}ms p99={p99:.1f}ms max={latencies[-1] * 1000:.1f}ms")
+    print(
+        f"{received}/{expected} events in {elapsed:.2f}s ({received / elapsed:.0f}/s), "
+        f"{frames} frames ({received / max(frames, 1):.1f} events/frame), "
+        f"dropped={stats.get('dropped', 0)} slow_closed={stats.get('slow_closed', 0)} rss={stats['max_rss_mb']}MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--idle", type=int, default=10_000, help="Connected sockets that receive nothing")
+    parser.add_argument("--active", type=int, default=1000, help="Sockets every event is addressed to")
+    parser.add_argument("--slow", type=int, default=0, help="Sockets addressed like active ones that never read")
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--rate", type=float, default=10.0, help="Events per second (0 = as fast as possible)")
+    parser.add_argument("--payload-bytes", type=int, default=256)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--redis", action="store_true", help="Fan out through Redis pub/sub")
+    args = parser.parse_args()
+    asyncio.run(run(
+        args.idle, args.active, args.slow, args.events, args.rate, args.payload_bytes, args.port, args.redis
+    ))
+
+
+if __name__ == "__main__":
+    main()
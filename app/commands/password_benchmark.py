@@ -0,0 +1,111 @@
+"""
+Login storm against the password helpers: concurrent logins for known
+users (right and wrong passwords) and unknown identifiers, verified
+either inline on the event loop (the old blocking path) or through the
+hash pool. Reports logins per second, login latency, the worst event
+loop stall seen by a 10 ms ticker, and the hash pool queue times.
+
+Usage:
+    python -m app.commands.password_benchmark --logins 400 --concurrency 100 --rounds 10
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import List
+
+from app.core.config import settings
+from app.utils.password_util import (
+    averify_password,
+    averify_unknown_user,
+    configure_password_hashing,
+    hash_metrics,
+    pwd_context,
+    verify_password,
+)
+
+MODES = ("blocking", "pool")
+
+
+async def _ticker(stalls: List[float], interval: float = 0.01) -> None:
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        stalls.append(time.perf_counter() - started - interval)
+
+
+async def storm(mode: str, logins: int, concurrency: int, unknown_ratio: float, stored_hash: str) -> dict:
+    slots = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    stalls: List[float] = []
+
+    async def login(index: int) -> None:
+        roll = random.random()
+        async with slots:
+            started = time.perf_counter()
+            if roll < unknown_ratio:
+                # A few identifiers repeat, as in credential stuffing
+                identifier = f"nobody-{mode}-{index % 50}@example.com"
+                if mode == "pool":
+                    await averify_unknown_user(identifier)
+                else:
+                    verify_password("wrong-password", stored_hash)
+            else:
+                password = "correct-horse" if roll < (1 + unknown_ratio) / 2 else "wrong-password"
+                if mode == "pool":
+                    await averify_password(password, stored_hash)
+                else:
+                    verify_password(password, stored_hash)
+            latencies.append(time.perf_counter() - started)
+
+    ticker = asyncio.create_task(_ticker(stalls))
+    started = time.perf_counter()
+    await asyncio.gather(*[login(index) for index in range(logins)])
+    elapsed = time.perf_counter() - started
+    ticker.cancel()
+    await asyncio.gather(ticker, return_exceptions=True)
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "logins_per_s": logins / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "max_stall_ms": max(stalls, default=0.0) * 1000,
+    }
+
+
+async def run(logins: int, concurrency: int, unknown_ratio: float, rounds: int) -> None:
+    settings.PASSWORD_HASH_ROUNDS = rounds
+    configure_password_hashing()
+    stored_hash = pwd_context.hash("correct-horse")
+    results = [await storm(mode, logins, concurrency, unknown_ratio, stored_hash) for mode in MODES]
+
+    print(f"bcrypt rounds={rounds}, {logins} logins, concurrency={concurrency}, unknown={unknown_ratio:.0%}")
+    print(f"{'mode':<10}{'logins/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'max stall ms':>14}")
+    for result in results:
+        print(
+            f"{result['mode']:<10}{result['logins_per_s']:>10.1f}{result['p50_ms']:>10.1f}"
+            f"{result['p99_ms']:>10.1f}{result['max_stall_ms']:>14.1f}"
+        )
+    pool = hash_metrics.snapshot()
+    print(
+        f"hash pool: {pool['calls']} calls, queue avg={pool['queue_time_avg_ms']:.1f}ms "
+        f"p99={pool['queue_time_p99_ms']:.1f}ms max={pool['queue_time_max_ms']:.1f}ms, "
+        f"run p50={pool['run_time_p50_ms']:.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=100, help="Logins in flight at once")
+    parser.add_argument("--unknown-ratio", type=float, default=0.3, help="Share of logins for unknown users")
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt cost of the stored hash")
+    args = parser.parse_args()
+    asyncio.run(run(args.logins, args.concurrency, args.unknown_ratio, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
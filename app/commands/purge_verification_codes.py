@@ -0,0 +1,39 @@
+"""
+Delete expired verification codes. Issuing and verifying only remove the
+row of the (user, type) they touch, so codes that were sent but never
+used stay behind until this runs; run it hourly from cron. Rows are
+deleted in batches, one transaction each, so it can run next to live
+traffic.
+
+Usage:
+    python -m app.commands.purge_verification_codes --batch-size 5000
+"""
+import argparse
+import asyncio
+import time
+
+from app.cruds.verification_codes import verification_code_crud
+from app.database.database import AsyncSessionLocal, engine
+from app.core.loggers import db_logger as logger
+
+
+async def purge(batch_size: int) -> None:
+    started = time.monotonic()
+    async with AsyncSessionLocal() as db:
+        removed = await verification_code_crud.purge_expired(db, batch_size=batch_size)
+    await engine.dispose()
+    logger.info(
+        f"Verification codes: {removed} expired rows purged "
+        f"in {time.monotonic() - started:.1f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(purge(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
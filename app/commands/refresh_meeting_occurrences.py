@@ -0,0 +1,48 @@
+"""
+Roll the occurrence cache of recurring meetings forward: every series
+whose meeting_occurrences rows end less than a week from now is rebuilt
+for the configured number of weeks (MEETING_OCCURRENCE_CACHE_WEEKS).
+Reads stay correct without it (uncached occurrences are expanded on
+demand), so run it daily from cron to keep them on the indexed path.
+
+Usage:
+    python -m app.commands.refresh_meeting_occurrences --batch-size 500
+"""
+import argparse
+import asyncio
+import time
+
+from app.cruds.meeting_occurrences import crud_meeting_occurrence
+from app.cruds.meetings import crud_meeting  # noqa: F401  (configures the Meeting mappers)
+from app.database.database import AsyncSessionLocal, engine
+from app.core.loggers import db_logger as logger
+
+
+async def refresh(batch_size: int) -> None:
+    series = occurrences = 0
+    started = time.monotonic()
+    while True:
+        async with AsyncSessionLocal() as db:
+            stale = await crud_meeting_occurrence.get_stale_series(db, limit=batch_size)
+            for meeting in stale:
+                occurrences += len(await crud_meeting_occurrence.materialize(db, meeting))
+            await db.commit()
+        series += len(stale)
+        if len(stale) < batch_size:
+            break
+    await engine.dispose()
+    logger.info(
+        f"Occurrence cache: {series} series refreshed, {occurrences} occurrences "
+        f"in {time.monotonic() - started:.1f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(refresh(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark the free-slot finder on synthetic calendars (no database).
+
+Usage:
+    python -m app.commands.slot_benchmark --people 50 --days 14 --meetings-per-day 3
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from app.utils.slot_finder import find_free_slots
+
+
+def run(people: int, days: int, per_day: int, duration: int, granularity: int, runs: int) -> None:
+    random.seed(11)
+    start = datetime(2025, 3, 3)  # a Monday
+    end = start + timedelta(days=days)
+    users = [f"user-{index}" for index in range(people)]
+    busy = []
+    for user in users:
+        for day in range(days):
+            for _ in range(per_day):
+                slot = start + timedelta(days=day, minutes=15 * random.randrange(8 * 4, 18 * 4))
+                busy.append((user, slot, slot + timedelta(minutes=random.choice((15, 30, 45, 60)))))
+
+    required, optional = users[: people // 5], users[people // 5:]
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        slots = find_free_slots(busy, required, start, end, duration, optional=optional, granularity=granularity)
+        timings.append(time.perf_counter() - started)
+
+    timings.sort()
+    print(f"{people} people ({len(required)} required), {days} days, {len(busy)} busy intervals")
+    print(f"median {timings[len(timings) // 2] * 1000:.1f} ms, max {timings[-1] * 1000:.1f} ms, {len(slots)} slots")
+    for slot in slots[:3]:
+        print(f"  {slot.start:%a %Y-%m-%d %H:%M} score={slot.score} optional_free={slot.optional_available}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--people", type=int, default=50)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--meetings-per-day", type=int, default=3)
+    parser.add_argument("--duration", type=int, default=30)
+    parser.add_argument("--granularity", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    run(args.people, args.days, args.meetings_per_day, args.duration, args.granularity, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Compare the current key scheme (random uuid4 in VARCHAR(36)) with UUIDv7
+in BINARY(16): bulk insert time, point-lookup time and on-disk size of
+the clustered and secondary indexes. Uses scratch tables that are
+dropped afterwards.
+
+Usage:
+    python -m app.commands.uuid_benchmark --rows 200000 --lookups 20000
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid as py_uuid
+
+from sqlalchemy import text
+
+from app.database.database import engine
+from app.database.types import uuid7
+
+SCHEMES = {
+    "varchar36_uuid4": ("VARCHAR(36)", lambda: str(py_uuid.uuid4())),
+    "binary16_uuid7": ("BINARY(16)", lambda: uuid7().bytes),
+}
+
+
+async def bench(name: str, rows: int, lookups: int, batch_size: int) -> dict:
+    column_type, generate = SCHEMES[name]
+    table = f"bench_{name}"
+    owners = [generate() for _ in range(max(rows // 100, 1))]
+    keys = []
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP TABLE IF EXISTS `{table}`"))
+        await conn.execute(text(
+            f"CREATE TABLE `{table}` (uuid {column_type} NOT NULL PRIMARY KEY, "
+            f"user_uuid {column_type} NOT NULL, payload VARCHAR(100) NOT NULL, "
+            f"INDEX ix_user (user_uuid)) ENGINE=InnoDB"
+        ))
+
+    started = time.perf_counter()
+    for start in range(0, rows, batch_size):
+        batch = [
+            {"uuid": generate(), "user_uuid": random.choice(owners), "payload": "x" * 64}
+            for _ in range(min(batch_size, rows - start))
+        ]
+        keys.extend(item["uuid"] for item in batch)
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(f"INSERT INTO `{table}` (uuid, user_uuid, payload) VALUES (:uuid, :user_uuid, :payload)"),
+                batch,
+            )
+    insert_time = time.perf_counter() - started
+
+    sample = random.sample(keys, min(lookups, len(keys)))
+    async with engine.connect() as conn:
+        started = time.perf_counter()
+        for key in sample:
+            await conn.execute(text(f"SELECT payload FROM `{table}` WHERE uuid = :uuid"), {"uuid": key})
+        lookup_time = time.perf_counter() - started
+
+        await conn.execute(text(f"ANALYZE TABLE `{table}`"))
+        data_length, index_length = (await conn.execute(text(
+            "SELECT DATA_LENGTH, INDEX_LENGTH FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+        ), {"table": table})).one()
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP TABLE IF EXISTS `{table}`"))
+
+    return {
+        "scheme": name,
+        "rows_per_s": rows / insert_time,
+        "lookup_us": lookup_time / max(len(sample), 1) * 1e6,
+        "data_mb": data_length / 2**20,
+        "index_mb": index_length / 2**20,
+    }
+
+
+async def run(rows: int, lookups: int, batch_size: int) -> None:
+    results = [await bench(name, rows, lookups, batch_size) for name in SCHEMES]
+    await engine.dispose()
+    print(f"{'scheme':<18}{'insert rows/s':>15}{'lookup us':>12}{'data MB':>10}{'index MB':>10}")
+    for result in results:
+        print(
+            f"{result['scheme']:<18}{result['rows_per_s']:>15.0f}{result['lookup_us']:>12.1f}"
+            f"{result['data_mb']:>10.1f}{result['index_mb']:>10.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.lookups, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import asyncio
+import re
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+import orjson
+
+from .config import settings
+from .redis import redis_client, redis_listener_client
+from .loggers import redis_logger as logger
+
+
+StreamEvent = Tuple[str, Dict[str, Any]]
+
+# Redis stream entry IDs: "<ms>-<seq>" or a bare "<ms>"
+STREAM_ID_RE = re.compile(r"\d+(-\d+)?")
+
+
+def is_stream_id(value: str) -> bool:
+    return STREAM_ID_RE.fullmatch(value) is not None
+
+
+def _parse_id(entry_id: str) -> Tuple[int, int]:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class StreamOverflow(Exception):
+    """Raised when a watcher falls too far behind the live stream."""
+
+
+class _Subscriber:
+    def __init__(self, filters: Dict[str, Optional[str]], maxsize: int):
+        self.filters = {k: v for k, v in filters.items() if v}
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def matches(self, fields: Dict[str, Any]) -> bool:
+        return all(fields.get(k) == v for k, v in self.filters.items())
+
+    def offer(self, entry_id: str, fields: Dict[str, Any]) -> None:
+        if self.overflowed or not self.matches(fields):
+            return
+        try:
+            self.queue.put_nowait((entry_id, fields))
+        except asyncio.QueueFull:
+            # Slow consumer: stop feeding it, it resumes via last event id
+            self.overflowed = True
+
+
+class ActivityStreamHub:
+    """
+    Publishes activity logs to a capped Redis Stream and fans the live
+    tail out to watchers. One XREAD reader task is shared by every watcher
+    in the worker; filtering happens server-side before queueing.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        maxlen: int,
+        block_ms: int = 5000,
+        batch_size: int = 500,
+        queue_size: int = 1000,
+    ):
+        self.key = key
+        self.maxlen = maxlen
+        self.block_ms = block_ms
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self._subscribers: Set[_Subscriber] = set()
+        self._reader_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def serialize(log: Any) -> Dict[str, str]:
+        created_at = getattr(log, "created_at", None)
+        return {
+            "id": str(log.id),
+            "user_uuid": log.user_uuid or "",
+            "entity": log.entity,
+            "action": log.action,
+            "description": log.description or "",
+            "created_at": created_at.isoformat() if created_at else "",
+        }
+
+    async def publish(self, log: Any) -> Optional[str]:
+        """XADD a log entry, trimming the stream to roughly maxlen entries."""
+        try:
+            return await redis_client.xadd(
+                self.key,
+                self.serialize(log),
+                maxlen=self.maxlen,
+                approximate=True,
+            )
+        except Exception as exc:
+            # Never break the write path because of the live tail
+            logger.warning(f"Activity stream publish failed: {exc}")
+            return None
+
+    # Shared reader
+    def _ensure_reader(self) -> None:
+        if self._reader_task is None or self._reader_task.done():
+            self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self) -> None:
+        last_id = "0-0"
+        try:
+            tip = await redis_client.xrevrange(self.key, count=1)
+            if tip:
+                last_id = tip[0][0]
+        except Exception as exc:
+            logger.warning(f"Activity stream tip lookup failed: {exc}")
+            last_id = "$"
+
+        while self._subscribers:
+            try:
+                response = await redis_listener_client.xread(
+                    {self.key: last_id}, count=self.batch_size, block=self.block_ms
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"Activity stream read failed: {exc}")
+                await asyncio.sleep(1)
+                continue
+
+            for _stream, entries in response or []:
+                for entry_id, fields in entries:
+                    last_id = entry_id
+                    for subscriber in tuple(self._subscribers):
+                        subscriber.offer(entry_id, fields)
+
+    async def _replay(
+        self, subscriber: _Subscriber, last_event_id: str
+    ) -> AsyncIterator[StreamEvent]:
+        start = f"({last_event_id}"
+        while True:
+            entries = await redis_client.xrange(
+                self.key, min=start, max="+", count=self.batch_size
+            )
+            for entry_id, fields in entries:
+                if subscriber.matches(fields):
+                    yield entry_id, fields
+            if len(entries) < self.batch_size:
+                return
+            start = f"({entries[-1][0]}"
+
+    async def tail(
+        self,
+        filters: Dict[str, Optional[str]],
+        last_event_id: Optional[str] = None,
+        heartbeat: float = 15.0,
+    ) -> AsyncIterator[Optional[StreamEvent]]:
+        """
+        Yield matching (entry_id, fields) events, resuming after
+        last_event_id when given. Yields None when idle for `heartbeat`
+        seconds so callers can send keep-alives. Raises ValueError for a
+        last_event_id that is not a stream entry ID.
+        """
+        if last_event_id and not is_stream_id(last_event_id):
+            raise ValueError(f"Invalid last event ID: {last_event_id!r}")
+        subscriber = _Subscriber(filters, self.queue_size)
+        self._subscribers.add(subscriber)
+        self._ensure_reader()
+
+        try:
+            delivered: Optional[Tuple[int, int]] = None
+            if last_event_id:
+                async for entry_id, fields in self._replay(subscriber, last_event_id):
+                    delivered = _parse_id(entry_id)
+                    yield entry_id, fields
+
+            while True:
+                if subscriber.overflowed and subscriber.queue.empty():
+                    raise StreamOverflow("Watcher fell behind the activity stream")
+                try:
+                    entry_id, fields = await asyncio.wait_for(
+                        subscriber.queue.get(), timeout=heartbeat
+                    )
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if delivered is not None and _parse_id(entry_id) <= delivered:
+                    continue
+                yield entry_id, fields
+        finally:
+            self._subscribers.discard(subscriber)
+
+    @staticmethod
+    def to_sse(event: Optional[StreamEvent]) -> bytes:
+        if event is None:
+            return b": keep-alive\n\n"
+        entry_id, fields = event
+        return (
+            f"id: {entry_id}\nevent: activity\n".encode()
+            + b"data: " + orjson.dumps(fields) + b"\n\n"
+        )
+
+
+activity_stream_hub = ActivityStreamHub(
+    key=settings.ACTIVITY_STREAM_KEY,
+    maxlen=settings.ACTIVITY_STREAM_MAXLEN,
+)
@@ -0,0 +1,218 @@
+import hashlib
+import hmac
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import func, or_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from .calendar_versions import calendar_feed_versions
+from .config import settings
+from .redis import redis_client
+from .loggers import app_logger as logger
+from ..cruds.meeting_occurrences import crud_meeting_occurrence
+from ..cruds.meetings import parse_participant_emails
+from ..database.database import AsyncSessionLocal
+from ..models.meeting_participants import MeetingParticipant
+from ..models.meetings import MAX_MEETING_DURATION_MINUTES, Meeting
+from ..models.users import User
+from ..utils.icalendar import calendar_footer, calendar_header, vevent
+
+
+FEED_CACHE_KEY = "automeet:ics:{}"
+# Bump when the feed layout changes so cached bodies and client ETags are dropped
+FEED_FORMAT_VERSION = 1
+
+
+class CalendarFeed:
+    """
+    Per-user iCalendar feed (meetings organized and invited to).
+
+    The ETag hashes the user's feed version (a Redis token replaced on
+    every meeting or participant write, see CalendarFeedVersions) and the
+    window start, so an unchanged calendar is answered with 304 after one
+    Redis read. Without a version the ETag falls back to an aggregate over
+    the organized and invited meetings (UNION ALL, so each half uses its
+    index). A changed calendar is streamed from a server-side cursor,
+    VEVENTs flushed in chunks, and the finished body is kept in Redis
+    under the new ETag for the next client that polls.
+    Recurring meetings are sent as one VEVENT with their RRULE plus one per
+    exception, never expanded.
+    """
+
+    def __init__(
+        self,
+        past_days: int = 90,
+        cache_ttl: int = 3600,
+        max_cache_bytes: int = 2 * 1024 * 1024,
+        chunk_events: int = 200,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.past_days = past_days
+        self.cache_ttl = cache_ttl
+        self.max_cache_bytes = max_cache_bytes
+        self.chunk_events = chunk_events
+        self.session_factory = session_factory
+
+    # Subscription URLs carry a per-user token instead of a bearer token;
+    # rotating the user's salt invalidates the old URL
+    def feed_token(self, user_uuid: str, salt: str = "") -> str:
+        digest = hmac.new(settings.JWT_SECRET_KEY.encode(), f"ics:{user_uuid}:{salt}".encode(), hashlib.sha256)
+        return digest.hexdigest()[:32]
+
+    async def current_token(self, db: AsyncSession, user_uuid: str) -> str:
+        return self.feed_token(user_uuid, await calendar_feed_versions.salt(db, user_uuid))
+
+    async def rotate_token(self, db: AsyncSession, user_uuid: str) -> str:
+        return self.feed_token(user_uuid, await calendar_feed_versions.rotate_salt(db, user_uuid))
+
+    async def verify_token(self, db: AsyncSession, user_uuid: str, token: str) -> bool:
+        return hmac.compare_digest(await self.current_token(db, user_uuid), token or "")
+
+    def _window_start(self) -> datetime:
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        return today - timedelta(days=self.past_days)
+
+    def _clauses(self, user_uuid: str, window_start: datetime) -> List:
+        """Meetings of the user (organizer or invitee) still relevant at window_start."""
+        return [
+            or_(
+                Meeting.user_uuid == user_uuid,
+                Meeting.uuid.in_(select(MeetingParticipant.meeting_uuid).where(MeetingParticipant.user_uuid == user_uuid)),
+            ),
+            self._window_clause(window_start),
+        ]
+
+    def _window_clause(self, window_start: datetime):
+        return or_(
+            # One-off meetings: bounded on starts_at so the (user_uuid, starts_at) index applies
+            Meeting.starts_at > window_start - timedelta(minutes=MAX_MEETING_DURATION_MINUTES),
+            Meeting.recurring.is_(True) & or_(Meeting.recurrence_until.is_(None), Meeting.recurrence_until > window_start),
+        )
+
+    async def _aggregate(self, db: AsyncSession, user_uuid: str, window_start: datetime) -> str:
+        """Latest updated_at and count of the feed's meetings, organized and invited apart."""
+        window = self._window_clause(window_start)
+        organized = select(Meeting.updated_at).where(Meeting.user_uuid == user_uuid, window)
+        invited = (
+            select(Meeting.updated_at)
+            .join(MeetingParticipant, MeetingParticipant.meeting_uuid == Meeting.uuid)
+            .where(MeetingParticipant.user_uuid == user_uuid, Meeting.user_uuid != user_uuid, window)
+        )
+        meetings = union_all(organized, invited).subquery()
+        latest, count = (await db.execute(select(func.max(meetings.c.updated_at), func.count()))).one()
+        return f"{latest}|{count}"
+
+    async def version(self, db: AsyncSession, user_uuid: str) -> str:
+        """Strong ETag of the user's feed."""
+        window_start = self._window_start()
+        stamp = await calendar_feed_versions.get(user_uuid)
+        stamp = f"v:{stamp}" if stamp else f"a:{await self._aggregate(db, user_uuid, window_start)}"
+        raw = f"{FEED_FORMAT_VERSION}|{user_uuid}|{stamp}|{window_start:%Y%m%d}"
+        return '"' + hashlib.sha1(raw.encode()).hexdigest()[:24] + '"'
+
+    async def cached(self, user_uuid: str, etag: str) -> Optional[str]:
+        try:
+            cached_etag, body = await redis_client.hmget(FEED_CACHE_KEY.format(user_uuid), "etag", "body")
+        except Exception as exc:
+            logger.warning(f"Calendar feed cache read failed: {exc}")
+            return None
+        return body if cached_etag == etag else None
+
+    async def _store(self, user_uuid: str, etag: str, body: str) -> None:
+        try:
+            key = FEED_CACHE_KEY.format(user_uuid)
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping={"etag": etag, "body": body})
+                pipe.expire(key, self.cache_ttl)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning(f"Calendar feed cache write failed: {exc}")
+
+    async def stream(self, user_uuid: str, etag: str, name: str = "Automeet") -> AsyncIterator[bytes]:
+        """Feed body in chunks; cached afterwards if it stayed under max_cache_bytes."""
+        parts: List[str] = []
+        size = 0
+
+        def emit(text: str) -> bytes:
+            nonlocal size
+            if size <= self.max_cache_bytes:
+                parts.append(text)
+                size += len(text)
+            return text.encode("utf-8")
+
+        yield emit(calendar_header(name))
+        window_start = self._window_start()
+        series: Dict[str, Any] = {}
+        async with self.session_factory() as db:
+            result = await db.stream(
+                select(
+                    Meeting.uuid, Meeting.title, Meeting.description, Meeting.platform, Meeting.participant,
+                    Meeting.starts_at, Meeting.ends_at, Meeting.duration, Meeting.recurrence_rule,
+                    Meeting.updated_at, User.email,
+                )
+                .join(User, User.uuid == Meeting.user_uuid)
+                .where(*self._clauses(user_uuid, window_start))
+                .execution_options(yield_per=self.chunk_events)
+            )
+            buffer: List[str] = []
+            async for row in result:
+                if not row.recurrence_rule and row.ends_at <= window_start:
+                    continue
+                if row.recurrence_rule:
+                    series[row.uuid] = row
+                buffer.append(vevent(
+                    uid=f"{row.uuid}@automeet",
+                    starts_at=row.starts_at,
+                    ends_at=row.ends_at,
+                    summary=row.title,
+                    stamp=row.updated_at,
+                    description=row.description,
+                    location=row.platform,
+                    organizer=row.email,
+                    attendees=parse_participant_emails(row.participant),
+                    rrule=row.recurrence_rule,
+                ))
+                if len(buffer) >= self.chunk_events:
+                    yield emit("".join(buffer))
+                    buffer = []
+            if buffer:
+                yield emit("".join(buffer))
+
+            # Exceptions of the recurring meetings, as RECURRENCE-ID events
+            uuids = list(series)
+            for start in range(0, len(uuids), 500):
+                changes = await crud_meeting_occurrence.get_changes(db, uuids[start:start + 500])
+                buffer = []
+                for meeting_uuid, by_original in changes.items():
+                    row = series[meeting_uuid]
+                    for original, change in sorted(by_original.items()):
+                        starts_at = change.starts_at or original
+                        duration = timedelta(minutes=change.duration or row.duration)
+                        buffer.append(vevent(
+                            uid=f"{row.uuid}@automeet",
+                            starts_at=starts_at,
+                            ends_at=starts_at + duration,
+                            summary=change.title or row.title,
+                            stamp=row.updated_at,
+                            description=row.description,
+                            location=row.platform,
+                            organizer=row.email,
+                            recurrence_id=original,
+                            cancelled=change.cancelled,
+                            sequence=1,
+                        ))
+                if buffer:
+                    yield emit("".join(buffer))
+
+        yield emit(calendar_footer())
+        if size <= self.max_cache_bytes:
+            await self._store(user_uuid, etag, "".join(parts))
+
+
+calendar_feed = CalendarFeed(
+    past_days=settings.CALENDAR_FEED_PAST_DAYS,
+    cache_ttl=settings.CALENDAR_FEED_CACHE_TTL,
+    max_cache_bytes=settings.CALENDAR_FEED_MAX_CACHE_BYTES,
+)
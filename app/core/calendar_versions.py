@@ -0,0 +1,98 @@
+import secrets
+from typing import Iterable, Optional
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from .config import settings
+from .redis import redis_client
+from .loggers import redis_logger as logger
+from ..models.users import User
+
+
+FEED_VERSION_KEY = "automeet:ics:version:{}"
+FEED_SALT_KEY = "automeet:ics:salt:{}"
+
+
+class CalendarFeedVersions:
+    """
+    Per-user state of the iCalendar feed.
+
+    The version is a random Redis token replaced after every committed
+    meeting or participant write that touches the user, so a poll compares
+    one GET instead of querying meetings. A missing version (never
+    written, expired, Redis flushed, or dropped because a bump failed)
+    makes the feed fall back to its aggregate query.
+
+    The salt is mixed into the subscription token and replaced to rotate
+    a leaked feed URL. It is stored on the user row and only cached in
+    Redis for `salt_ttl`, so losing Redis cannot revive a rotated URL.
+    Users without one keep the unsalted token.
+    """
+
+    def __init__(self, version_ttl: int = 86400, salt_ttl: int = 300):
+        self.version_ttl = version_ttl
+        self.salt_ttl = salt_ttl
+
+    async def get(self, user_uuid: str) -> Optional[str]:
+        try:
+            return await redis_client.get(FEED_VERSION_KEY.format(user_uuid))
+        except Exception as exc:
+            logger.warning(f"Calendar feed version read failed: {exc}")
+            return None
+
+    async def touch(self, user_uuids: Iterable[str]) -> None:
+        """Give each user's feed a new version; call after the write committed."""
+        keys = [FEED_VERSION_KEY.format(user_uuid) for user_uuid in {user_uuid for user_uuid in user_uuids if user_uuid}]
+        if not keys:
+            return
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.set(key, secrets.token_hex(8), ex=self.version_ttl)
+                await pipe.execute()
+        except Exception as exc:
+            # Without a version the feed revalidates against the database
+            logger.warning(f"Calendar feed version bump failed, dropping versions: {exc}")
+            try:
+                await redis_client.delete(*keys)
+            except Exception as exc:
+                logger.error(f"Calendar feed versions could not be dropped, feeds may stay stale: {exc}")
+
+    async def salt(self, db: AsyncSession, user_uuid: str) -> str:
+        """Current token salt: Redis cache, then the user row."""
+        key = FEED_SALT_KEY.format(user_uuid)
+        try:
+            cached = await redis_client.get(key)
+            if cached is not None:
+                return cached
+        except Exception as exc:
+            logger.warning(f"Calendar feed salt cache read failed: {exc}")
+
+        salt = (await db.execute(
+            select(User.calendar_feed_salt).where(User.uuid == user_uuid)
+        )).scalar() or ""
+        try:
+            await redis_client.set(key, salt, ex=self.salt_ttl)
+        except Exception as exc:
+            logger.warning(f"Calendar feed salt cache write failed: {exc}")
+        return salt
+
+    async def rotate_salt(self, db: AsyncSession, user_uuid: str) -> str:
+        """Store a new salt on the user row (commits) and refresh the cache."""
+        salt = secrets.token_hex(16)
+        await db.execute(update(User).where(User.uuid == user_uuid).values(calendar_feed_salt=salt))
+        await db.commit()
+        try:
+            await redis_client.set(FEED_SALT_KEY.format(user_uuid), salt, ex=self.salt_ttl)
+        except Exception as exc:
+            # A cached old salt lives at most salt_ttl longer
+            logger.warning(f"Calendar feed salt cache write failed: {exc}")
+        return salt
+
+
+calendar_feed_versions = CalendarFeedVersions(
+    version_ttl=settings.CALENDAR_FEED_VERSION_TTL,
+    salt_ttl=settings.CALENDAR_FEED_SALT_CACHE_TTL,
+)
@@ -1,4 +1,5 @@
 import os
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 
@@ -7,6 +8,8 @@ class Settings(BaseSettings):
     APP_NAME: str = "Automeet"
     API_VERSION: str = "1.0.0"
     ENV: str = "local"
+    ENVIRONMENT: str = "development"
+    SERVICE_NAME: str = "automeet-backend"
     FRONTEND_URL: str = "https://v0-auto-meeting-assistant.vercel.app"
     BASE_API_URL: str = "http://localhost:8000"
 
@@ -18,6 +21,9 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = "automeet123"
     DB_NAME: str = "automeet_db"
     DATABASE_URL: str = ""
+    # UUID key storage: "string" (VARCHAR(36)) or "binary" (BINARY(16),
+    # after running app.commands.migrate_uuid_binary)
+    DB_UUID_STORAGE: str = "string"
 
    
     # JWT / AUTH  
@@ -27,6 +33,51 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24   # 24 hours
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7   # 7 days
 
+    # Verified-token and principal caches for authenticated requests
+    AUTH_TOKEN_CACHE_SIZE: int = 50_000
+    AUTH_PRINCIPAL_CACHE_SIZE: int = 10_000
+    AUTH_PRINCIPAL_CACHE_TTL: int = 300
+
+    # Access-token revocation: per-worker Bloom filter rebuilt from Redis
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = 100_000
+    TOKEN_REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    TOKEN_REVOCATION_SYNC_INTERVAL: float = 30.0
+
+    # Resolved RBAC permission cache (per user, in process and in Redis)
+    PERMISSION_CACHE_SIZE: int = 10_000
+    PERMISSION_CACHE_TTL: int = 3600
+
+    # Password hashing pool (bcrypt runs off the event loop)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    # bcrypt cost: fixed when PASSWORD_HASH_ROUNDS is set, otherwise the
+    # highest cost that hashes within PASSWORD_HASH_TARGET_MS at startup
+    PASSWORD_HASH_ROUNDS: int = 0
+    PASSWORD_HASH_TARGET_MS: int = 250
+    PASSWORD_HASH_MIN_ROUNDS: int = 10
+    # Repeat logins for unknown users skip bcrypt (0 disables the cache)
+    PASSWORD_UNKNOWN_USER_CACHE_SIZE: int = 10_000
+    PASSWORD_UNKNOWN_USER_CACHE_TTL: int = 600
+
+    # Rate limiting ("<count>/<period>", e.g. "10/minute", "5/15minutes";
+    # an empty value disables that key)
+    RATE_LIMIT_ENABLED: bool = True
+    # Behind a proxy: the client is the TRUSTED_PROXIES-th X-Forwarded-For
+    # entry from the right (entries further left are client-supplied)
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+    RATE_LIMIT_TRUSTED_PROXIES: int = 1
+    RATE_LIMIT_LOGIN_PER_IP: str = "30/minute"
+    RATE_LIMIT_LOGIN_PER_EMAIL: str = "10/15minutes"
+    RATE_LIMIT_VERIFICATION_PER_IP: str = "20/hour"
+    RATE_LIMIT_VERIFICATION_PER_EMAIL: str = "5/hour"
+    RATE_LIMIT_VERIFICATION_PER_USER: str = "5/hour"
+
+    # OTP / verification codes ("redis" with database fallback, or "database")
+    OTP_BACKEND: str = "redis"
+    OTP_LENGTH: int = 6
+    OTP_EXPIRE_MINUTES: int = 60 * 12
+    OTP_MAX_ATTEMPTS: int = 5
+
    
     # REDIS 
    
@@ -35,6 +86,9 @@ class Settings(BaseSettings):
     REDIS_USERNAME: str = "default"
     REDIS_PASSWORD: str = ""
     REDIS_URL: str = ""
+    # Seconds; request-path commands fail fast when Redis is unreachable
+    REDIS_CONNECT_TIMEOUT: float = 2.0
+    REDIS_SOCKET_TIMEOUT: float = 2.0
 
     # Email (optional - enable later)
     EMAIL_SERVICE: str = "custom"
@@ -44,6 +98,99 @@ class Settings(BaseSettings):
     MAIL_SERVER: str = ""
     MAIL_PORT: int = 587
     MAIL_FROM_NAME: str = "Automeet"
+    MAIL_STARTTLS: bool = True
+    MAIL_SSL_TLS: bool = False
+
+    # Email outbox (rows are delivered by a worker, never inline).
+    # EMAIL_OUTBOX_WORKER runs the worker inside the API process.
+    EMAIL_OUTBOX_WORKER: bool = True
+    EMAIL_OUTBOX_BATCH_SIZE: int = 200
+    EMAIL_OUTBOX_POLL_INTERVAL: float = 2.0
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 8
+    EMAIL_OUTBOX_LEASE_SECONDS: int = 120
+    EMAIL_OUTBOX_RETRY_BASE_SECONDS: int = 30
+    # Max concurrent batches in flight per provider
+    EMAIL_PROVIDER_CONCURRENCY: Dict[str, int] = {"smtp": 4, "mailjet": 8}
+
+    # Recurring meetings: weeks of occurrences kept materialized per series
+    MEETING_OCCURRENCE_CACHE_WEEKS: int = 8
+
+    # Meeting reminders: due times live in a Redis sorted set; one leader
+    # process (lease in Redis) claims due batches and writes reminder
+    # emails to the outbox. The leader also re-syncs the next
+    # HORIZON_MINUTES of meetings from the database every
+    # RECONCILE_INTERVAL seconds, so reminders survive a Redis flush.
+    MEETING_REMINDER_WORKER: bool = True
+    MEETING_REMINDER_LEAD_MINUTES: List[int] = [15]
+    MEETING_REMINDER_BATCH_SIZE: int = 500
+    MEETING_REMINDER_POLL_INTERVAL: float = 5.0
+    MEETING_REMINDER_LEASE_SECONDS: int = 120
+    MEETING_REMINDER_HORIZON_MINUTES: int = 24 * 60
+    MEETING_REMINDER_RECONCILE_INTERVAL: float = 300.0
+
+    # iCalendar feeds: meetings that ended more than PAST_DAYS ago are left
+    # out; rendered feeds up to MAX_CACHE_BYTES are cached in Redis per
+    # user and revalidated by ETag on every request. The per-user version
+    # behind the ETag lives VERSION_TTL seconds after the last write; feed
+    # token salts (users.calendar_feed_salt) are cached for SALT_CACHE_TTL.
+    CALENDAR_FEED_PAST_DAYS: int = 90
+    CALENDAR_FEED_CACHE_TTL: int = 3600
+    CALENDAR_FEED_MAX_CACHE_BYTES: int = 2 * 1024 * 1024
+    CALENDAR_FEED_VERSION_TTL: int = 86400
+    CALENDAR_FEED_SALT_CACHE_TTL: int = 300
+
+    # WebSocket notifications: events fan out to every worker over Redis
+    # pub/sub. A socket with more than MAX_PENDING queued events, or whose
+    # send blocks for SEND_TIMEOUT seconds, is closed (1013).
+    NOTIFICATION_CHANNEL: str = "automeet:notifications"
+    NOTIFICATION_MAX_CONNECTIONS: int = 20_000
+    NOTIFICATION_MAX_PENDING: int = 256
+    NOTIFICATION_BATCH_SIZE: int = 50
+    NOTIFICATION_FLUSH_INTERVAL: float = 0.05
+    NOTIFICATION_SEND_TIMEOUT: float = 5.0
+    NOTIFICATION_AUTH_RECHECK_INTERVAL: float = 60.0
+
+    # Email domain (MX) checks: cached per domain, fail open after the
+    # timeout budget. Domains in the allowlist are never looked up.
+    EMAIL_MX_CHECK_ENABLED: bool = True
+    EMAIL_MX_TIMEOUT: float = 2.0
+    EMAIL_MX_CACHE_TTL: int = 86400
+    EMAIL_MX_NEGATIVE_TTL: int = 600
+    EMAIL_MX_CACHE_SIZE: int = 10_000
+    EMAIL_MX_ALLOWLIST: List[str] = []
+
+    # Logging
+    # LOG_FORMAT "json" writes one structured record per line (orjson).
+    # LOG_SAMPLE_RATES keeps a fraction of records per level or per
+    # "logger:LEVEL", e.g. {"DEBUG": 0.05, "database:INFO": 0.1}.
+    # ERROR and CRITICAL are never sampled.
+    LOG_FORMAT: str = "text"
+    LOG_SAMPLE_RATES: Dict[str, float] = {}
+
+    # Log search backend: "meilisearch", "sqlite" (local FTS5 index,
+    # works offline) or "" to disable indexing.
+    LOG_SEARCH_BACKEND: str = "meilisearch"
+    LOG_SEARCH_SQLITE_PATH: str = "logs/log_index.db"
+
+    # Meilisearch log shipping (optional)
+    MEILI_SEARCH_URL: str = ""
+    MEILI_SEARCH_API_KEY: str = ""
+    MEILI_SEARCH_INDEX: str = "automeet_logs"
+    MEILI_LOG_QUEUE_SIZE: int = 10_000
+    MEILI_LOG_BATCH_SIZE: int = 500
+    MEILI_LOG_FLUSH_INTERVAL: float = 1.0
+
+    # Activity rollups
+    # Inline mode updates counters from the activity-log writer; otherwise
+    # the watermark catch-up job folds new rows in batches.
+    ACTIVITY_ROLLUP_INLINE: bool = False
+    ACTIVITY_ROLLUP_BATCH_SIZE: int = 5000
+    # Catch-up leaves rows younger than this for the next pass (late commits)
+    ACTIVITY_ROLLUP_SAFETY_LAG_SECONDS: int = 60
+
+    # Live activity-log tail (Redis Stream, trimmed to roughly MAXLEN entries)
+    ACTIVITY_STREAM_KEY: str = "automeet:activity_logs"
+    ACTIVITY_STREAM_MAXLEN: int = 100_000
 
     model_config = ConfigDict(extra="ignore")
 
@@ -0,0 +1,193 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+from fastapi import Request
+
+from .config import settings
+from .rate_limit import request_email
+from .redis import redis_client
+from .loggers import app_logger as logger
+from ..utils.responses import bad_request_response
+
+
+# Resolver contract: return the MX answer TTL in seconds when the domain
+# has MX records, None when it has none (NXDOMAIN / no answer). Raise
+# asyncio.TimeoutError or any other exception for "unknown" (SERVFAIL,
+# unreachable nameservers), which fails open and is not cached.
+MXResolver = Callable[[str], Awaitable[Optional[int]]]
+
+WELL_KNOWN_DOMAINS = frozenset({
+    "gmail.com", "googlemail.com", "outlook.com", "hotmail.com", "live.com",
+    "msn.com", "yahoo.com", "ymail.com", "icloud.com", "me.com", "mac.com",
+    "aol.com", "proton.me", "protonmail.com", "zoho.com", "gmx.com",
+    "gmx.net", "mail.com", "yandex.com", "fastmail.com",
+})
+
+
+async def dns_mx_resolver(domain: str) -> Optional[int]:
+    """MX lookup with dnspython's asyncio resolver."""
+    import dns.asyncresolver
+    import dns.resolver
+
+    try:
+        answer = await dns.asyncresolver.resolve(domain, "MX", lifetime=settings.EMAIL_MX_TIMEOUT)
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+        return None
+    except dns.resolver.LifetimeTimeout as exc:
+        raise asyncio.TimeoutError(str(exc))
+    return answer.rrset.ttl if len(answer) else None
+
+
+class StaticMXResolver:
+    """Stub resolver for tests and benchmarks: {domain: has_mx} with optional delay."""
+
+    def __init__(self, records: Dict[str, bool], delay: float = 0.0, ttl: int = 3600):
+        self.records = records
+        self.delay = delay
+        self.ttl = ttl
+        self.calls = 0
+
+    async def __call__(self, domain: str) -> Optional[int]:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.ttl if self.records.get(domain) else None
+
+
+class MXChecker:
+    """
+    Async "does this email domain accept mail" check.
+
+    Well-known providers are accepted without a lookup. Results are cached
+    per domain in process and in Redis (positive answers for the MX TTL,
+    capped; negative ones for a shorter TTL), and concurrent checks for the
+    same domain share one lookup. A lookup that exceeds the timeout budget
+    or cannot reach a nameserver fails open and is not cached, so DNS
+    trouble never blocks sign-ups.
+    """
+
+    def __init__(
+        self,
+        resolver: MXResolver = dns_mx_resolver,
+        allowlist: Iterable[str] = WELL_KNOWN_DOMAINS,
+        timeout: float = 2.0,
+        ttl: int = 86400,
+        negative_ttl: int = 600,
+        max_entries: int = 10_000,
+        use_redis: bool = True,
+    ):
+        self.resolver = resolver
+        self.allowlist = frozenset(domain.lower() for domain in allowlist)
+        self.timeout = timeout
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.use_redis = use_redis
+        self._entries: "OrderedDict[str, Tuple[float, bool]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def _cached(self, domain: str) -> Optional[bool]:
+        entry = self._entries.get(domain)
+        if entry is None:
+            return None
+        expires_at, valid = entry
+        if expires_at < time.monotonic():
+            del self._entries[domain]
+            return None
+        self._entries.move_to_end(domain)
+        return valid
+
+    def _remember(self, domain: str, valid: bool, ttl: int) -> None:
+        self._entries[domain] = (time.monotonic() + ttl, valid)
+        self._entries.move_to_end(domain)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _store(self, domain: str, answer_ttl: Optional[int]) -> Tuple[bool, int]:
+        valid = answer_ttl is not None
+        ttl = min(max(answer_ttl, self.negative_ttl), self.ttl) if valid else self.negative_ttl
+        self._remember(domain, valid, ttl)
+        return valid, ttl
+
+    async def _lookup(self, domain: str) -> bool:
+        redis_key = f"automeet:mx:{domain}"
+        if self.use_redis:
+            try:
+                value = await redis_client.get(redis_key)
+                if value is not None:
+                    valid = value == "1"
+                    self._remember(domain, valid, self.ttl if valid else self.negative_ttl)
+                    return valid
+            except Exception as exc:
+                logger.warning(f"MX cache read failed: {exc}")
+
+        try:
+            answer_ttl = await asyncio.wait_for(self.resolver(domain), timeout=self.timeout)
+        except Exception as exc:
+            logger.warning(f"MX lookup for {domain} failed, accepting: {exc!r}")
+            return True
+
+        valid, ttl = self._store(domain, answer_ttl)
+        if self.use_redis:
+            try:
+                await redis_client.set(redis_key, "1" if valid else "0", ex=ttl)
+            except Exception as exc:
+                logger.warning(f"MX cache write failed: {exc}")
+        return valid
+
+    async def has_mx(self, domain: str) -> bool:
+        domain = domain.strip().lower().rstrip(".")
+        if domain in self.allowlist:
+            return True
+        cached = self._cached(domain)
+        if cached is not None:
+            return cached
+
+        # The lookup runs in its own task, which callers shield and never
+        # cancel: a caller that goes away leaves it running for the others
+        task = self._inflight.get(domain)
+        if task is None:
+            task = asyncio.create_task(self._lookup(domain))
+            self._inflight[domain] = task
+            task.add_done_callback(lambda done: self._forget(domain, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, domain: str, task: asyncio.Task) -> None:
+        if self._inflight.get(domain) is task:
+            del self._inflight[domain]
+
+    async def check_email(self, email: str) -> bool:
+        return await self.has_mx(email.rpartition("@")[2])
+
+
+mx_checker = MXChecker(
+    allowlist=WELL_KNOWN_DOMAINS | frozenset(settings.EMAIL_MX_ALLOWLIST),
+    timeout=settings.EMAIL_MX_TIMEOUT,
+    ttl=settings.EMAIL_MX_CACHE_TTL,
+    negative_ttl=settings.EMAIL_MX_NEGATIVE_TTL,
+    max_entries=settings.EMAIL_MX_CACHE_SIZE,
+)
+
+
+async def ensure_email_domain(email: str) -> str:
+    """Raise 400 when the email's domain has no MX records (call from endpoints)."""
+    if settings.EMAIL_MX_CHECK_ENABLED and not await mx_checker.check_email(email):
+        domain = email.rpartition("@")[2]
+        return bad_request_response(f"Email domain {domain} has no MX records")
+    return email
+
+
+async def require_email_domain(request: Request) -> None:
+    """
+    Route dependency for sign-up and verification endpoints: checks the
+    JSON body's email with ensure_email_domain before the endpoint runs.
+    Add it after the rate limit so throttled requests cost no lookup, e.g.
+
+        @router.post("/signup", dependencies=[Depends(verification_rate_limit), Depends(require_email_domain)])
+
+    Malformed or missing emails are left to schema validation.
+    """
+    email = await request_email(request)
+    if email and "@" in email:
+        await ensure_email_domain(email)
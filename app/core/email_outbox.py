@@ -0,0 +1,178 @@
+import asyncio
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .mailer import EmailSender, OutgoingEmail, get_email_sender
+from .loggers import app_logger as logger
+from ..cruds.email_outbox import email_outbox_crud
+from ..database.database import AsyncSessionLocal
+from ..models.email_outbox import EmailOutbox
+
+
+class EmailOutboxWorker:
+    """
+    Delivers outbox rows. Each cycle claims one batch (SKIP LOCKED, so
+    several processes can run workers), splits it into provider-sized
+    chunks and sends them with at most `concurrency[provider]` chunks in
+    flight per provider. Results are settled in one transaction: sent rows
+    in a single UPDATE, failures rescheduled with backoff or dead-lettered.
+    Each cycle claims under its own lease token and only settles rows that
+    still carry it, so a cycle that outlived its lease cannot overwrite the
+    outcome of the worker that re-claimed its rows.
+
+    The worker sleeps for poll_interval between empty cycles and is woken
+    immediately when this process commits new outbox rows.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 200,
+        poll_interval: float = 2.0,
+        max_attempts: int = 8,
+        lease_seconds: int = 120,
+        retry_base_seconds: int = 30,
+        concurrency: Optional[Dict[str, int]] = None,
+        sender_factory: Callable[[str], EmailSender] = get_email_sender,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.retry_base_seconds = retry_base_seconds
+        self.concurrency = concurrency or {}
+        self.sender_factory = sender_factory
+        self.session_factory = session_factory
+        self.stats = {"sent": 0, "failed": 0, "dead": 0}
+        self._senders: Dict[str, EmailSender] = {}
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _sender(self, provider: str) -> Tuple[EmailSender, asyncio.Semaphore]:
+        if provider not in self._senders:
+            self._senders[provider] = self.sender_factory(provider)
+            self._slots[provider] = asyncio.Semaphore(self.concurrency.get(provider, 4))
+        return self._senders[provider], self._slots[provider]
+
+    async def _send_chunk(self, provider: str, chunk: List[OutgoingEmail]) -> List[Tuple[int, Optional[str]]]:
+        sender, slots = self._sender(provider)
+        async with slots:
+            try:
+                errors = await sender.send_batch(chunk)
+            except Exception as exc:
+                errors = [str(exc)] * len(chunk)
+        return [(message.id, error) for message, error in zip(chunk, errors)]
+
+    async def run_once(self) -> int:
+        """Claim and deliver one batch; returns the number of rows processed."""
+        lease = uuid.uuid4().hex
+        async with self.session_factory() as db:
+            batches, expired = await email_outbox_crud.claim(
+                db, lease, self.batch_size, self.lease_seconds, self.max_attempts
+            )
+        if expired:
+            self.stats["dead"] += expired
+            logger.warning(f"Email outbox: {expired} dead-lettered after their lease expired")
+        if not batches:
+            return 0
+
+        jobs, results = [], []
+        for provider, messages in batches.items():
+            try:
+                sender, _ = self._sender(provider)
+            except Exception as exc:
+                # Misconfigured provider: fail its rows instead of leaving them leased
+                logger.error(f"Email outbox: cannot create {provider} sender: {exc}")
+                results.extend((message.id, f"sender: {exc}") for message in messages)
+                continue
+            for start in range(0, len(messages), sender.batch_size):
+                jobs.append(self._send_chunk(provider, messages[start:start + sender.batch_size]))
+        results += [item for chunk in await asyncio.gather(*jobs) for item in chunk]
+
+        sent = [message_id for message_id, error in results if error is None]
+        failures = {message_id: error for message_id, error in results if error is not None}
+        async with self.session_factory() as db:
+            settled = await email_outbox_crud.mark_sent(db, sent, lease)
+            dead = await email_outbox_crud.mark_failed(
+                db, failures, lease, self.max_attempts, self.retry_base_seconds
+            )
+            await db.commit()
+
+        if settled < len(sent):
+            logger.warning(f"Email outbox: lease lost on {len(sent) - settled} sent rows, they may be sent twice")
+        self.stats["sent"] += len(sent)
+        self.stats["failed"] += len(failures)
+        self.stats["dead"] += dead
+        if failures:
+            logger.warning(f"Email outbox: {len(failures)} failed, {dead} dead-lettered")
+        return len(results)
+
+    async def run(self) -> None:
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                processed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error(f"Email outbox cycle failed: {exc}")
+                processed = 0
+
+            if processed >= self.batch_size:
+                continue  # backlog: claim the next batch right away
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for sender in self._senders.values():
+            await sender.close()
+
+
+email_outbox_worker = EmailOutboxWorker(
+    batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+    poll_interval=settings.EMAIL_OUTBOX_POLL_INTERVAL,
+    max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    lease_seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS,
+    retry_base_seconds=settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS,
+    concurrency=settings.EMAIL_PROVIDER_CONCURRENCY,
+)
+
+
+# Wake the local worker as soon as outbox rows are committed
+@event.listens_for(Session, "after_flush")
+def _track_outbox_rows(session, flush_context):
+    if any(isinstance(obj, EmailOutbox) for obj in session.new):
+        session.info["outbox_added"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_outbox_worker(session):
+    if session.info.pop("outbox_added", False):
+        email_outbox_worker.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_outbox_rows(session):
+    session.info.pop("outbox_added", None)
@@ -0,0 +1,85 @@
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+
+# Per-request log context. A mutable dict is stored so that values added
+# deeper in the call stack (user, DB timing) are visible to the whole request.
+_log_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+    "automeet_log_context", default=None
+)
+
+
+def new_log_context(**values: Any) -> Dict[str, Any]:
+    context = {"request_id": values.pop("request_id", None) or uuid.uuid4().hex}
+    context.update({k: v for k, v in values.items() if v is not None})
+    _log_context.set(context)
+    return context
+
+
+def bind_log_context(**values: Any) -> None:
+    """Add fields (e.g. user_uuid) to the current request's log context."""
+    context = _log_context.get()
+    if context is None:
+        context = new_log_context()
+    context.update({k: v for k, v in values.items() if v is not None})
+
+
+def get_log_context() -> Dict[str, Any]:
+    return _log_context.get() or {}
+
+
+def record_db_time(seconds: float) -> None:
+    context = _log_context.get()
+    if context is None:
+        return
+    context["db_ms"] = round(context.get("db_ms", 0.0) + seconds * 1000, 3)
+    context["db_queries"] = context.get("db_queries", 0) + 1
+
+
+def _route(scope) -> str:
+    # Once routing ran, the matched template ("/meetings/{meeting_uuid}"),
+    # so a route is one value in the logs instead of one per resource
+    path = getattr(scope.get("route"), "path_format", None) or scope.get("path", "")
+    return f"{scope.get('method', 'WS')} {path}"
+
+
+class LogContextMiddleware:
+    """
+    ASGI middleware that opens a log context per HTTP/WebSocket request
+    carrying the request id (X-Request-ID or generated) and route. The
+    route is the raw path until the router has matched it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or [])
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1") or None
+        context = new_log_context(
+            request_id=request_id,
+            route=_route(scope),
+        )
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] in ("http.response.start", "websocket.accept"):
+                context["route"] = _route(scope)
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-request-id", context["request_id"].encode("latin-1"))
+                ]
+                context["status"] = message.get("status")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            context["route"] = _route(scope)
+            context["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
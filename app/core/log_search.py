@@ -0,0 +1,466 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+import orjson
+
+
+FILTERABLE_ATTRIBUTES = ("timestamp", "level", "service", "logger", "user_uuid")
+SORTABLE_ATTRIBUTES = ("timestamp", "level")
+MAX_TOTAL_HITS = 1000
+
+_TOKEN_RE = re.compile(
+    r"""\s*(?:(?P<quoted>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')"""
+    r"""|(?P<op>!=|>=|<=|=|>|<)|(?P<punct>[()\[\],])|(?P<word>[^\s()\[\],=!<>"']+))"""
+)
+_KEYWORDS = ("AND", "OR", "NOT", "IN", "TO")
+
+
+class LogSearchError(ValueError):
+    """Raised for filters or sorts the log index does not support."""
+
+
+def _literal(raw: str) -> Any:
+    try:
+        return int(raw)
+    except ValueError:
+        try:
+            return float(raw)
+        except ValueError:
+            return raw
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    """(kind, text) tokens; kind is "value", "op", a punctuation mark or a keyword."""
+    tokens, position = [], 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN_RE.match(expression, position)
+        if match is None or match.end() == position:
+            raise LogSearchError(f"Unsupported filter expression: {expression}")
+        position = match.end()
+        if match.group("quoted"):
+            text = match.group("quoted")
+            tokens.append(("value", re.sub(r"\\(.)", r"\1", text[1:-1])))
+        elif match.group("op"):
+            tokens.append(("op", match.group("op")))
+        elif match.group("punct"):
+            tokens.append((match.group("punct"), match.group("punct")))
+        else:
+            word = match.group("word")
+            tokens.append((word.upper(), word) if word.upper() in _KEYWORDS else ("word", word))
+    return tokens
+
+
+class _FilterParser:
+    """
+    Recursive descent over the Meilisearch filter grammar, with its
+    precedence (NOT binds tighter than AND, AND tighter than OR):
+
+        expression := and ("OR" and)*
+        and        := not ("AND" not)*
+        not        := "NOT" not | "(" expression ")" | condition
+        condition  := field op value | field ["NOT"] "IN" "[" values "]"
+                    | field value "TO" value
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def _take(self, *kinds: str) -> str:
+        kind = self._peek()
+        if kind not in kinds:
+            raise LogSearchError(f"Unsupported filter expression: {self.expression}")
+        self.position += 1
+        return self.tokens[self.position - 1][1]
+
+    def parse(self) -> Tuple[str, List[Any]]:
+        sql, params = self._or()
+        if self._peek() is not None:
+            raise LogSearchError(f"Unsupported filter expression: {self.expression}")
+        return sql, params
+
+    def _or(self) -> Tuple[str, List[Any]]:
+        parts = [self._and()]
+        while self._peek() == "OR":
+            self._take("OR")
+            parts.append(self._and())
+        return _join(parts, "OR")
+
+    def _and(self) -> Tuple[str, List[Any]]:
+        parts = [self._not()]
+        while self._peek() == "AND":
+            self._take("AND")
+            parts.append(self._not())
+        return _join(parts, "AND")
+
+    def _not(self) -> Tuple[str, List[Any]]:
+        if self._peek() == "NOT":
+            self._take("NOT")
+            sql, params = self._not()
+            # Complement, like Meilisearch: documents missing the field match too
+            return f"NOT IFNULL({sql}, 0)", params
+        if self._peek() == "(":
+            self._take("(")
+            grouped = self._or()
+            self._take(")")
+            return grouped
+        return self._condition()
+
+    def _value(self) -> Any:
+        kind = self._peek()
+        text = self._take("value", "word")
+        return text if kind == "value" else _literal(text)
+
+    def _condition(self) -> Tuple[str, List[Any]]:
+        field = _filterable(self._take("word"))
+        kind = self._peek()
+        if kind == "op":
+            operator = self._take("op")
+            value = self._value()
+            if operator == "!=":
+                return f"{field} IS NOT ?", [value]
+            return f"{field} {operator} ?", [value]
+        if kind in ("IN", "NOT"):
+            negated = kind == "NOT"
+            if negated:
+                self._take("NOT")
+            self._take("IN")
+            values = self._list()
+            if not values:
+                return ("1", []) if negated else ("0", [])
+            placeholders = ", ".join("?" * len(values))
+            if negated:
+                return f"({field} IS NULL OR {field} NOT IN ({placeholders}))", values
+            return f"{field} IN ({placeholders})", values
+        low = self._value()
+        self._take("TO")
+        return f"{field} BETWEEN ? AND ?", [low, self._value()]
+
+    def _list(self) -> List[Any]:
+        self._take("[")
+        values = []
+        while self._peek() != "]":
+            values.append(self._value())
+            if self._peek() != ",":
+                break
+            self._take(",")
+        self._take("]")
+        return values
+
+
+def _join(parts: List[Tuple[str, List[Any]]], operator: str) -> Tuple[str, List[Any]]:
+    if len(parts) == 1:
+        return parts[0]
+    return (
+        "(" + f" {operator} ".join(sql for sql, _ in parts) + ")",
+        [param for _, params in parts for param in params],
+    )
+
+
+def _filterable(field: str) -> str:
+    if field not in FILTERABLE_ATTRIBUTES:
+        raise LogSearchError(
+            f"Attribute `{field}` is not filterable. Available filterable "
+            f"attributes are: {', '.join(FILTERABLE_ATTRIBUTES)}"
+        )
+    return field
+
+
+def compile_filter(filter_expr: Any) -> Tuple[str, List[Any]]:
+    """
+    Translate a Meilisearch filter into SQL: a string expression, or a
+    list whose items are ANDed, where an inner list is ORed. Supports
+    =, !=, >, >=, <, <=, IN [...], NOT IN [...], TO, NOT, AND, OR and
+    parentheses, with Meilisearch precedence.
+    """
+    if not filter_expr:
+        return "", []
+    if isinstance(filter_expr, str):
+        return _FilterParser(filter_expr).parse()
+
+    clauses = []
+    for term in filter_expr:
+        if isinstance(term, (list, tuple)):
+            alternatives = [compile_filter(alternative) for alternative in term if alternative]
+            if alternatives:
+                clauses.append(_join(alternatives, "OR"))
+        elif term:
+            clauses.append(compile_filter(term))
+    return _join(clauses, "AND") if clauses else ("", [])
+
+
+def compile_sort(sort: Optional[List[str]]) -> str:
+    if not sort:
+        return "logs.timestamp DESC, logs.rowid DESC"
+    parts = []
+    for item in sort:
+        field, _, direction = item.partition(":")
+        if field not in SORTABLE_ATTRIBUTES or direction not in ("asc", "desc"):
+            raise LogSearchError(f"Unsupported sort: {item}")
+        parts.append(f"logs.{field} {direction.upper()}")
+    parts.append("logs.rowid DESC")
+    return ", ".join(parts)
+
+
+def compile_query(query: str) -> str:
+    """Quote each word for FTS5; the last word matches as a prefix."""
+    words = [word.replace('"', '""') for word in query.split()]
+    if not words:
+        return ""
+    tokens = [f'"{word}"' for word in words]
+    tokens[-1] += "*"
+    return " ".join(tokens)
+
+
+class SQLiteLogIndex:
+    """
+    A single log index stored in the shared SQLite database. Mirrors the
+    subset of `meilisearch.index.Index` used by the loggers and log APIs.
+    """
+
+    def __init__(self, client: "SQLiteLogSearchClient", uid: str):
+        self.client = client
+        self.uid = uid
+
+    # Settings are fixed by the schema; accepted for API compatibility
+    def update_filterable_attributes(self, attributes: List[str]) -> None:
+        return None
+
+    def update_sortable_attributes(self, attributes: List[str]) -> None:
+        return None
+
+    def add_documents(self, documents: List[dict], primary_key: Optional[str] = None):
+        return self.add_documents_ndjson(
+            b"\n".join(orjson.dumps(document, default=str) for document in documents)
+        )
+
+    def add_documents_ndjson(self, str_documents: bytes | str, primary_key: Optional[str] = None):
+        if isinstance(str_documents, str):
+            str_documents = str_documents.encode("utf-8")
+        rows = []
+        for line in str_documents.splitlines():
+            if not line.strip():
+                continue
+            document = orjson.loads(line)
+            rows.append(
+                (
+                    str(document.get("id") or uuid.uuid4().hex),
+                    self.uid,
+                    int(document.get("timestamp") or time.time()),
+                    document.get("level"),
+                    document.get("service"),
+                    document.get("logger"),
+                    document.get("user_uuid"),
+                    document.get("message") or "",
+                    line.decode("utf-8") if isinstance(line, bytes) else line,
+                )
+            )
+        # An upsert, not INSERT OR REPLACE: REPLACE deletes the old row without
+        # firing logs_ad, which would leave its tokens in logs_fts
+        self.client.write(
+            "INSERT INTO logs "
+            "(id, idx, timestamp, level, service, logger, user_uuid, message, document) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET idx = excluded.idx, timestamp = excluded.timestamp, "
+            "level = excluded.level, service = excluded.service, logger = excluded.logger, "
+            "user_uuid = excluded.user_uuid, message = excluded.message, document = excluded.document",
+            rows,
+        )
+        return {"indexUid": self.uid, "status": "succeeded", "documents": len(rows)}
+
+    def search(self, query: str = "", opt_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        started = time.perf_counter()
+        opt_params = opt_params or {}
+        limit = int(opt_params.get("limit", 20))
+        offset = int(opt_params.get("offset", 0))
+
+        where, params = ["logs.idx = ?"], [self.uid]
+        filter_sql, filter_params = compile_filter(opt_params.get("filter"))
+        if filter_sql:
+            where.append(f"({filter_sql})")
+            params.extend(filter_params)
+
+        match = compile_query(query or "")
+        if match:
+            # Evaluate MATCH once as a rowid list, not once per candidate row
+            where.append("logs.rowid IN (SELECT rowid FROM logs_fts WHERE logs_fts MATCH ?)")
+            params.append(match)
+
+        where_sql = " AND ".join(where)
+        order_sql = compile_sort(opt_params.get("sort"))
+
+        connection = self.client.reader()
+        hits = [
+            orjson.loads(row[0])
+            for row in connection.execute(
+                f"SELECT logs.document FROM logs WHERE {where_sql} "
+                f"ORDER BY {order_sql} LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            )
+        ]
+        # Like Meilisearch, totals are an estimate capped at MAX_TOTAL_HITS
+        (total,) = connection.execute(
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM logs WHERE {where_sql} LIMIT ?)",
+            (*params, MAX_TOTAL_HITS),
+        ).fetchone()
+
+        return {
+            "hits": hits,
+            "query": query,
+            "limit": limit,
+            "offset": offset,
+            "estimatedTotalHits": total,
+            "processingTimeMs": int((time.perf_counter() - started) * 1000),
+        }
+
+    def delete_older_than(self, timestamp: int) -> int:
+        return self.client.write(
+            "DELETE FROM logs WHERE idx = ? AND timestamp < ?", [(self.uid, timestamp)]
+        )
+
+
+class SQLiteLogSearchClient:
+    """
+    Offline log search backend: an SQLite FTS5 index with the same
+    `client.index(uid)` surface as the Meilisearch client.
+    Writes go through one locked connection (the shipper thread);
+    each reading thread gets its own connection (WAL mode).
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS logs (
+            rowid INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
+            idx TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            level TEXT,
+            service TEXT,
+            logger TEXT,
+            user_uuid TEXT,
+            message TEXT NOT NULL DEFAULT '',
+            document TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS ix_logs_idx_timestamp ON logs (idx, timestamp);
+        CREATE INDEX IF NOT EXISTS ix_logs_idx_level_timestamp ON logs (idx, level, timestamp);
+        CREATE INDEX IF NOT EXISTS ix_logs_idx_logger_timestamp ON logs (idx, logger, timestamp);
+        CREATE INDEX IF NOT EXISTS ix_logs_idx_service_timestamp ON logs (idx, service, timestamp);
+        CREATE INDEX IF NOT EXISTS ix_logs_idx_user_uuid_timestamp ON logs (idx, user_uuid, timestamp);
+
+        CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5(
+            message, content='logs', content_rowid='rowid'
+        );
+        CREATE TRIGGER IF NOT EXISTS logs_ai AFTER INSERT ON logs BEGIN
+            INSERT INTO logs_fts (rowid, message) VALUES (new.rowid, new.message);
+        END;
+        CREATE TRIGGER IF NOT EXISTS logs_ad AFTER DELETE ON logs BEGIN
+            INSERT INTO logs_fts (logs_fts, rowid, message) VALUES ('delete', old.rowid, old.message);
+        END;
+        CREATE TRIGGER IF NOT EXISTS logs_au AFTER UPDATE ON logs BEGIN
+            INSERT INTO logs_fts (logs_fts, rowid, message) VALUES ('delete', old.rowid, old.message);
+            INSERT INTO logs_fts (rowid, message) VALUES (new.rowid, new.message);
+        END;
+    """
+
+    def __init__(self, path: str):
+        if path == ":memory:":
+            # Shared in-memory database so reader threads see the same data
+            self.database = f"file:automeet-logs-{uuid.uuid4().hex}?mode=memory&cache=shared"
+        else:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.database = f"file:{path}"
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        # Index files created before user_uuid became filterable
+        columns = {row[1] for row in self._writer.execute("PRAGMA table_info(logs)")}
+        if columns and "user_uuid" not in columns:
+            self._writer.execute("ALTER TABLE logs ADD COLUMN user_uuid TEXT")
+        self._writer.executescript(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.database, uri=True, check_same_thread=False)
+
+    def reader(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def write(self, sql: str, rows: List[tuple]) -> int:
+        with self._write_lock, self._writer:
+            cursor = self._writer.executemany(sql, rows)
+            return cursor.rowcount
+
+    def index(self, uid: str) -> SQLiteLogIndex:
+        return SQLiteLogIndex(self, uid)
+
+
+def create_log_search_client(backend: str, **options: Any):
+    """
+    Build the configured log search client:
+    - "meilisearch": meilisearch.Client(url, api_key)
+    - "sqlite": SQLiteLogSearchClient(path)
+    Returns None when the backend is disabled or not configured.
+    """
+    if backend == "sqlite":
+        return SQLiteLogSearchClient(options.get("path") or "logs/log_index.db")
+    if backend == "meilisearch" and options.get("url") and options.get("api_key"):
+        import meilisearch
+
+        return meilisearch.Client(options["url"], options["api_key"])
+    return None
+
+
+# Filter fields that only shape the response, not the matched documents
+_PRESENTATION_FIELDS = ("skip", "limit", "sort", "search", "include_relations", "fields", "search_fields")
+
+
+def build_search_params(filters: Any) -> Tuple[str, Dict[str, Any]]:
+    """
+    Translate log list filters into a (query, opt_params) pair accepted by
+    both backends: skip/limit/sort/search, start_date/end_date on
+    timestamp, and equality on the filterable attributes. Any other
+    filter that is set raises LogSearchError rather than being ignored.
+    """
+    values = filters.model_dump(exclude_none=True) if hasattr(filters, "model_dump") else dict(vars(filters))
+    terms = []
+    start_date = values.pop("start_date", None)
+    end_date = values.pop("end_date", None)
+    if start_date:
+        terms.append(f"timestamp >= {int(start_date.timestamp())}")
+    if end_date:
+        terms.append(f"timestamp <= {int(end_date.timestamp())}")
+    for field in FILTERABLE_ATTRIBUTES:
+        value = values.pop(field, None)
+        if value is not None and value != "":
+            escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+            terms.append(f'{field} = "{escaped}"')
+
+    unsupported = sorted(
+        field for field, value in values.items()
+        if field not in _PRESENTATION_FIELDS and value not in (None, "")
+    )
+    if unsupported:
+        raise LogSearchError(f"Log search cannot filter by: {', '.join(unsupported)}")
+
+    opt_params: Dict[str, Any] = {
+        "limit": values.get("limit") or 20,
+        "offset": values.get("skip") or 0,
+    }
+    if terms:
+        opt_params["filter"] = " AND ".join(terms)
+    sort = values.get("sort")
+    if sort:
+        opt_params["sort"] = [item.strip() for item in sort.split(",") if item.strip()]
+    return values.get("search") or "", opt_params
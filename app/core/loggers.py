@@ -1,15 +1,51 @@
+import atexit
+import gzip
 import logging
 import os
+import queue
+import shutil
 import sys
 import time
 import threading
-import meilisearch
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+import uuid
+import random
+import orjson
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+)
 from .config import settings
+from .log_context import get_log_context
+from .log_search import FILTERABLE_ATTRIBUTES, SORTABLE_ATTRIBUTES, create_log_search_client
+
+
+# Background compression of rotated files
+_compress_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-gzip")
+
+
+def _gzip_file(path: str):
+    try:
+        with open(path, "rb") as source, gzip.open(f"{path}.gz", "wb") as target:
+            shutil.copyfileobj(source, target)
+        os.remove(path)
+    except OSError:
+        # Leave the uncompressed file in place; never break logging
+        pass
 
 
 # Custom Time + Size Handler
 class TimedRotatingFileHandlerWithSize(TimedRotatingFileHandler):
+    """
+    Rotates on time or size, whichever comes first.
+    - File size is tracked in memory (one stat on open, not per record)
+    - Size rollovers within the same period get a numbered suffix
+    - Rotated files are gzipped in the background
+    """
+
     def __init__(
         self,
         filename,
@@ -21,6 +57,7 @@ class TimedRotatingFileHandlerWithSize(TimedRotatingFileHandler):
         delay=False,
         utc=False,
         atTime=None,
+        compress=True,
     ):
         super().__init__(
             filename,
@@ -33,19 +70,363 @@ class TimedRotatingFileHandlerWithSize(TimedRotatingFileHandler):
             atTime=atTime,
         )
         self.maxBytes = maxBytes
+        self.compress = compress
+        try:
+            self._size = os.path.getsize(self.baseFilename)
+        except OSError:
+            self._size = 0
 
     def shouldRollover(self, record):
-        if super().shouldRollover(record):
+        if self.maxBytes > 0 and self._size >= self.maxBytes:
             return True
+        return super().shouldRollover(record)
+
+    def emit(self, record):
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            msg = self.format(record) + self.terminator
+            self.stream.write(msg)
+            self.flush()
+            self._size += len(msg.encode(self.encoding or "utf-8", "replace"))
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def _rotated_name(self) -> str:
+        period_start = self.rolloverAt - self.interval
+        time_tuple = time.gmtime(period_start) if self.utc else time.localtime(period_start)
+        base = f"{self.baseFilename}.{time.strftime(self.suffix, time_tuple)}"
+        name, counter = base, 0
+        while os.path.exists(name) or os.path.exists(f"{name}.gz"):
+            counter += 1
+            name = f"{base}.{counter}"
+        return name
+
+    def _prune_backups(self):
+        directory, base_name = os.path.split(self.baseFilename)
+        prefix = f"{base_name}."
+        backups = {}
+        for file_name in os.listdir(directory or "."):
+            if file_name.startswith(prefix):
+                path = os.path.join(directory, file_name)
+                key = path[:-3] if path.endswith(".gz") else path
+                try:
+                    backups[key] = max(backups.get(key, 0), os.path.getmtime(path))
+                except OSError:
+                    continue
+        expired = sorted(backups, key=backups.get)[: max(len(backups) - self.backupCount, 0)]
+        for key in expired:
+            for path in (key, f"{key}.gz"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def doRollover(self):
+        now = int(time.time())
+        # A size rollover stays in the current period; only a time rollover
+        # moves to the next one (recomputing here would push an "H" or "M"
+        # rollover further out on every size rollover)
+        time_triggered = now >= self.rolloverAt
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if os.path.exists(self.baseFilename):
+            rotated = self._rotated_name()
+            os.rename(self.baseFilename, rotated)
+            if self.compress:
+                _compress_executor.submit(_gzip_file, rotated)
+
+        if self.backupCount > 0:
+            self._prune_backups()
+
+        if not self.delay:
+            self.stream = self._open()
+        self._size = 0
+
+        if time_triggered:
+            rollover_at = self.computeRollover(now)
+            while rollover_at <= now:
+                rollover_at += self.interval
+            self.rolloverAt = rollover_at
+
+
+# Queue-based dispatch
+class _ContextQueueHandler(QueueHandler):
+    """Captures the caller's log context before the record changes thread."""
+
+    def prepare(self, record):
+        record = super().prepare(record)
+        if not hasattr(record, "event_json"):
+            record.log_context = dict(get_log_context())
+        return record
+
+
+class _LoggerRouter(logging.Handler):
+    """
+    Runs on the listener thread and hands each record to the handlers of
+    the SetupLogger it came from (child loggers resolve to their parent).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.routes: dict[str, list[logging.Handler]] = {}
+
+    def handle(self, record):
+        name = record.name
+        while name:
+            handlers = self.routes.get(name)
+            if handlers is not None:
+                for handler in handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+                return True
+            name = name.rpartition(".")[0]
+        return True
+
+
+class _LogDispatcher:
+    """
+    One QueueListener thread per process performs all console and file
+    I/O, so callers on the event loop only pay for a queue put.
+    """
 
-        if self.maxBytes > 0:
+    def __init__(self):
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.router = _LoggerRouter()
+        self.listener: QueueListener | None = None
+        self._lock = threading.Lock()
+
+    def register(self, logger: logging.Logger, handlers: list[logging.Handler]):
+        self.router.routes[logger.name] = handlers
+        logger.addHandler(_ContextQueueHandler(self.queue))
+        self.start()
+
+    def start(self):
+        with self._lock:
+            if self.listener is None:
+                self.listener = QueueListener(self.queue, self.router)
+                self.listener.start()
+
+    def stop(self):
+        with self._lock:
+            if self.listener is not None:
+                # Drains queued records before returning
+                self.listener.stop()
+                self.listener = None
+
+    def _after_fork(self):
+        # Listener threads do not survive fork; start a fresh one in the child
+        self._lock = threading.Lock()
+        self.listener = None
+        if self.router.routes:
+            self.start()
+
+
+_dispatcher = _LogDispatcher()
+atexit.register(_dispatcher.stop)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispatcher._after_fork)
+
+
+# Log Search Shipper
+class LogShipper:
+    """
+    One background thread per process that ships pre-encoded JSON log
+    documents to the log search backend (Meilisearch or the local SQLite
+    index) in NDJSON batches.
+    - Bounded queue: overflow is dropped and counted, never blocks callers
+    - Batches flush by size or age, grouped per index
+    - Failed batches are retried with exponential backoff, then dropped
+    """
+
+    def __init__(
+        self,
+        client,
+        max_queue: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+    ):
+        self.client = client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_queue = max_queue
+        self.stats = {"enqueued": 0, "shipped": 0, "dropped": 0, "failed": 0, "retries": 0}
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._stopping = threading.Event()
+        self._configured_indexes: set[str] = set()
+
+    def configure_index(self, index_uid: str):
+        if index_uid in self._configured_indexes:
+            return
+        index = self.client.index(index_uid)
+        index.update_filterable_attributes(list(FILTERABLE_ATTRIBUTES))
+        index.update_sortable_attributes(list(SORTABLE_ATTRIBUTES))
+        self._configured_indexes.add(index_uid)
+
+    def _ensure_started(self):
+        # Re-create the thread (and queue) after a fork, e.g. in worker processes
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                self._queue = queue.Queue(maxsize=self.max_queue)
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="log-shipper", daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, index_uid: str, document: bytes):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((index_uid, document))
+            self.stats["enqueued"] += 1
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def _collect(self) -> list:
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
             try:
-                if os.path.getsize(self.baseFilename) >= self.maxBytes:
-                    return True
-            except OSError:
-                pass
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _ship(self, index_uid: str, documents: list):
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.client.index(index_uid).add_documents_ndjson(
+                    b"\n".join(documents), primary_key="id"
+                )
+                self.stats["shipped"] += len(documents)
+                return
+            except Exception:
+                if attempt == self.max_retries or self._stopping.is_set():
+                    break
+                self.stats["retries"] += 1
+                time.sleep(min(self.backoff * (2 ** attempt), 30))
+        # Never break app flow because of logging
+        self.stats["failed"] += len(documents)
+
+    def _run(self):
+        while not (self._stopping.is_set() and self._queue.empty()):
+            batch = self._collect()
+            if not batch:
+                continue
+            per_index: dict[str, list] = {}
+            for index_uid, document in batch:
+                per_index.setdefault(index_uid, []).append(document)
+            for index_uid, documents in per_index.items():
+                self._ship(index_uid, documents)
+
+    def close(self, timeout: float = 5.0):
+        self._stopping.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout)
+
+
+_log_search_client = None
+_log_shipper: LogShipper | None = None
+
+
+def get_log_search_client():
+    """Meilisearch client or SQLiteLogSearchClient, per LOG_SEARCH_BACKEND."""
+    global _log_search_client
+    if _log_search_client is None:
+        _log_search_client = create_log_search_client(
+            settings.LOG_SEARCH_BACKEND,
+            url=settings.MEILI_SEARCH_URL,
+            api_key=settings.MEILI_SEARCH_API_KEY,
+            path=settings.LOG_SEARCH_SQLITE_PATH,
+        )
+    return _log_search_client
+
+
+def get_log_shipper() -> LogShipper | None:
+    global _log_shipper
+    if _log_shipper is None:
+        client = get_log_search_client()
+        if client is None:
+            return None
+        _log_shipper = LogShipper(
+            client,
+            max_queue=settings.MEILI_LOG_QUEUE_SIZE,
+            batch_size=settings.MEILI_LOG_BATCH_SIZE,
+            flush_interval=settings.MEILI_LOG_FLUSH_INTERVAL,
+        )
+        atexit.register(_log_shipper.close)
+    return _log_shipper
 
-        return False
+
+# Structured output & sampling
+class StructuredFormatter(logging.Formatter):
+    """
+    Emits one JSON object per line. Records from SetupLogger carry their
+    pre-encoded event; plain stdlib records are encoded here.
+    """
+
+    def format(self, record):
+        payload = getattr(record, "event_json", None)
+        if payload is None:
+            event = {
+                "timestamp": int(record.created),
+                "level": record.levelname,
+                "message": record.getMessage(),
+                "service": settings.SERVICE_NAME,
+                "logger": record.name,
+                "environment": settings.ENVIRONMENT,
+            }
+            if record.exc_info:
+                event["exception"] = self.formatException(record.exc_info)
+            event.update(getattr(record, "log_context", None) or {})
+            payload = orjson.dumps(event, default=str)
+        return payload.decode("utf-8")
+
+
+class LogSampler:
+    """
+    Probabilistic sampling by level and logger, e.g.
+    {"DEBUG": 0.05, "INFO": 0.5, "database:INFO": 0.1}.
+    ERROR and CRITICAL are always kept.
+    """
+
+    def __init__(self, rates: dict[str, float] | None = None):
+        self.rates: dict[str, float] = {}
+        for key, rate in (rates or {}).items():
+            logger_name, _, level = key.rpartition(":")
+            name = f"{logger_name}:{level.upper()}" if logger_name else level.upper()
+            self.rates[name] = rate
+
+    def keep(self, logger_name: str, levelno: int) -> bool:
+        if levelno >= logging.ERROR or not self.rates:
+            return True
+        level = logging.getLevelName(levelno)
+        rate = self.rates.get(f"{logger_name}:{level}", self.rates.get(level, 1.0))
+        return rate >= 1.0 or random.random() < rate
+
+
+_sampler = LogSampler(settings.LOG_SAMPLE_RATES)
 
 
 # Logger Setup
@@ -54,7 +435,9 @@ class SetupLogger:
     Centralized logging for AutoMeet services.
     - Console logging (dev)
     - Rotating file logging (prod)
-    - Optional Meilisearch logging (async & safe)
+    - Console/file I/O runs on a shared QueueListener thread
+    - Optional structured (JSON) mode with request context and sampling
+    - Optional search indexing (Meilisearch or local SQLite, batched)
     """
 
     def __init__(
@@ -72,19 +455,29 @@ class SetupLogger:
         self.logger = logging.getLogger(logger_name)
         self.logger.setLevel(logging.DEBUG)
 
+        self.meili_enabled = False
+        self.meili_index = meili_index
+        self.meili_shipper = None
+        self.structured = settings.LOG_FORMAT == "json"
+
         # ❗ Prevent duplicate handlers (FastAPI reload issue)
         if self.logger.handlers:
             return
 
-        log_format = logging.Formatter(
-            "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
-        )
+        handlers: list[logging.Handler] = []
+
+        if self.structured:
+            log_format = StructuredFormatter()
+        else:
+            log_format = logging.Formatter(
+                "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+            )
 
         # Console (only useful in development)
         if settings.ENVIRONMENT != "production":
             console_handler = logging.StreamHandler(sys.stdout)
             console_handler.setFormatter(log_format)
-            self.logger.addHandler(console_handler)
+            handlers.append(console_handler)
 
         # File logging (always enabled)
         file_handler = TimedRotatingFileHandlerWithSize(
@@ -96,86 +489,81 @@ class SetupLogger:
             maxBytes=max_bytes,
         )
         file_handler.setFormatter(log_format)
-        self.logger.addHandler(file_handler)
+        handlers.append(file_handler)
 
+        # Callers only enqueue; the listener thread does the writes
+        _dispatcher.register(self.logger, handlers)
 
-        # Meilisearch (Optional)
-        
-        self.meili_enabled = False
-        self.meili_index = None
 
-        if (
-            settings.MEILI_SEARCH_URL
-            and settings.MEILI_SEARCH_API_KEY
-            and meili_index
-        ):
+        # Log search indexing (Optional)
+        
+        if meili_index:
             try:
-                client = meilisearch.Client(
-                    settings.MEILI_SEARCH_URL,
-                    settings.MEILI_SEARCH_API_KEY,
-                )
-                self.meili_index = client.index(meili_index)
-                self.meili_enabled = True
-
-                self.meili_index.update_filterable_attributes(
-                    ["timestamp", "level", "service", "logger"]
-                )
-                self.meili_index.update_sortable_attributes(
-                    ["timestamp", "level"]
-                )
+                self.meili_shipper = get_log_shipper()
+                if self.meili_shipper is not None:
+                    self.meili_shipper.configure_index(meili_index)
+                    self.meili_enabled = True
             except Exception as e:
-                self.logger.error(f"Meilisearch init failed: {e}")
+                self.logger.error(f"Log search init failed: {e}")
 
     
     # Internal helpers
-    def _send_to_meili_async(self, log_entry: dict):
-        def task():
-            try:
-                self.meili_index.add_documents([log_entry])
-            except Exception:
-                # Never break app flow because of logging
-                pass
-
-        threading.Thread(target=task, daemon=True).start()
-
-    def _log_to_meilisearch(self, level: str, message: str):
-        if not self.meili_enabled:
-            return
-
-        log_entry = {
-            "id": f"{int(time.time() * 1000)}-{level}",
-            "timestamp": int(time.time()),
+    def _build_event(self, level: str, message: str) -> dict:
+        now = time.time()
+        event = {
+            # Random 128-bit id: unique across loggers, levels and processes
+            "id": uuid.uuid4().hex,
+            "timestamp": int(now),
+            "time": datetime.fromtimestamp(now, tz=timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
             "level": level,
             "message": message,
             "service": settings.SERVICE_NAME,
             "logger": self.logger.name,
             "environment": settings.ENVIRONMENT,
         }
+        event.update(get_log_context())
+        return event
+
+    def _log(self, levelno: int, message: str):
+        if not self.logger.isEnabledFor(levelno):
+            return
+        if not _sampler.keep(self.logger.name, levelno):
+            return
+
+        extra = None
+        payload = None
+        if self.structured or self.meili_enabled:
+            # Serialized once, shared by the file output and the shipper
+            payload = orjson.dumps(
+                self._build_event(logging.getLevelName(levelno), message),
+                default=str,
+            )
+            extra = {"event_json": payload}
+
+        self.logger.log(levelno, message, extra=extra)
 
-        self._send_to_meili_async(log_entry)
+        if self.meili_enabled:
+            self.meili_shipper.submit(self.meili_index, payload)
 
     
     # Public logging methods
     def info(self, message: str):
-        self.logger.info(message)
-        self._log_to_meilisearch("INFO", message)
+        self._log(logging.INFO, message)
 
     def warning(self, message: str):
-        self.logger.warning(message)
-        self._log_to_meilisearch("WARNING", message)
+        self._log(logging.WARNING, message)
 
     def error(self, message: str):
-        self.logger.error(message)
-        self._log_to_meilisearch("ERROR", message)
+        self._log(logging.ERROR, message)
 
     def debug(self, message: str):
         if settings.ENVIRONMENT != "production":
-            self.logger.debug(message)
-            self._log_to_meilisearch("DEBUG", message)
+            self._log(logging.DEBUG, message)
 
     def critical(self, message: str):
-        self.logger.critical(message)
-        self._log_to_meilisearch("CRITICAL", message)
+        self._log(logging.CRITICAL, message)
 
 
 # AutoMeet Core Loggers
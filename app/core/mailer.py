@@ -0,0 +1,299 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from email.message import EmailMessage
+from email.utils import formataddr, make_msgid
+from typing import Dict, List, Optional
+
+from .config import settings
+from .loggers import app_logger as logger
+
+
+@dataclass
+class OutgoingEmail:
+    recipient: str
+    subject: str
+    html: str
+    text: Optional[str] = None
+    id: Optional[int] = None
+
+
+class EmailSender:
+    """
+    Delivers a batch of emails. send_batch returns one entry per message:
+    None on success, otherwise the error text.
+    """
+
+    name = "base"
+    batch_size = 50
+
+    async def send_batch(self, messages: List[OutgoingEmail]) -> List[Optional[str]]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+def _mime_message(message: OutgoingEmail, from_addr: str, from_name: str) -> EmailMessage:
+    mime = EmailMessage()
+    mime["From"] = formataddr((from_name, from_addr))
+    mime["To"] = message.recipient
+    mime["Subject"] = message.subject
+    mime["Message-ID"] = make_msgid(domain=from_addr.rpartition("@")[2] or None)
+    mime.set_content(message.text or "")
+    mime.add_alternative(message.html, subtype="html")
+    return mime
+
+
+class SMTPSender(EmailSender):
+    """SMTP delivery; one connection (login, STARTTLS) per batch."""
+
+    name = "smtp"
+    batch_size = 50
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        from_addr: str = "",
+        from_name: str = "",
+        start_tls: bool = True,
+        use_tls: bool = False,
+        timeout: float = 30.0,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.from_addr = from_addr
+        self.from_name = from_name
+        self.start_tls = start_tls
+        self.use_tls = use_tls
+        self.timeout = timeout
+
+    async def send_batch(self, messages: List[OutgoingEmail]) -> List[Optional[str]]:
+        import aiosmtplib
+
+        client = aiosmtplib.SMTP(
+            hostname=self.host,
+            port=self.port,
+            use_tls=self.use_tls,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        try:
+            await client.connect()
+            if self.username:
+                await client.login(self.username, self.password)
+        except Exception as exc:
+            return [f"connect: {exc}"] * len(messages)
+
+        results: List[Optional[str]] = []
+        try:
+            for message in messages:
+                try:
+                    await client.send_message(_mime_message(message, self.from_addr, self.from_name))
+                    results.append(None)
+                except aiosmtplib.SMTPServerDisconnected as exc:
+                    # The rest of the batch is retried on a new connection
+                    results.extend([str(exc)] * (len(messages) - len(results)))
+                    break
+                except Exception as exc:
+                    results.append(str(exc))
+        finally:
+            try:
+                await client.quit()
+            except Exception:
+                pass
+        return results
+
+
+class MailjetSender(EmailSender):
+    """Mailjet Send API v3.1 (up to 50 messages per call)."""
+
+    name = "mailjet"
+    batch_size = 50
+
+    def __init__(self, api_key: str, api_secret: str, from_addr: str, from_name: str):
+        from mailjet_rest import Client
+
+        self.client = Client(auth=(api_key, api_secret), version="v3.1")
+        self.from_addr = from_addr
+        self.from_name = from_name
+
+    def _send(self, messages: List[OutgoingEmail]) -> List[Optional[str]]:
+        payload = {
+            "Messages": [
+                {
+                    "From": {"Email": self.from_addr, "Name": self.from_name},
+                    "To": [{"Email": message.recipient}],
+                    "Subject": message.subject,
+                    "HTMLPart": message.html,
+                    **({"TextPart": message.text} if message.text else {}),
+                }
+                for message in messages
+            ]
+        }
+        response = self.client.send.create(data=payload)
+        if response.status_code >= 500:
+            return [f"mailjet {response.status_code}"] * len(messages)
+
+        results = response.json().get("Messages", [])
+        errors: List[Optional[str]] = []
+        for index in range(len(messages)):
+            result = results[index] if index < len(results) else {}
+            if result.get("Status") == "success":
+                errors.append(None)
+            else:
+                errors.append(str(result.get("Errors") or f"mailjet {response.status_code}"))
+        return errors
+
+    async def send_batch(self, messages: List[OutgoingEmail]) -> List[Optional[str]]:
+        try:
+            return await asyncio.to_thread(self._send, messages)
+        except Exception as exc:
+            return [str(exc)] * len(messages)
+
+
+class MemorySender(EmailSender):
+    """Keeps messages in memory; optional per-batch latency and failures."""
+
+    name = "memory"
+
+    def __init__(self, latency: float = 0.0, fail_recipients: Optional[set] = None):
+        self.latency = latency
+        self.fail_recipients = fail_recipients or set()
+        self.sent: List[OutgoingEmail] = []
+
+    async def send_batch(self, messages: List[OutgoingEmail]) -> List[Optional[str]]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        results: List[Optional[str]] = []
+        for message in messages:
+            if message.recipient in self.fail_recipients:
+                results.append("rejected")
+            else:
+                self.sent.append(message)
+                results.append(None)
+        return results
+
+
+def get_email_sender(provider: str) -> EmailSender:
+    if provider == "mailjet":
+        return MailjetSender(
+            settings.MAIL_USERNAME, settings.MAIL_PASSWORD,
+            settings.MAIL_FROM, settings.MAIL_FROM_NAME,
+        )
+    if provider == "memory":
+        return MemorySender()
+    return SMTPSender(
+        host=settings.MAIL_SERVER,
+        port=settings.MAIL_PORT,
+        username=settings.MAIL_USERNAME,
+        password=settings.MAIL_PASSWORD,
+        from_addr=settings.MAIL_FROM,
+        from_name=settings.MAIL_FROM_NAME,
+        start_tls=settings.MAIL_STARTTLS,
+        use_tls=settings.MAIL_SSL_TLS,
+    )
+
+
+def default_provider() -> str:
+    """Provider name for new outbox rows, from EMAIL_SERVICE."""
+    service = settings.EMAIL_SERVICE.lower()
+    if service in ("mailjet", "memory"):
+        return service
+    return "smtp"
+
+
+# Local SMTP stand-in
+class LocalSMTPServer:
+    """
+    Minimal SMTP server for tests and throughput benchmarks. Accepts every
+    message (no TLS, no auth), counts them and keeps the last `keep`.
+    Point MAIL_SERVER / MAIL_PORT at it with MAIL_STARTTLS=false.
+
+        server = LocalSMTPServer(port=2525)
+        await server.start()
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 2525, latency: float = 0.0, keep: int = 1000):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.keep = keep
+        self.received = 0
+        self.messages: List[Dict[str, object]] = []
+        self.started_at: Optional[float] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.started_at = time.perf_counter()
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def rate(self) -> float:
+        """Messages per second since start."""
+        if not self.started_at:
+            return 0.0
+        return self.received / max(time.perf_counter() - self.started_at, 1e-9)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        async def reply(line: str) -> None:
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        mail_from, rcpt_to = "", []
+        try:
+            await reply("220 localhost automeet test SMTP")
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                command = raw.decode("utf-8", "replace").strip()
+                verb = command[:4].upper()
+                if verb == "EHLO":
+                    await reply("250-localhost")
+                    await reply("250 8BITMIME")
+                elif verb == "HELO":
+                    await reply("250 localhost")
+                elif verb == "MAIL":
+                    mail_from, rcpt_to = command[10:].strip(), []
+                    await reply("250 OK")
+                elif verb == "RCPT":
+                    rcpt_to.append(command[8:].strip())
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    lines = []
+                    while True:
+                        line = await reader.readline()
+                        if not line or line in (b".\r\n", b".\n"):
+                            break
+                        lines.append(line[1:] if line.startswith(b"..") else line)
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                    self.received += 1
+                    self.messages.append({"from": mail_from, "to": rcpt_to, "data": b"".join(lines)})
+                    del self.messages[:-self.keep]
+                    await reply("250 OK queued")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                elif verb in ("RSET", "NOOP"):
+                    mail_from, rcpt_to = ("", []) if verb == "RSET" else (mail_from, rcpt_to)
+                    await reply("250 OK")
+                else:
+                    await reply("502 Command not implemented")
+        except (ConnectionError, asyncio.IncompleteReadError) as exc:
+            logger.debug(f"Local SMTP connection closed: {exc}")
+        finally:
+            writer.close()
@@ -0,0 +1,272 @@
+import asyncio
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set
+import orjson
+from fastapi import WebSocket, WebSocketDisconnect
+from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from .config import settings
+from .redis import listen_for_invalidations, redis_client
+from .loggers import redis_logger as logger
+from .token_revocation import revocation_list
+from ..models.notifications import NotificationSettings
+from ..models.users import User
+
+
+# Notification kinds gated by a NotificationSettings flag of the same name
+NOTIFICATION_KINDS = ("recording", "transcription", "action_items", "team_invitations", "meeting_reminders")
+
+# WebSocket close codes
+WS_CLOSE_POLICY_VIOLATION = 1008
+WS_CLOSE_TRY_AGAIN_LATER = 1013
+
+
+class _Connection:
+    """One client socket: its pending frames and whether it fell behind."""
+
+    __slots__ = ("websocket", "user_uuid", "pending", "ready", "overflowed")
+
+    def __init__(self, websocket: WebSocket, user_uuid: str):
+        self.websocket = websocket
+        self.user_uuid = user_uuid
+        self.pending: Deque[str] = deque()
+        self.ready = asyncio.Event()
+        self.overflowed = False
+
+    def offer(self, event: str, max_pending: int) -> bool:
+        if self.overflowed:
+            return False
+        if len(self.pending) >= max_pending:
+            # Slow consumer: the sender closes it, the client reconnects and refetches
+            self.overflowed = True
+            self.ready.set()
+            return False
+        self.pending.append(event)
+        self.ready.set()
+        return True
+
+
+class NotificationHub:
+    """
+    Pushes notifications to connected clients over WebSockets.
+
+    publish() drops recipients who turned the notification kind off (one
+    query at publish time, so nothing is filtered per connection) and
+    sends one Redis pub/sub message per chunk of recipients. Every worker
+    listens on the channel and hands the event, serialized once, to the
+    sockets of those users in its own registry. Each socket has a sender
+    that coalesces what arrived within `flush_interval` into one frame (a
+    JSON array of up to `batch_size` events). A socket with more than
+    `max_pending` events queued, or whose send blocks for `send_timeout`,
+    is closed with 1013 instead of buffering without bound. A socket
+    opened with a token is closed with 1008 when the token expires or,
+    checked every `auth_recheck_interval`, is revoked.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        max_connections: int = 20_000,
+        max_pending: int = 256,
+        batch_size: int = 50,
+        flush_interval: float = 0.05,
+        send_timeout: float = 5.0,
+        publish_chunk: int = 1000,
+        auth_recheck_interval: float = 60.0,
+    ):
+        self.channel = channel
+        self.max_connections = max_connections
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.send_timeout = send_timeout
+        self.publish_chunk = publish_chunk
+        self.auth_recheck_interval = auth_recheck_interval
+        self._connections: Dict[str, Set[_Connection]] = {}
+        self._count = 0
+        self._listener: Optional[asyncio.Task] = None
+        self.stats: Counter = Counter()
+
+    @property
+    def connection_count(self) -> int:
+        return self._count
+
+    # Publishing
+    async def recipients(self, db: AsyncSession, user_uuids: Iterable[str], kind: str) -> List[str]:
+        """
+        The users among `user_uuids` who accept `kind`. Users without a
+        NotificationSettings row get the default (on); kinds without a
+        preference flag go to everyone.
+        """
+        user_uuids = list(dict.fromkeys(user_uuids))
+        if kind not in NOTIFICATION_KINDS or not user_uuids:
+            return user_uuids
+        flag = getattr(NotificationSettings, kind)
+        rows = await db.execute(
+            select(User.uuid)
+            .outerjoin(NotificationSettings, NotificationSettings.user_uuid == User.uuid)
+            .where(User.uuid.in_(user_uuids), or_(flag.is_(None), flag.is_(True)))
+        )
+        return list(rows.scalars())
+
+    async def send(self, user_uuids: List[str], kind: str, data: Dict[str, Any]) -> None:
+        """Fan an event out to already-filtered users on every worker."""
+        if not user_uuids:
+            return
+        event = {"kind": kind, "data": data, "sent_at": datetime.utcnow().isoformat()}
+        try:
+            for start in range(0, len(user_uuids), self.publish_chunk):
+                message = orjson.dumps({"users": user_uuids[start:start + self.publish_chunk], "event": event})
+                await redis_client.publish(self.channel, message.decode())
+        except Exception as exc:
+            # Notifications are best effort; never break the caller's write path
+            logger.warning(f"Notification publish failed: {exc}")
+
+    async def publish(self, db: AsyncSession, user_uuids: Iterable[str], kind: str, data: Dict[str, Any]) -> int:
+        """Filter by preference and send; returns the number of recipients."""
+        recipients = await self.recipients(db, user_uuids, kind)
+        await self.send(recipients, kind, data)
+        return len(recipients)
+
+    # Local delivery
+    def deliver(self, message: str) -> int:
+        """Queue a pub/sub message for this worker's sockets; returns the sockets reached."""
+        try:
+            payload = orjson.loads(message)
+            event = orjson.dumps(payload["event"]).decode()
+            user_uuids = list(payload["users"])
+        except (orjson.JSONDecodeError, KeyError, TypeError) as exc:
+            logger.warning(f"Malformed notification message: {exc}")
+            return 0
+        delivered = 0
+        for user_uuid in user_uuids:
+            for connection in self._connections.get(user_uuid, ()):
+                if connection.offer(event, self.max_pending):
+                    delivered += 1
+                else:
+                    self.stats["dropped"] += 1
+        self.stats["delivered"] += delivered
+        return delivered
+
+    def _register(self, connection: _Connection) -> None:
+        self._connections.setdefault(connection.user_uuid, set()).add(connection)
+        self._count += 1
+
+    def _unregister(self, connection: _Connection) -> None:
+        connections = self._connections.get(connection.user_uuid)
+        if connections is None or connection not in connections:
+            return
+        connections.discard(connection)
+        if not connections:
+            del self._connections[connection.user_uuid]
+        self._count -= 1
+
+    async def _close_slow(self, connection: _Connection) -> None:
+        self.stats["slow_closed"] += 1
+        try:
+            await connection.websocket.close(code=WS_CLOSE_TRY_AGAIN_LATER, reason="Too many pending notifications")
+        except Exception:
+            pass
+
+    async def _auth_loop(self, connection: _Connection, claims: Dict[str, Any]) -> None:
+        # The token was checked at the handshake; hold the socket to it after that
+        expires_at = float(claims.get("exp") or 0) or None
+        while True:
+            wait = self.auth_recheck_interval
+            if expires_at is not None:
+                wait = min(wait, expires_at - time.time())
+            if wait > 0:
+                await asyncio.sleep(wait)
+            if expires_at is not None and time.time() >= expires_at:
+                reason = "Token has expired"
+            elif await revocation_list.is_revoked(claims):
+                reason = "Token has been revoked"
+            else:
+                continue
+            self.stats["auth_closed"] += 1
+            try:
+                await connection.websocket.close(code=WS_CLOSE_POLICY_VIOLATION, reason=reason)
+            except Exception:
+                pass
+            return
+
+    async def _send_loop(self, connection: _Connection) -> None:
+        while True:
+            await connection.ready.wait()
+            if self.flush_interval:
+                await asyncio.sleep(self.flush_interval)  # coalesce a burst into one frame
+            if connection.overflowed:
+                await self._close_slow(connection)
+                return
+            batch = [connection.pending.popleft() for _ in range(min(self.batch_size, len(connection.pending)))]
+            if not connection.pending:
+                connection.ready.clear()
+            try:
+                await asyncio.wait_for(connection.websocket.send_text("[" + ",".join(batch) + "]"), self.send_timeout)
+            except asyncio.TimeoutError:
+                await self._close_slow(connection)
+                return
+            except (WebSocketDisconnect, RuntimeError, OSError):
+                return
+            self.stats["frames"] += 1
+
+    @staticmethod
+    async def _receive_loop(websocket: WebSocket) -> None:
+        # Clients do not send anything; this only notices the disconnect
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+    async def serve(self, websocket: WebSocket, user_uuid: str, claims: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Accept a socket for `user_uuid` and run it until either side closes,
+        or until the access token with `claims` expires or is revoked.
+        """
+        if self._count >= self.max_connections:
+            await websocket.close(code=WS_CLOSE_TRY_AGAIN_LATER, reason="Worker is at its connection limit")
+            return
+        await websocket.accept()
+        connection = _Connection(websocket, user_uuid)
+        self._register(connection)
+        tasks = {
+            asyncio.create_task(self._send_loop(connection)),
+            asyncio.create_task(self._receive_loop(websocket)),
+        }
+        if claims is not None:
+            tasks.add(asyncio.create_task(self._auth_loop(connection, claims)))
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._unregister(connection)
+
+    async def start(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(listen_for_invalidations(self.channel, self.deliver))
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+notification_hub = NotificationHub(
+    channel=settings.NOTIFICATION_CHANNEL,
+    max_connections=settings.NOTIFICATION_MAX_CONNECTIONS,
+    max_pending=settings.NOTIFICATION_MAX_PENDING,
+    batch_size=settings.NOTIFICATION_BATCH_SIZE,
+    flush_interval=settings.NOTIFICATION_FLUSH_INTERVAL,
+    send_timeout=settings.NOTIFICATION_SEND_TIMEOUT,
+    auth_recheck_interval=settings.NOTIFICATION_AUTH_RECHECK_INTERVAL,
+)
@@ -0,0 +1,136 @@
+import hashlib
+import hmac
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import settings
+from .redis import redis_client
+from .loggers import security_logger as logger
+from ..cruds.verification_codes import OTPStatus, verification_code_crud
+from ..utils.codes import generate_verification_code
+
+
+# Attempts are counted, the digest compared (without early exit) and the
+# code consumed or locked in one atomic call.
+_VERIFY_LUA = """
+local state = redis.call('HMGET', KEYS[1], 'digest', 'attempts')
+if not state[1] then
+    return -2
+end
+local max_attempts = tonumber(ARGV[2])
+local attempts = tonumber(state[2] or '0')
+if attempts >= max_attempts then
+    redis.call('DEL', KEYS[1])
+    return -1
+end
+local stored, given = state[1], ARGV[1]
+local diff = 0
+if #stored ~= #given then
+    diff = 1
+end
+for i = 1, #given do
+    diff = bit.bor(diff, bit.bxor(string.byte(stored, i) or 0, string.byte(given, i)))
+end
+if diff == 0 then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+attempts = attempts + 1
+if attempts >= max_attempts then
+    redis.call('DEL', KEYS[1])
+    return -1
+end
+redis.call('HSET', KEYS[1], 'attempts', attempts)
+return 0
+"""
+
+_STATUSES = {
+    1: OTPStatus.VERIFIED,
+    0: OTPStatus.INVALID,
+    -1: OTPStatus.LOCKED,
+    -2: OTPStatus.EXPIRED,
+}
+
+
+class OTPStore:
+    """
+    Verification codes keyed by (user, type).
+
+    In "redis" mode a code lives in one hash whose native expiry equals
+    expires_at; only an HMAC of the code is stored. Verification is a
+    single script call. When Redis is unreachable, codes are issued to and
+    checked against the verification_codes table instead, which is also
+    the only store in "database" mode.
+    """
+
+    def __init__(self, backend: str = "redis", max_attempts: int = 5, expire_minutes: int = 720):
+        self.backend = backend
+        self.max_attempts = max_attempts
+        self.expire_minutes = expire_minutes
+        self._verify = redis_client.register_script(_VERIFY_LUA)
+
+    @staticmethod
+    def _key(user_uuid: str, type: str) -> str:
+        return f"automeet:otp:{type}:{user_uuid}"
+
+    @staticmethod
+    def _digest(user_uuid: str, type: str, code: str) -> str:
+        message = f"{user_uuid}:{type}:{code}".encode("utf-8")
+        return hmac.new(settings.JWT_SECRET_KEY.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+    async def issue(
+        self,
+        db: AsyncSession,
+        user_uuid: str,
+        type: str = "confirm_email",
+        expires_at: Optional[datetime] = None,
+    ) -> Tuple[str, datetime]:
+        """Create (replacing any previous) code; returns (code, expires_at)."""
+        code = generate_verification_code(settings.OTP_LENGTH)
+        expires_at = expires_at or datetime.now(tz=timezone.utc) + timedelta(minutes=self.expire_minutes)
+
+        if self.backend == "redis":
+            key = self._key(user_uuid, type)
+            try:
+                async with redis_client.pipeline(transaction=True) as pipe:
+                    pipe.delete(key)
+                    pipe.hset(key, mapping={"digest": self._digest(user_uuid, type, code), "attempts": 0})
+                    pipe.pexpireat(key, int(expires_at.timestamp() * 1000))
+                    await pipe.execute()
+                return code, expires_at
+            except Exception as exc:
+                logger.warning(f"OTP store unavailable, issuing code in database: {exc}")
+
+        await verification_code_crud.issue(db, user_uuid, type, code, expires_at)
+        return code, expires_at
+
+    async def verify(self, db: AsyncSession, user_uuid: str, type: str, code: str) -> OTPStatus:
+        if self.backend == "redis":
+            try:
+                status = _STATUSES[int(await self._verify(
+                    keys=[self._key(user_uuid, type)],
+                    args=[self._digest(user_uuid, type, code), self.max_attempts],
+                ))]
+                if status is not OTPStatus.EXPIRED:
+                    return status
+                # Not in Redis: it may have been issued during an outage
+            except Exception as exc:
+                logger.warning(f"OTP store unavailable, verifying against database: {exc}")
+
+        return await verification_code_crud.consume(db, user_uuid, type, code, self.max_attempts)
+
+    async def revoke(self, db: AsyncSession, user_uuid: str, type: str) -> None:
+        if self.backend == "redis":
+            try:
+                await redis_client.delete(self._key(user_uuid, type))
+            except Exception as exc:
+                logger.warning(f"OTP revoke failed: {exc}")
+        await verification_code_crud.revoke(db, user_uuid, type)
+
+
+otp_store = OTPStore(
+    backend=settings.OTP_BACKEND,
+    max_attempts=settings.OTP_MAX_ATTEMPTS,
+    expire_minutes=settings.OTP_EXPIRE_MINUTES,
+)
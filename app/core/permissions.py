@@ -0,0 +1,278 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from sqlalchemy import event, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .redis import redis_client
+from .loggers import redis_logger as logger
+from ..database.database import AsyncSessionLocal
+from ..models.permissions import Permission
+from ..models.role_permissions import RolePermission
+from ..models.roles import Role
+from ..models.user_roles import UserRole
+
+
+VERSION_KEY = "automeet:perms:version"
+CHANNEL = "automeet:perms:invalidate"
+
+
+@dataclass(frozen=True, slots=True)
+class UserPermissions:
+    """Resolved permissions of one user: a bitset plus the dashboard flag."""
+
+    bits: int
+    has_dashboard_access: bool
+
+    def has_bit(self, bit: int) -> bool:
+        return bit >= 0 and (self.bits >> bit) & 1 == 1
+
+    def encode(self) -> str:
+        return f"{self.bits:x}:{int(self.has_dashboard_access)}"
+
+    @classmethod
+    def decode(cls, value: str) -> "UserPermissions":
+        bits, _, dashboard = value.partition(":")
+        return cls(bits=int(bits or "0", 16), has_dashboard_access=dashboard == "1")
+
+
+class PermissionResolver:
+    """
+    Resolves User -> UserRole -> Role -> RolePermission -> Permission once
+    per user and caches the result as a bitset, in process (LRU) and in
+    Redis. Each Permission.name owns a stable bit (Permission.bit_index).
+
+    Every cache entry is tagged with a global version. Any write to
+    Permission, Role, RolePermission or UserRole bumps the version in Redis
+    and notifies all workers over pub/sub, so stale entries are never read.
+    Authorization checks on a warm cache are O(1) bit tests with no I/O.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl: int = 3600, poll_interval: float = 5.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self.version = 0
+        self.bits: Dict[str, int] = {}
+        self._bits_version: Optional[int] = None
+        self._entries: "OrderedDict[str, Tuple[int, UserPermissions]]" = OrderedDict()
+        self._sync_task: Optional[asyncio.Task] = None
+
+    # Version tracking
+    def _set_version(self, version: int) -> None:
+        if version != self.version:
+            self.version = version
+            self._entries.clear()
+
+    async def refresh_version(self) -> int:
+        try:
+            value = await redis_client.get(VERSION_KEY)
+            self._set_version(int(value or 0))
+        except Exception as exc:
+            logger.warning(f"Permission version refresh failed: {exc}")
+        return self.version
+
+    async def bump_version(self) -> None:
+        """Invalidate every cached permission set in all workers."""
+        try:
+            version = await redis_client.incr(VERSION_KEY)
+            self._set_version(int(version))
+            await redis_client.publish(CHANNEL, version)
+        except Exception as exc:
+            # Without Redis, at least this worker must not serve stale data
+            self._set_version(self.version + 1)
+            logger.warning(f"Permission version bump failed: {exc}")
+
+    async def _sync_loop(self) -> None:
+        while True:
+            try:
+                pubsub = redis_client.pubsub()
+                await pubsub.subscribe(CHANNEL)
+                await self.refresh_version()
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=self.poll_interval
+                    )
+                    if message is None:
+                        # Periodic poll covers missed pub/sub messages
+                        await self.refresh_version()
+                    else:
+                        self._set_version(max(self.version, int(message["data"])))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"Permission invalidation listener failed: {exc}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def start(self) -> None:
+        await self.refresh_version()
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self) -> None:
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+
+    # Bit assignment
+    async def load_bits(self, db: AsyncSession) -> Dict[str, int]:
+        """
+        Load the name -> bit map, assigning the next free bit to any
+        permission that has none. Reloaded only when the version changes.
+        """
+        if self._bits_version == self.version:
+            return self.bits
+
+        for _ in range(3):
+            rows = (await db.execute(
+                select(Permission.uuid, Permission.name, Permission.bit_index)
+                .order_by(Permission.created_at, Permission.name)
+            )).all()
+            missing = [row for row in rows if row.bit_index is None]
+            if not missing:
+                break
+            next_bit = max((row.bit_index for row in rows if row.bit_index is not None), default=-1) + 1
+            # Assign in a separate session so the caller's transaction is untouched
+            async with AsyncSessionLocal() as assign_db:
+                try:
+                    for offset, row in enumerate(missing):
+                        await assign_db.execute(
+                            update(Permission)
+                            .where(Permission.uuid == row.uuid, Permission.bit_index.is_(None))
+                            .values(bit_index=next_bit + offset)
+                        )
+                    await assign_db.commit()
+                except IntegrityError:
+                    # Another worker assigned the same bits first; reload
+                    await assign_db.rollback()
+
+        self.bits = {row.name: row.bit_index for row in rows if row.bit_index is not None}
+        self._bits_version = self.version
+        return self.bits
+
+    def bit(self, name: str) -> int:
+        """Bit for a permission name, or -1 when unknown (never granted)."""
+        return self.bits.get(name, -1)
+
+    # Resolution
+    async def _compute(self, db: AsyncSession, user_uuid: str) -> UserPermissions:
+        await self.load_bits(db)
+        rows = (await db.execute(
+            select(Role.has_dashboard_access, Permission.bit_index)
+            .select_from(UserRole)
+            .join(Role, Role.uuid == UserRole.role_uuid)
+            .outerjoin(RolePermission, RolePermission.role_uuid == Role.uuid)
+            .outerjoin(Permission, Permission.uuid == RolePermission.permission_uuid)
+            .where(UserRole.user_uuid == user_uuid)
+        )).all()
+
+        bits = 0
+        has_dashboard_access = False
+        for dashboard, bit_index in rows:
+            has_dashboard_access = has_dashboard_access or bool(dashboard)
+            if bit_index is not None:
+                bits |= 1 << bit_index
+        return UserPermissions(bits=bits, has_dashboard_access=has_dashboard_access)
+
+    def _remember(self, user_uuid: str, version: int, permissions: UserPermissions) -> None:
+        if version != self.version:
+            return
+        self._entries[user_uuid] = (version, permissions)
+        self._entries.move_to_end(user_uuid)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def cached(self, user_uuid: str) -> Optional[UserPermissions]:
+        entry = self._entries.get(user_uuid)
+        if entry is None or entry[0] != self.version:
+            return None
+        self._entries.move_to_end(user_uuid)
+        return entry[1]
+
+    async def get(self, db: AsyncSession, user_uuid: str) -> UserPermissions:
+        permissions = self.cached(user_uuid)
+        if permissions is not None:
+            return permissions
+
+        version = self.version
+        redis_key = f"automeet:perms:{version}:{user_uuid}"
+        try:
+            value = await redis_client.get(redis_key)
+            if value:
+                permissions = UserPermissions.decode(value)
+                self._remember(user_uuid, version, permissions)
+                return permissions
+        except Exception as exc:
+            logger.warning(f"Permission cache read failed: {exc}")
+
+        permissions = await self._compute(db, user_uuid)
+        # Entries computed under an outdated version are never read again
+        self._remember(user_uuid, version, permissions)
+        try:
+            await redis_client.set(redis_key, permissions.encode(), ex=self.ttl)
+        except Exception as exc:
+            logger.warning(f"Permission cache write failed: {exc}")
+        return permissions
+
+    async def has_permission(self, db: AsyncSession, user_uuid: str, name: str) -> bool:
+        permissions = await self.get(db, user_uuid)
+        if self._bits_version != self.version:
+            # Bit map is reloaded once per version per worker
+            await self.load_bits(db)
+        return permissions.has_bit(self.bit(name))
+
+
+permission_resolver = PermissionResolver(
+    max_entries=settings.PERMISSION_CACHE_SIZE,
+    ttl=settings.PERMISSION_CACHE_TTL,
+)
+
+
+# Invalidation on RBAC writes
+_RBAC_MODELS = (Permission, Role, RolePermission, UserRole)
+_pending_bumps: set = set()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_rbac_changes(session, flush_context):
+    changed = session.new | session.dirty | session.deleted
+    if any(isinstance(obj, _RBAC_MODELS) for obj in changed):
+        session.info["rbac_changed"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_rbac_changes(orm_execute_state):
+    # Bulk insert/update/delete statements bypass the unit of work
+    state = orm_execute_state
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    mapper = state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _RBAC_MODELS):
+        state.session.info["rbac_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if not session.info.pop("rbac_changed", False):
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(permission_resolver.bump_version())
+    _pending_bumps.add(task)
+    task.add_done_callback(_pending_bumps.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rbac_changes(session):
+    session.info.pop("rbac_changed", None)
@@ -0,0 +1,235 @@
+import hashlib
+import math
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+from fastapi import Request
+
+from .config import settings
+from .redis import redis_client
+from .loggers import security_logger as logger
+from ..utils.responses import too_many_requests_response
+
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_RULE_RE = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*$")
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """Token bucket: `capacity` requests, refilled evenly over `period` seconds."""
+
+    capacity: int
+    period: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+    @classmethod
+    def parse(cls, value: str) -> Optional["RateLimitRule"]:
+        """Parse "10/minute", "5/10minutes", "100/day"; empty disables."""
+        if not value:
+            return None
+        match = _RULE_RE.match(value)
+        if not match:
+            raise ValueError(f"Invalid rate limit: {value}")
+        count, multiplier, unit = match.groups()
+        return cls(capacity=int(count), period=int(multiplier or 1) * _PERIODS[unit])
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    retry_after: int = 0
+
+
+# All buckets are checked first; tokens are only taken if every bucket allows,
+# so a rejected request never drains the other keys.
+_TOKEN_BUCKET_LUA = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local tokens = {}
+local retry = 0
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2 - 1])
+    local capacity = tonumber(ARGV[i * 2])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local available = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    available = math.min(capacity, available + math.max(0, now - ts) * rate / 1000)
+    tokens[i] = available
+    if available < 1 then
+        retry = math.max(retry, math.ceil((1 - available) * 1000 / rate))
+    end
+end
+local allowed = 0
+if retry == 0 then
+    allowed = 1
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2 - 1])
+    local capacity = tonumber(ARGV[i * 2])
+    local available = tokens[i]
+    if allowed == 1 then
+        available = available - 1
+    end
+    redis.call('HSET', key, 'tokens', tostring(available), 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(capacity * 1000 / rate) + 1000)
+end
+return {allowed, retry}
+"""
+
+
+class LocalTokenBuckets:
+    """In-process token buckets used while Redis is unavailable (per worker)."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def hit(self, checks: Sequence[Tuple[str, RateLimitRule]]) -> RateLimitResult:
+        now = time.monotonic()
+        states, retry = [], 0.0
+        for key, rule in checks:
+            available, ts = self._buckets.get(key, (rule.capacity, now))
+            available = min(rule.capacity, available + (now - ts) * rule.rate)
+            states.append(available)
+            if available < 1:
+                retry = max(retry, (1 - available) / rule.rate)
+
+        allowed = retry == 0
+        for (key, _rule), available in zip(checks, states):
+            self._buckets[key] = (available - 1 if allowed else available, now)
+            self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return RateLimitResult(allowed=allowed, retry_after=math.ceil(retry))
+
+
+class RateLimiter:
+    """
+    Atomic multi-key token buckets in Redis (one Lua call per request),
+    falling back to in-process buckets when Redis is down.
+    """
+
+    def __init__(self, prefix: str = "automeet:rl"):
+        self.prefix = prefix
+        self.local = LocalTokenBuckets()
+        self._script = redis_client.register_script(_TOKEN_BUCKET_LUA)
+
+    def key(self, scope: str, kind: str, value: str) -> str:
+        # Hash identifiers so emails / IPs are not stored in clear text
+        digest = hashlib.sha256(value.strip().lower().encode("utf-8")).hexdigest()[:32]
+        return f"{self.prefix}:{scope}:{kind}:{digest}"
+
+    async def hit(self, checks: Sequence[Tuple[str, RateLimitRule]]) -> RateLimitResult:
+        if not checks:
+            return RateLimitResult(allowed=True)
+        args: List[float] = []
+        for _key, rule in checks:
+            args.extend((rule.rate, rule.capacity))
+        try:
+            allowed, retry_ms = await self._script(keys=[key for key, _ in checks], args=args)
+            return RateLimitResult(allowed=bool(allowed), retry_after=math.ceil(int(retry_ms) / 1000))
+        except Exception as exc:
+            logger.warning(f"Rate limiter falling back to local buckets: {exc}")
+            return self.local.hit(checks)
+
+
+rate_limiter = RateLimiter()
+
+
+def client_ip(request: Request) -> str:
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            # Each trusted proxy appends the address it saw; anything left of
+            # those was sent by the client and can be spoofed
+            hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+            if hops:
+                return hops[max(len(hops) - max(settings.RATE_LIMIT_TRUSTED_PROXIES, 1), 0)]
+    return request.client.host if request.client else "unknown"
+
+
+async def request_email(request: Request) -> Optional[str]:
+    # Read the raw JSON body (cached by Starlette) before schema validation,
+    # so limits apply before any body validation or MX lookup runs
+    try:
+        body = await request.json()
+    except Exception:
+        return None
+    email = body.get("email") if isinstance(body, dict) else None
+    return email if isinstance(email, str) and email else None
+
+
+def _request_user(request: Request) -> Optional[str]:
+    authorization = request.headers.get("authorization", "")
+    if not authorization.lower().startswith("bearer "):
+        return None
+    from .security import token_cache
+
+    try:
+        return token_cache.decode(authorization[7:].strip()).get("sub")
+    except Exception:
+        return None
+
+
+def rate_limit(
+    scope: str,
+    per_ip: Optional[str] = None,
+    per_email: Optional[str] = None,
+    per_user: Optional[str] = None,
+):
+    """
+    Dependency factory. Add it to a route's dependencies so the request is
+    rejected with 429 + Retry-After before the endpoint (and its bcrypt,
+    DNS and email work) runs, e.g.
+
+        @router.post("/login", dependencies=[Depends(login_rate_limit)])
+    """
+    ip_rule = RateLimitRule.parse(per_ip or "")
+    email_rule = RateLimitRule.parse(per_email or "")
+    user_rule = RateLimitRule.parse(per_user or "")
+
+    async def dependency(request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        checks: List[Tuple[str, RateLimitRule]] = []
+        if ip_rule:
+            checks.append((rate_limiter.key(scope, "ip", client_ip(request)), ip_rule))
+        if email_rule:
+            email = await request_email(request)
+            if email:
+                checks.append((rate_limiter.key(scope, "email", email), email_rule))
+        if user_rule:
+            user_uuid = _request_user(request)
+            if user_uuid:
+                checks.append((rate_limiter.key(scope, "user", user_uuid), user_rule))
+
+        result = await rate_limiter.hit(checks)
+        if not result.allowed:
+            logger.warning(f"Rate limit exceeded for {scope} from {client_ip(request)}")
+            too_many_requests_response(
+                "Too many requests. Please try again later.",
+                headers={"Retry-After": str(max(result.retry_after, 1))},
+            )
+
+    return dependency
+
+
+login_rate_limit = rate_limit(
+    "login",
+    per_ip=settings.RATE_LIMIT_LOGIN_PER_IP,
+    per_email=settings.RATE_LIMIT_LOGIN_PER_EMAIL,
+)
+
+verification_rate_limit = rate_limit(
+    "verification",
+    per_ip=settings.RATE_LIMIT_VERIFICATION_PER_IP,
+    per_email=settings.RATE_LIMIT_VERIFICATION_PER_EMAIL,
+    per_user=settings.RATE_LIMIT_VERIFICATION_PER_USER,
+)
@@ -0,0 +1,94 @@
+import asyncio
+import uuid
+from redis import asyncio as aioredis
+from .config import settings
+from .loggers import redis_logger as logger
+
+
+# Shared async Redis client (one connection pool per process). Short
+# timeouts, so an unreachable Redis fails a cache or limit lookup instead
+# of hanging the request
+redis_client: aioredis.Redis = aioredis.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    health_check_interval=30,
+    socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+)
+
+# Subscriptions and blocking stream reads sit idle longer than the socket
+# timeout by design; they use their own pool without one
+redis_listener_client: aioredis.Redis = aioredis.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    health_check_interval=30,
+    socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+)
+
+
+async def get_redis() -> aioredis.Redis:
+    return redis_client
+
+
+async def listen_for_invalidations(channel: str, handler, retry_delay: float = 5.0) -> None:
+    """
+    Subscribe to an invalidation channel and call handler(data) for each
+    message, reconnecting on errors. Run as a background task.
+    """
+    while True:
+        try:
+            pubsub = redis_listener_client.pubsub()
+            await pubsub.subscribe(channel)
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    handler(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning(f"Invalidation listener on {channel} failed: {exc}")
+            await asyncio.sleep(retry_delay)
+
+
+_RENEW_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisLease:
+    """
+    Leader election with an expiring Redis key: whoever sets it first
+    holds the lease and must renew it before `ttl` runs out. Renewal and
+    release compare the holder token, so a stalled former leader cannot
+    extend or drop a lease that has since passed to another process.
+    """
+
+    def __init__(self, key: str, ttl: float):
+        self.key = key
+        self.ttl_ms = int(ttl * 1000)
+        self.token = uuid.uuid4().hex
+        self.held = False
+        self._renew = redis_client.register_script(_RENEW_LUA)
+        self._release = redis_client.register_script(_RELEASE_LUA)
+
+    async def keep(self) -> bool:
+        """Acquire or renew; returns whether this process is the leader."""
+        if self.held:
+            self.held = bool(await self._renew(keys=[self.key], args=[self.token, self.ttl_ms]))
+        if not self.held:
+            self.held = bool(await redis_client.set(self.key, self.token, nx=True, px=self.ttl_ms))
+        return self.held
+
+    async def release(self) -> None:
+        if self.held:
+            self.held = False
+            await self._release(keys=[self.key], args=[self.token])
@@ -0,0 +1,367 @@
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timedelta
+from html import escape
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import or_, union_all
+from sqlalchemy.future import select
+
+from .config import settings
+from .email_outbox import email_outbox_worker
+from .redis import RedisLease, redis_client
+from .loggers import scheduler_logger as logger
+from .notifications import notification_hub
+from ..cruds.email_outbox import email_outbox_crud
+from ..cruds.meeting_occurrences import Occurrence, crud_meeting_occurrence
+from ..database.database import AsyncSessionLocal
+from ..models.meeting_occurrences import MeetingOccurrence
+from ..models.meeting_participants import MeetingParticipant
+from ..models.meetings import Meeting
+from ..models.notifications import NotificationSettings
+from ..models.users import User
+
+
+DUE_KEY = "automeet:reminders:due"
+PROCESSING_KEY = "automeet:reminders:processing"
+LEADER_KEY = "automeet:reminders:leader"
+
+# Move expired leases back to due, then claim up to ARGV[2] due members
+# under a lease of ARGV[1] ms. Scores are epoch ms from the Redis clock.
+_CLAIM_LUA = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now, 'LIMIT', 0, ARGV[2])
+for _, member in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], member)
+    redis.call('ZADD', KEYS[1], 'NX', now, member)
+end
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now, 'LIMIT', 0, ARGV[2])
+for _, member in ipairs(due) do
+    redis.call('ZREM', KEYS[1], member)
+    redis.call('ZADD', KEYS[2], now + tonumber(ARGV[1]), member)
+end
+return due
+"""
+
+
+def _epoch_ms(value: datetime) -> int:
+    """Naive UTC datetime -> epoch milliseconds."""
+    return int((value - datetime(1970, 1, 1)) / timedelta(milliseconds=1))
+
+
+def occurrence_key(meeting_uuid: str, original_start: Optional[datetime]) -> str:
+    """Meeting uuid, plus "@<original start>" for an occurrence of a series."""
+    if original_start is None:
+        return meeting_uuid
+    return f"{meeting_uuid}@{original_start:%Y%m%dT%H%M%S}"
+
+
+def reminder_members(key: str, starts_at: datetime, leads: Iterable[int], now: datetime) -> Dict[str, int]:
+    """
+    {"<key>:<lead>": due epoch ms} for a meeting or occurrence that has
+    not started yet. A reminder whose time has already passed is due now.
+    """
+    if starts_at <= now:
+        return {}
+    return {
+        f"{key}:{lead}": _epoch_ms(max(starts_at - timedelta(minutes=lead), now))
+        for lead in leads
+    }
+
+
+def reminder_dedupe_key(meeting_uuid: str, starts_at: datetime, lead: int, email: str) -> str:
+    """Outbox dedupe key of one reminder email; hashed, so long addresses fit the column."""
+    raw = f"{meeting_uuid}:{starts_at:%Y%m%d%H%M}:{lead}:{email}"
+    return "reminder:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class MeetingReminderDispatcher:
+    """
+    Meeting reminders, scheduled in Redis and delivered through the email
+    outbox.
+
+    Every pending reminder is a member "<meeting_uuid>:<lead minutes>"
+    (or "<meeting_uuid>@<original start>:<lead>" for an occurrence of a
+    recurring meeting) of a sorted set scored by its due time; saving a
+    meeting re-scores its members, deleting it removes them. Members of
+    occurrences that were since cancelled or moved are re-checked against
+    the database when they fall due. A single leader (RedisLease) polls:
+    a Lua script moves due members to a processing set under a lease,
+    recipients and their NotificationSettings are loaded for the whole
+    batch in one query, and the emails are inserted into the outbox with
+    a per-recipient dedupe key before the batch is acknowledged.
+
+    A crash between claim and acknowledge leaves the members in the
+    processing set; they become due again when the lease expires and the
+    dedupe key turns the second delivery into a no-op. The leader also
+    re-syncs upcoming meetings from the database, so reminders lost in
+    Redis (or never scheduled because Redis was down) are restored.
+    """
+
+    def __init__(
+        self,
+        leads: Sequence[int] = (15,),
+        batch_size: int = 500,
+        poll_interval: float = 5.0,
+        lease_seconds: int = 120,
+        horizon_minutes: int = 24 * 60,
+        reconcile_interval: float = 300.0,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.leads = sorted(set(leads))
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.horizon = timedelta(minutes=horizon_minutes)
+        self.reconcile_interval = reconcile_interval
+        self.session_factory = session_factory
+        self.leader = RedisLease(LEADER_KEY, ttl=max(poll_interval * 3, 15.0))
+        self.stats = {"claimed": 0, "enqueued": 0, "skipped": 0}
+        self._claim = redis_client.register_script(_CLAIM_LUA)
+        self._reconciled_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    # Scheduling (called by the meeting CRUD after commit)
+    async def schedule(self, meeting_uuid: str, starts_at: datetime) -> None:
+        """(Re)schedule a meeting's reminders; failures are left to the reconcile pass."""
+        try:
+            members = reminder_members(meeting_uuid, starts_at, self.leads, datetime.utcnow())
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.zrem(DUE_KEY, *[f"{meeting_uuid}:{lead}" for lead in self.leads])
+                if members:
+                    pipe.zadd(DUE_KEY, members)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning(f"Meeting reminders: could not schedule {meeting_uuid}: {exc}")
+
+    async def schedule_occurrences(self, occurrences: Iterable[Occurrence]) -> None:
+        try:
+            now = datetime.utcnow()
+            members: Dict[str, int] = {}
+            for occurrence in occurrences:
+                key = occurrence_key(occurrence.meeting_uuid, occurrence.original_start)
+                members.update(reminder_members(key, occurrence.starts_at, self.leads, now))
+            if members:
+                await redis_client.zadd(DUE_KEY, members)
+        except Exception as exc:
+            logger.warning(f"Meeting reminders: could not schedule occurrences: {exc}")
+
+    async def cancel(self, meeting_uuid: str) -> None:
+        try:
+            await redis_client.zrem(DUE_KEY, *[f"{meeting_uuid}:{lead}" for lead in self.leads])
+        except Exception as exc:
+            logger.warning(f"Meeting reminders: could not cancel {meeting_uuid}: {exc}")
+
+    async def reconcile(self) -> int:
+        """
+        Re-add reminders due within the horizon (ZADD is idempotent; one
+        already sent is dropped again by its dedupe key). The window
+        reaches back two reconcile intervals so reminders that fell due
+        while nobody was leader are still sent.
+        """
+        now = datetime.utcnow()
+        since = now - timedelta(seconds=2 * self.reconcile_interval)
+        until = now + self.horizon
+        latest_start = until + timedelta(minutes=self.leads[-1])
+        async with self.session_factory() as db:
+            starts = [
+                (meeting_uuid, None, starts_at)
+                for meeting_uuid, starts_at in (await db.execute(
+                    select(Meeting.uuid, Meeting.starts_at).where(
+                        Meeting.recurring.is_(False), Meeting.starts_at > now, Meeting.starts_at < latest_start
+                    )
+                )).all()
+            ]
+            starts += (await db.execute(
+                select(MeetingOccurrence.meeting_uuid, MeetingOccurrence.original_start, MeetingOccurrence.starts_at)
+                .where(MeetingOccurrence.starts_at > now, MeetingOccurrence.starts_at < latest_start)
+            )).all()
+            starts += [
+                (occurrence.meeting_uuid, occurrence.original_start, occurrence.starts_at)
+                for occurrence in await crud_meeting_occurrence.expand_uncovered(db, now, latest_start)
+                if occurrence.starts_at > now
+            ]
+        members: Dict[str, int] = {}
+        for meeting_uuid, original_start, starts_at in starts:
+            key = occurrence_key(meeting_uuid, original_start)
+            for lead in self.leads:
+                due = starts_at - timedelta(minutes=lead)
+                if since <= due < until:
+                    members[f"{key}:{lead}"] = _epoch_ms(max(due, now))
+        for start in range(0, len(members), 5000):
+            chunk = dict(list(members.items())[start:start + 5000])
+            await redis_client.zadd(DUE_KEY, chunk)
+        return len(members)
+
+    # Delivery
+    async def _recipients(self, db, meeting_uuids: List[str]) -> Dict[str, List[Tuple[str, str, Optional[str]]]]:
+        """
+        {meeting_uuid: [(email, first name, user uuid), ...]} for organizers and
+        invitees who have not turned meeting reminders off. Users without
+        a NotificationSettings row, and unregistered invitees, get the
+        default (on).
+        """
+        attendees = union_all(
+            select(Meeting.uuid.label("meeting_uuid"), User.email, User.first_name, User.uuid.label("user_uuid"))
+            .join(User, User.uuid == Meeting.user_uuid)
+            .where(Meeting.uuid.in_(meeting_uuids)),
+            select(MeetingParticipant.meeting_uuid, MeetingParticipant.email, User.first_name, MeetingParticipant.user_uuid)
+            .outerjoin(User, User.uuid == MeetingParticipant.user_uuid)
+            .where(MeetingParticipant.meeting_uuid.in_(meeting_uuids)),
+        ).subquery("attendees")
+        rows = (await db.execute(
+            select(attendees.c.meeting_uuid, attendees.c.email, attendees.c.first_name, attendees.c.user_uuid)
+            .outerjoin(NotificationSettings, NotificationSettings.user_uuid == attendees.c.user_uuid)
+            .where(or_(NotificationSettings.meeting_reminders.is_(None), NotificationSettings.meeting_reminders.is_(True)))
+        )).all()
+        recipients: Dict[str, Dict[str, Tuple[str, Optional[str]]]] = {}
+        for meeting_uuid, email, first_name, user_uuid in rows:
+            recipients.setdefault(meeting_uuid, {}).setdefault(email.lower(), (first_name or "", user_uuid))
+        return {
+            meeting_uuid: [(email, first_name, user_uuid) for email, (first_name, user_uuid) in emails.items()]
+            for meeting_uuid, emails in recipients.items()
+        }
+
+    @staticmethod
+    def _render(title: str, starts_at: datetime, platform: str, first_name: str, lead: int) -> Tuple[str, str, str]:
+        when = f"{starts_at:%Y-%m-%d %H:%M} UTC"
+        subject = f"Reminder: {title} starts in {lead} minutes"
+        greeting = f"Hi {first_name}," if first_name else "Hi,"
+        text = f"{greeting}\n\n{title} starts at {when} on {platform}.\n"
+        html = (
+            f"<p>{escape(greeting)}</p><p><strong>{escape(title)}</strong> starts at "
+            f"{when} on {escape(platform)}.</p>"
+        )
+        return subject, html, text
+
+    async def dispatch(self, members: List[str]) -> int:
+        """Turn claimed members into outbox rows; returns the number enqueued."""
+        claimed: List[Tuple[str, Optional[datetime], int]] = []
+        for member in members:
+            key, _, lead = member.rpartition(":")
+            meeting_uuid, _, original = key.partition("@")
+            original_start = datetime.strptime(original, "%Y%m%dT%H%M%S") if original else None
+            claimed.append((meeting_uuid, original_start, int(lead)))
+        meeting_uuids = list({meeting_uuid for meeting_uuid, _, _ in claimed})
+
+        now = datetime.utcnow()
+        emails, later, pushes = [], {}, []
+        async with self.session_factory() as db:
+            meetings = {
+                meeting.uuid: meeting
+                for meeting in (await db.execute(select(Meeting).where(Meeting.uuid.in_(meeting_uuids)))).scalars()
+            }
+            occurrences = await crud_meeting_occurrence.resolve(
+                db, [(meeting_uuid, original) for meeting_uuid, original, _ in claimed if original is not None]
+            )
+            recipients = await self._recipients(db, list(meetings))
+            for meeting_uuid, original_start, lead in claimed:
+                meeting = meetings.get(meeting_uuid)
+                if original_start is None:
+                    current = meeting if meeting is not None and not meeting.recurrence_rule else None
+                else:
+                    current = occurrences.get((meeting_uuid, original_start))
+                if current is None or meeting is None or current.starts_at <= now:
+                    self.stats["skipped"] += 1  # deleted, cancelled, or already started
+                    continue
+                due = current.starts_at - timedelta(minutes=lead)
+                if due > now + timedelta(seconds=self.poll_interval):
+                    # Moved later since it was scheduled
+                    later[f"{occurrence_key(meeting_uuid, original_start)}:{lead}"] = _epoch_ms(due)
+                    continue
+                users = []
+                for email, first_name, user_uuid in recipients.get(meeting_uuid, []):
+                    dedupe_key = reminder_dedupe_key(meeting_uuid, current.starts_at, lead, email)
+                    if user_uuid is not None:
+                        users.append((user_uuid, dedupe_key))
+                    subject, html, text = self._render(current.title, current.starts_at, meeting.platform, first_name, lead)
+                    emails.append({
+                        "recipient": email,
+                        "subject": subject,
+                        "html": html,
+                        "text": text,
+                        "dedupe_key": dedupe_key,
+                    })
+                pushes.append((users, {
+                    "meeting_uuid": meeting_uuid,
+                    "title": current.title,
+                    "starts_at": current.starts_at.isoformat(),
+                    "platform": meeting.platform,
+                    "lead_minutes": lead,
+                }))
+            inserted = set(await email_outbox_crud.enqueue_unique(db, emails))
+            await db.commit()
+
+        # Reconcile re-adds reminders that were already sent; push only the
+        # ones whose email is new. Recipients are already filtered by the
+        # meeting_reminders preference.
+        for users, data in pushes:
+            await notification_hub.send(
+                [user_uuid for user_uuid, dedupe_key in users if dedupe_key in inserted], "meeting_reminders", data
+            )
+        enqueued = len(inserted)
+
+        if later:
+            await redis_client.zadd(DUE_KEY, later)
+        if enqueued:
+            email_outbox_worker.wake()
+        return enqueued
+
+    async def run_once(self) -> int:
+        """Claim, deliver and acknowledge one batch; returns the number of members claimed."""
+        members = await self._claim(
+            keys=[DUE_KEY, PROCESSING_KEY], args=[self.lease_seconds * 1000, self.batch_size]
+        )
+        if not members:
+            return 0
+        enqueued = await self.dispatch(members)
+        await redis_client.zrem(PROCESSING_KEY, *members)
+        self.stats["claimed"] += len(members)
+        self.stats["enqueued"] += enqueued
+        return len(members)
+
+    async def run(self) -> None:
+        while True:
+            processed = 0
+            try:
+                if await self.leader.keep():
+                    if time.monotonic() - self._reconciled_at >= self.reconcile_interval:
+                        self._reconciled_at = time.monotonic()
+                        await self.reconcile()
+                    processed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error(f"Meeting reminder cycle failed: {exc}")
+
+            if processed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.leader.release()
+        except Exception as exc:
+            logger.warning(f"Meeting reminders: could not release leader lease: {exc}")
+
+
+meeting_reminders = MeetingReminderDispatcher(
+    leads=settings.MEETING_REMINDER_LEAD_MINUTES,
+    batch_size=settings.MEETING_REMINDER_BATCH_SIZE,
+    poll_interval=settings.MEETING_REMINDER_POLL_INTERVAL,
+    lease_seconds=settings.MEETING_REMINDER_LEASE_SECONDS,
+    horizon_minutes=settings.MEETING_REMINDER_HORIZON_MINUTES,
+    reconcile_interval=settings.MEETING_REMINDER_RECONCILE_INTERVAL,
+)
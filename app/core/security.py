@@ -0,0 +1,301 @@
+import asyncio
+import hashlib
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Set, Tuple
+import jwt
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .log_context import bind_log_context
+from .permissions import UserPermissions, permission_resolver
+from .redis import listen_for_invalidations, redis_client
+from .token_revocation import revocation_list
+from .loggers import security_logger as logger
+from ..database.database import get_async_session
+from ..models.users import User
+from ..utils.responses import forbidden_response, not_authorized_response
+
+
+PRINCIPAL_CHANNEL = "automeet:principals:invalidate"
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+# Token issuing / decoding
+def create_access_token(subject: str, extra_claims: Optional[Dict[str, Any]] = None) -> str:
+    now = datetime.now(tz=timezone.utc)
+    claims = {
+        "sub": subject,
+        "type": "access",
+        "jti": uuid.uuid4().hex,
+        "iat": now,
+        "exp": now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    }
+    claims.update(extra_claims or {})
+    return jwt.encode(claims, settings.JWT_SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """Verify signature and expiry; raises jwt.InvalidTokenError."""
+    claims = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM])
+    if claims.get("type", "access") != "access":
+        raise jwt.InvalidTokenError("Not an access token")
+    return claims
+
+
+class TokenCache:
+    """
+    Bounded LRU of verified access tokens: sha256(token) -> claims.
+    Entries are honoured only until the token's own `exp`, so a cache hit
+    never extends a token's lifetime. Only valid tokens are cached.
+    """
+
+    def __init__(self, max_entries: int = 50_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, claims = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return claims
+            del self._entries[key]
+
+        self.misses += 1
+        claims = decode_access_token(token)
+        self._entries[key] = (float(claims.get("exp", 0)), claims)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return claims
+
+
+token_cache = TokenCache(max_entries=settings.AUTH_TOKEN_CACHE_SIZE)
+
+
+# Principal cache
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """The authenticated user as seen by authorization checks."""
+
+    user_uuid: str
+    is_active: bool
+    is_verified: bool
+    permissions: UserPermissions
+
+    def has_permission(self, name: str) -> bool:
+        return self.permissions.has_bit(permission_resolver.bit(name))
+
+
+class PrincipalCache:
+    """
+    LRU of user flags (active / verified) by user UUID with a TTL.
+    Entries are dropped locally and in every worker (Redis pub/sub) when
+    the user row is updated or deleted.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, bool, bool]]" = OrderedDict()
+        self._listener: Optional[asyncio.Task] = None
+
+    def get(self, user_uuid: str) -> Optional[Tuple[bool, bool]]:
+        entry = self._entries.get(user_uuid)
+        if entry is None:
+            return None
+        expires_at, is_active, is_verified = entry
+        if expires_at < time.monotonic():
+            del self._entries[user_uuid]
+            return None
+        self._entries.move_to_end(user_uuid)
+        return is_active, is_verified
+
+    def set(self, user_uuid: str, is_active: bool, is_verified: bool) -> None:
+        self._entries[user_uuid] = (time.monotonic() + self.ttl, is_active, is_verified)
+        self._entries.move_to_end(user_uuid)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, user_uuid: str) -> None:
+        self._entries.pop(user_uuid, None)
+
+    async def invalidate(self, user_uuids: Set[str]) -> None:
+        for user_uuid in user_uuids:
+            self.discard(user_uuid)
+        try:
+            for user_uuid in user_uuids:
+                await redis_client.publish(PRINCIPAL_CHANNEL, user_uuid)
+        except Exception as exc:
+            logger.warning(f"Principal invalidation publish failed: {exc}")
+
+    async def start(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(
+                listen_for_invalidations(PRINCIPAL_CHANNEL, self.discard)
+            )
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.AUTH_PRINCIPAL_CACHE_SIZE,
+    ttl=settings.AUTH_PRINCIPAL_CACHE_TTL,
+)
+
+
+async def load_user_flags(db: AsyncSession, user_uuid: str) -> Optional[Tuple[bool, bool]]:
+    """(is_active, is_verified) of a user through the principal cache; None if unknown."""
+    flags = principal_cache.get(user_uuid)
+    if flags is None:
+        row = (await db.execute(
+            select(User.is_active, User.is_verified, User.soft_deleted)
+            .where(User.uuid == user_uuid)
+        )).first()
+        if row is None:
+            return None
+        flags = (bool(row.is_active) and not row.soft_deleted, bool(row.is_verified))
+        principal_cache.set(user_uuid, *flags)
+    return flags
+
+
+async def load_principal(db: AsyncSession, user_uuid: str) -> Optional[Principal]:
+    flags = await load_user_flags(db, user_uuid)
+    if flags is None:
+        return None
+
+    permissions = await permission_resolver.get(db, user_uuid)
+    return Principal(
+        user_uuid=user_uuid,
+        is_active=flags[0],
+        is_verified=flags[1],
+        permissions=permissions,
+    )
+
+
+# Dependencies
+async def get_current_principal(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_async_session),
+) -> Principal:
+    if credentials is None:
+        return not_authorized_response("Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+
+    try:
+        claims = token_cache.decode(credentials.credentials)
+    except jwt.ExpiredSignatureError:
+        return not_authorized_response("Token has expired", headers={"WWW-Authenticate": "Bearer"})
+    except jwt.InvalidTokenError:
+        return not_authorized_response("Invalid token", headers={"WWW-Authenticate": "Bearer"})
+    if not claims.get("sub"):
+        return not_authorized_response("Invalid token", headers={"WWW-Authenticate": "Bearer"})
+
+    # In-process Bloom check; Redis is only asked on a (possible) hit
+    if await revocation_list.is_revoked(claims):
+        return not_authorized_response("Token has been revoked", headers={"WWW-Authenticate": "Bearer"})
+
+    principal = await load_principal(db, claims.get("sub"))
+    if principal is None or not principal.is_active:
+        return not_authorized_response("User is inactive or does not exist")
+
+    bind_log_context(user_uuid=principal.user_uuid)
+    return principal
+
+
+def require_permission(name: str):
+    """Dependency factory: the current user must hold permission `name`."""
+
+    async def dependency(
+        principal: Principal = Depends(get_current_principal),
+        db: AsyncSession = Depends(get_async_session),
+    ) -> Principal:
+        if permission_resolver.bit(name) < 0:
+            await permission_resolver.load_bits(db)
+        if not principal.has_permission(name):
+            return forbidden_response(f"Missing permission: {name}")
+        return principal
+
+    return dependency
+
+
+async def require_dashboard_access(
+    principal: Principal = Depends(get_current_principal),
+) -> Principal:
+    if not principal.permissions.has_dashboard_access:
+        return forbidden_response("Dashboard access required")
+    return principal
+
+
+async def authenticate_token(db: AsyncSession, token: str) -> Optional[Principal]:
+    """
+    Principal for a raw access token, or None. For WebSocket handshakes,
+    where browsers cannot set an Authorization header.
+    """
+    try:
+        claims = token_cache.decode(token)
+    except jwt.InvalidTokenError:
+        return None
+    if not claims.get("sub") or await revocation_list.is_revoked(claims):
+        return None
+    principal = await load_principal(db, claims.get("sub"))
+    if principal is None or not principal.is_active:
+        return None
+    bind_log_context(user_uuid=principal.user_uuid)
+    return principal
+
+
+# Invalidate principals when users change
+_pending_invalidations: set = set()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_user_changes(session, flush_context):
+    changed = {
+        obj.uuid
+        for obj in session.dirty | session.deleted
+        if isinstance(obj, User) and obj.uuid
+    }
+    if changed:
+        session.info.setdefault("changed_users", set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_users_after_commit(session):
+    changed = session.info.pop("changed_users", None)
+    if not changed:
+        return
+    for user_uuid in changed:
+        principal_cache.discard(user_uuid)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(principal_cache.invalidate(changed))
+    _pending_invalidations.add(task)
+    task.add_done_callback(_pending_invalidations.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_changes(session):
+    session.info.pop("changed_users", None)
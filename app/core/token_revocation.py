@@ -0,0 +1,142 @@
+import asyncio
+import hashlib
+import math
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from .config import settings
+from .redis import redis_client
+from .loggers import security_logger as logger
+
+
+REVOKED_KEY = "automeet:tokens:revoked"
+REVOKED_CHANNEL = "automeet:tokens:revoked"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on one blake2b digest)."""
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationList:
+    """
+    Revoked access tokens and token families.
+
+    Redis holds the authoritative list (sorted set: member "jti:<id>" or
+    "fam:<id>", score = when the entry can be forgotten). Every worker
+    keeps a Bloom filter of it, rebuilt periodically and updated over
+    pub/sub, so a request for a non-revoked token is answered in process.
+    Only Bloom hits (revoked tokens and rare false positives) are confirmed
+    against Redis; if Redis cannot confirm, the token is treated as revoked.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001, sync_interval: float = 30.0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._task: Optional[asyncio.Task] = None
+        self.confirmations = 0
+
+    @staticmethod
+    def _members(claims: Dict[str, Any]) -> list:
+        members = []
+        if claims.get("jti"):
+            members.append(f"jti:{claims['jti']}")
+        if claims.get("fam"):
+            members.append(f"fam:{claims['fam']}")
+        return members
+
+    async def revoke(self, member: str, forget_at: float) -> None:
+        """Add "jti:<id>" or "fam:<id>", kept until epoch `forget_at`."""
+        self._bloom.add(member)
+        await redis_client.zadd(REVOKED_KEY, {member: forget_at})
+        await redis_client.publish(REVOKED_CHANNEL, member)
+
+    async def is_revoked(self, claims: Dict[str, Any]) -> bool:
+        candidates = [member for member in self._members(claims) if member in self._bloom]
+        if not candidates:
+            return False
+
+        self.confirmations += 1
+        try:
+            scores = await redis_client.zmscore(REVOKED_KEY, candidates)
+        except Exception as exc:
+            logger.warning(f"Revocation check could not be confirmed: {exc}")
+            return True
+        now = time.time()
+        return any(score is not None and float(score) > now for score in scores)
+
+    async def rebuild(self) -> int:
+        """Reload the Bloom filter from Redis, dropping expired entries."""
+        now = time.time()
+        await redis_client.zremrangebyscore(REVOKED_KEY, "-inf", now)
+        members = await redis_client.zrangebyscore(REVOKED_KEY, now, "+inf")
+        bloom = BloomFilter(max(self.capacity, len(members) * 2), self.error_rate)
+        for member in members:
+            bloom.add(member)
+        self._bloom = bloom
+        return len(members)
+
+    async def _sync_loop(self) -> None:
+        while True:
+            try:
+                pubsub = redis_client.pubsub()
+                await pubsub.subscribe(REVOKED_CHANNEL)
+                await self.rebuild()
+                next_rebuild = time.monotonic() + self.sync_interval
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=max(0.0, next_rebuild - time.monotonic()),
+                    )
+                    if message is not None:
+                        self._bloom.add(message["data"])
+                    if time.monotonic() >= next_rebuild:
+                        await self.rebuild()
+                        next_rebuild = time.monotonic() + self.sync_interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"Revocation list sync failed: {exc}")
+                await asyncio.sleep(self.sync_interval)
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+revocation_list = RevocationList(
+    capacity=settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+    sync_interval=settings.TOKEN_REVOCATION_SYNC_INTERVAL,
+)
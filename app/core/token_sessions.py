@@ -0,0 +1,160 @@
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+
+import jwt
+
+from .config import settings
+from .redis import redis_client
+from .security import create_access_token
+from .token_revocation import revocation_list
+from .loggers import security_logger as logger
+
+
+class RefreshTokenError(jwt.InvalidTokenError):
+    """Refresh token is invalid, expired or its session was revoked."""
+
+
+class RefreshTokenReuseError(RefreshTokenError):
+    """An already-rotated refresh token was presented; the family is revoked."""
+
+
+@dataclass(frozen=True)
+class TokenPair:
+    access_token: str
+    refresh_token: str
+    family: str
+
+
+# Compare-and-swap of the family's current refresh jti. A stale jti means
+# the token was used twice, so the whole family is dropped.
+_ROTATE_LUA = """
+local state = redis.call('HMGET', KEYS[1], 'current', 'user')
+if not state[1] then
+    return {'missing', ''}
+end
+if state[1] ~= ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return {'reuse', state[2] or ''}
+end
+redis.call('HSET', KEYS[1], 'current', ARGV[2])
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return {'ok', state[2]}
+"""
+
+
+class TokenSessionStore:
+    """
+    Login sessions as refresh-token families in Redis.
+
+    A family is created at login and holds the jti of the only refresh
+    token that may be used next. Each refresh rotates it; presenting an
+    older token (a replayed or stolen copy) revokes the family. Access
+    tokens carry the family id ("fam"), so revoking a family also revokes
+    its access tokens through the revocation list.
+    """
+
+    def __init__(self, refresh_minutes: int, access_minutes: int):
+        self.refresh_ttl = refresh_minutes * 60
+        self.access_ttl = access_minutes * 60
+        self._rotate = redis_client.register_script(_ROTATE_LUA)
+
+    @staticmethod
+    def _family_key(family: str) -> str:
+        return f"automeet:rt:fam:{family}"
+
+    @staticmethod
+    def _user_key(user_uuid: str) -> str:
+        return f"automeet:rt:user:{user_uuid}"
+
+    def _refresh_token(self, user_uuid: str, family: str, jti: str) -> str:
+        now = datetime.now(tz=timezone.utc)
+        claims = {
+            "sub": user_uuid,
+            "type": "refresh",
+            "fam": family,
+            "jti": jti,
+            "iat": now,
+            "exp": now + timedelta(seconds=self.refresh_ttl),
+        }
+        return jwt.encode(claims, settings.JWT_REFRESH_SECRET_KEY, algorithm=settings.ALGORITHM)
+
+    @staticmethod
+    def decode_refresh_token(token: str) -> Dict[str, Any]:
+        try:
+            claims = jwt.decode(token, settings.JWT_REFRESH_SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except jwt.InvalidTokenError as exc:
+            raise RefreshTokenError(str(exc))
+        if claims.get("type") != "refresh" or not claims.get("fam") or not claims.get("jti"):
+            raise RefreshTokenError("Not a refresh token")
+        return claims
+
+    def _pair(self, user_uuid: str, family: str, jti: str) -> TokenPair:
+        return TokenPair(
+            access_token=create_access_token(user_uuid, {"fam": family}),
+            refresh_token=self._refresh_token(user_uuid, family, jti),
+            family=family,
+        )
+
+    async def issue(self, user_uuid: str) -> TokenPair:
+        """Start a new session (login)."""
+        family, jti = uuid.uuid4().hex, uuid.uuid4().hex
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.hset(self._family_key(family), mapping={"current": jti, "user": user_uuid})
+            pipe.expire(self._family_key(family), self.refresh_ttl)
+            pipe.sadd(self._user_key(user_uuid), family)
+            pipe.expire(self._user_key(user_uuid), self.refresh_ttl)
+            await pipe.execute()
+        return self._pair(user_uuid, family, jti)
+
+    async def rotate(self, refresh_token: str) -> TokenPair:
+        """Exchange a refresh token for a new pair; one Redis call."""
+        claims = self.decode_refresh_token(refresh_token)
+        family, new_jti = claims["fam"], uuid.uuid4().hex
+        status, user_uuid = await self._rotate(
+            keys=[self._family_key(family)],
+            args=[claims["jti"], new_jti, self.refresh_ttl * 1000],
+        )
+        if status == "missing":
+            raise RefreshTokenError("Session has been revoked")
+        if status == "reuse":
+            logger.warning(f"Refresh token reuse detected for user {user_uuid or claims['sub']}")
+            await self._revoke_access(family)
+            raise RefreshTokenReuseError("Refresh token reuse detected")
+
+        await redis_client.expire(self._user_key(user_uuid), self.refresh_ttl)
+        return self._pair(user_uuid, family, new_jti)
+
+    async def _revoke_access(self, family: str) -> None:
+        # Access tokens of this family stay valid for at most access_ttl
+        await revocation_list.revoke(f"fam:{family}", time.time() + self.access_ttl)
+
+    async def revoke_family(self, family: str) -> None:
+        """Log out one session (refresh and access tokens)."""
+        user_uuid = await redis_client.hget(self._family_key(family), "user")
+        await redis_client.delete(self._family_key(family))
+        if user_uuid:
+            await redis_client.srem(self._user_key(user_uuid), family)
+        await self._revoke_access(family)
+
+    async def revoke_user(self, user_uuid: str) -> int:
+        """Sign the user out everywhere; returns the number of sessions."""
+        families = await redis_client.smembers(self._user_key(user_uuid))
+        if families:
+            await redis_client.delete(*[self._family_key(family) for family in families])
+        await redis_client.delete(self._user_key(user_uuid))
+        for family in families:
+            await self._revoke_access(family)
+        return len(families)
+
+    async def revoke_access_token(self, claims: Dict[str, Any]) -> None:
+        """Revoke a single access token until its own expiry."""
+        await revocation_list.revoke(f"jti:{claims['jti']}", float(claims.get("exp", time.time() + self.access_ttl)))
+
+
+token_sessions = TokenSessionStore(
+    refresh_minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES,
+    access_minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES,
+)
@@ -2,8 +2,11 @@ from typing import Optional, Any, Dict, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .base import CRUDBase
+from .activity_rollups import activity_rollup_crud
+from ..core.activity_stream import activity_stream_hub
 from ..models.activity_logs import ActivityLog
 from ..schemas.activity_logs import ActivityLogCreateSchema
+from ..core.config import settings
 from ..core.loggers import db_logger as logger
 
 
@@ -92,14 +95,23 @@ class CRUDActivityLog(
 
         try:
             db.add(db_obj)
+
+            # Keep dashboard counters in the same transaction as the log
+            if settings.ACTIVITY_ROLLUP_INLINE:
+                await db.flush()
+                await activity_rollup_crud.record(db, [db_obj])
+
             await db.commit()
             await db.refresh(db_obj)
-            return db_obj
 
         except Exception as exc:
             await db.rollback()
             logger.error(f"Failed to create activity log: {exc}")
             raise RuntimeError("Could not create activity log") from exc
 
+        # Live tail for support staff (best effort, after commit)
+        await activity_stream_hub.publish(db_obj)
+        return db_obj
+
 
 activity_log_crud = CRUDActivityLog(ActivityLog)
@@ -0,0 +1,248 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..models.activity_logs import ActivityLog
+from ..models.activity_rollups import (
+    ActivityRollupDaily,
+    ActivityRollupHourly,
+    RollupWatermark,
+)
+from ..core.config import settings
+from ..core.loggers import db_logger as logger
+
+Granularity = Literal["hour", "day"]
+RollupKey = Tuple[datetime, str, str, str]
+
+WATERMARK_NAME = "activity_logs"
+
+
+def to_utc(value: datetime) -> datetime:
+    """Naive UTC datetime; aware values are converted before dropping tzinfo."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def hour_bucket(value: datetime) -> datetime:
+    return to_utc(value).replace(minute=0, second=0, microsecond=0)
+
+
+def day_bucket(value: datetime) -> datetime:
+    return to_utc(value).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class CRUDActivityRollup:
+    """
+    Incrementally maintained activity counters for AutoMeet dashboards.
+    Counters are fed inline from the activity-log writer or by the
+    watermark-based catch-up job, and queries only touch rollup tables.
+
+    Catch-up only folds rows older than ACTIVITY_ROLLUP_SAFETY_LAG_SECONDS
+    and stops at the first younger one: ids are assigned at insert, so a
+    transaction still open past the watermark would otherwise commit a
+    row behind it. Inline counting does not move the watermark, so
+    catch-up refuses to run unbounded while it is on.
+    """
+
+    models = {"hour": ActivityRollupHourly, "day": ActivityRollupDaily}
+
+    def aggregate(
+        self, rows: Iterable[Tuple[Optional[datetime], str, str, Optional[str]]]
+    ) -> Dict[str, Counter]:
+        """
+        Fold (created_at, entity, action, user_uuid) rows into hourly and
+        daily counters keyed by (bucket, entity, action, user_uuid).
+        """
+        hourly: Counter = Counter()
+        daily: Counter = Counter()
+        for created_at, entity, action, user_uuid in rows:
+            created_at = created_at or datetime.utcnow()
+            user_key = user_uuid or ""
+            hourly[(hour_bucket(created_at), entity, action, user_key)] += 1
+            daily[(day_bucket(created_at), entity, action, user_key)] += 1
+        return {"hour": hourly, "day": daily}
+
+    async def _upsert(self, db: AsyncSession, model, counters: Counter) -> None:
+        if not counters:
+            return
+        values = [
+            {
+                "bucket": bucket,
+                "entity": entity,
+                "action": action,
+                "user_uuid": user_uuid,
+                "count": count,
+            }
+            for (bucket, entity, action, user_uuid), count in counters.items()
+        ]
+        stmt = mysql_insert(model.__table__).values(values)
+        stmt = stmt.on_duplicate_key_update(
+            count=model.__table__.c.count + stmt.inserted.count
+        )
+        await db.execute(stmt)
+
+    async def record(self, db: AsyncSession, logs: Iterable[ActivityLog]) -> None:
+        """
+        Add activity logs to the rollups within the caller's transaction.
+        Used by the activity-log writer when ACTIVITY_ROLLUP_INLINE is on.
+        """
+        counters = self.aggregate(
+            (log.created_at, log.entity, log.action, log.user_uuid) for log in logs
+        )
+        for granularity, model in self.models.items():
+            await self._upsert(db, model, counters[granularity])
+
+    @staticmethod
+    def _check_inline(until_id: Optional[int]) -> None:
+        if settings.ACTIVITY_ROLLUP_INLINE and until_id is None:
+            raise ValueError(
+                "Activity rollups are counted inline; catch-up needs until_id "
+                "(the last log id written before inline counting was enabled)"
+            )
+
+    async def get_watermark(self, db: AsyncSession, lock: bool = False) -> int:
+        query = select(RollupWatermark).where(RollupWatermark.name == WATERMARK_NAME)
+        if lock:
+            query = query.with_for_update()
+        result = await db.execute(query)
+        watermark = result.scalars().first()
+        if watermark is None:
+            watermark = RollupWatermark(name=WATERMARK_NAME, last_id=0)
+            db.add(watermark)
+            await db.flush()
+        return watermark.last_id
+
+    async def catch_up_batch(
+        self,
+        db: AsyncSession,
+        batch_size: Optional[int] = None,
+        until_id: Optional[int] = None,
+    ) -> int:
+        """
+        Fold the next chunk of activity_logs past the watermark into the
+        rollups and advance the watermark in the same transaction.
+        Returns the number of source rows processed.
+        """
+        self._check_inline(until_id)
+        batch_size = batch_size or settings.ACTIVITY_ROLLUP_BATCH_SIZE
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.ACTIVITY_ROLLUP_SAFETY_LAG_SECONDS)
+
+        try:
+            last_id = await self.get_watermark(db, lock=True)
+            query = (
+                select(
+                    ActivityLog.id,
+                    ActivityLog.created_at,
+                    ActivityLog.entity,
+                    ActivityLog.action,
+                    ActivityLog.user_uuid,
+                )
+                .where(ActivityLog.id > last_id)
+                .order_by(ActivityLog.id)
+                .limit(batch_size)
+            )
+            if until_id is not None:
+                query = query.where(ActivityLog.id <= until_id)
+            rows = (await db.execute(query)).all()
+            # Keep the watermark behind rows that may still have open neighbours
+            for index, row in enumerate(rows):
+                if row[1] is not None and to_utc(row[1]) > cutoff:
+                    rows = rows[:index]
+                    break
+
+            if not rows:
+                await db.rollback()
+                return 0
+
+            counters = self.aggregate(row[1:] for row in rows)
+            for granularity, model in self.models.items():
+                await self._upsert(db, model, counters[granularity])
+
+            watermark = await db.get(RollupWatermark, WATERMARK_NAME)
+            watermark.last_id = rows[-1][0]
+            await db.commit()
+            return len(rows)
+
+        except Exception as exc:
+            await db.rollback()
+            logger.error(f"Activity rollup catch-up failed: {exc}")
+            raise RuntimeError("Could not update activity rollups") from exc
+
+    async def catch_up(
+        self,
+        db: AsyncSession,
+        batch_size: Optional[int] = None,
+        until_id: Optional[int] = None,
+        max_batches: Optional[int] = None,
+    ) -> int:
+        """
+        Process chunks until the watermark reaches the end of the table
+        (or until_id). Also serves as the history backfill.
+        """
+        self._check_inline(until_id)
+        total = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            processed = await self.catch_up_batch(
+                db, batch_size=batch_size, until_id=until_id
+            )
+            if not processed:
+                break
+            total += processed
+            batches += 1
+        return total
+
+    # Query APIs (rollup tables only)
+    async def actions_per_entity(
+        self,
+        db: AsyncSession,
+        start: datetime,
+        end: datetime,
+        granularity: Granularity = "day",
+        entity: Optional[str] = None,
+        action: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        model = self.models[granularity]
+        total = func.sum(model.count).label("count")
+        query = (
+            select(model.bucket, model.entity, model.action, total)
+            .where(model.bucket >= start, model.bucket < end)
+            .group_by(model.bucket, model.entity, model.action)
+            .order_by(model.bucket)
+        )
+        if entity:
+            query = query.where(model.entity == entity)
+        if action:
+            query = query.where(model.action == action)
+        result = await db.execute(query)
+        return [row._asdict() for row in result.all()]
+
+    async def most_active_users(
+        self,
+        db: AsyncSession,
+        start: datetime,
+        end: datetime,
+        limit: int = 10,
+        entity: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        model = ActivityRollupDaily
+        total = func.sum(model.count).label("count")
+        query = (
+            select(model.user_uuid, total)
+            .where(model.bucket >= start, model.bucket < end, model.user_uuid != "")
+            .group_by(model.user_uuid)
+            .order_by(total.desc())
+            .limit(limit)
+        )
+        if entity:
+            query = query.where(model.entity == entity)
+        result = await db.execute(query)
+        return [row._asdict() for row in result.all()]
+
+
+activity_rollup_crud = CRUDActivityRollup()
@@ -6,19 +6,23 @@ from sqlalchemy import update as sql_update
 from pydantic import BaseModel
 import asyncio
 
+from ..utils.generate_slugs import save_with_unique_slug
+
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
-    def __init__(self, model: Type[ModelType], soft_delete: bool = False):
+    def __init__(self, model: Type[ModelType], soft_delete: bool = False, slug_source: str = "title"):
         """
         Generic CRUD class for Automeet project.
         - model: SQLAlchemy model class
         - soft_delete: True if this model should be soft-deleted
+        - slug_source: field a unique slug is derived from on create (slugged models only)
         """
         self.model = model
         self.soft_delete = soft_delete
+        self.slug_source = slug_source
 
     async def get(self, db: AsyncSession, id: Any, with_relationships: bool = True) -> Optional[ModelType]:
         query = select(self.model).where(self.model.id == id)
@@ -27,6 +31,13 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         result = await db.execute(query)
         return result.scalars().first()
 
+    async def get_by_slug(self, db: AsyncSession, slug: str, with_relationships: bool = True) -> Optional[ModelType]:
+        query = select(self.model).where(self.model.slug == slug)
+        if with_relationships:
+            query = query.options(selectinload("*"))
+        result = await db.execute(query)
+        return result.scalars().first()
+
     async def get_multi(
         self,
         db: AsyncSession,
@@ -54,6 +65,9 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     async def create(self, db: AsyncSession, obj_in: CreateSchemaType) -> ModelType:
         obj_data = obj_in.dict(exclude_unset=True)
         db_obj = self.model(**obj_data)
+        if hasattr(self.model, "slug") and not obj_data.get("slug") and obj_data.get(self.slug_source):
+            # Retries on a concurrent insert of the same slug
+            await save_with_unique_slug(db, self, db_obj, obj_data[self.slug_source])
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
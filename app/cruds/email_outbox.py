@@ -0,0 +1,235 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import func, insert, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..core.mailer import OutgoingEmail, default_provider
+from ..models.email_outbox import DEDUPE_KEY_LENGTH, EmailOutbox
+
+
+def _check_dedupe_key(dedupe_key: Optional[str]) -> Optional[str]:
+    # MySQL would truncate a longer key and merge distinct emails into one
+    if dedupe_key is not None and len(dedupe_key) > DEDUPE_KEY_LENGTH:
+        raise ValueError(f"dedupe_key is longer than {DEDUPE_KEY_LENGTH} characters")
+    return dedupe_key
+
+
+class CRUDEmailOutbox:
+    """Outbox rows: enqueue inside the caller's transaction, claim and settle in the worker."""
+
+    def __init__(self, model=EmailOutbox):
+        self.model = model
+
+    def enqueue(
+        self,
+        db: AsyncSession,
+        recipient: str,
+        subject: str,
+        html: str,
+        text: Optional[str] = None,
+        provider: Optional[str] = None,
+        dedupe_key: Optional[str] = None,
+    ) -> EmailOutbox:
+        """
+        Add an email to the session without committing. It is stored (and
+        later delivered) only if the caller's transaction commits.
+        """
+        db_obj = self.model(
+            provider=provider or default_provider(),
+            recipient=recipient,
+            subject=subject,
+            body_html=html,
+            body_text=text,
+            status="pending",
+            attempts=0,
+            next_attempt_at=datetime.utcnow(),
+            dedupe_key=_check_dedupe_key(dedupe_key),
+        )
+        db.add(db_obj)
+        return db_obj
+
+    async def enqueue_unique(self, db: AsyncSession, emails: Sequence[Dict[str, Any]]) -> List[str]:
+        """
+        Bulk enqueue without committing. Each item has recipient, subject,
+        html, optional text/provider and a dedupe_key; items whose key is
+        already in the outbox are skipped. Returns the dedupe keys added.
+        """
+        if not emails:
+            return []
+        keys = [_check_dedupe_key(email["dedupe_key"]) for email in emails]
+        existing = set((await db.execute(
+            select(self.model.dedupe_key).where(self.model.dedupe_key.in_(keys))
+        )).scalars())
+        emails = [email for email in emails if email["dedupe_key"] not in existing]
+        if not emails:
+            return []
+        now = datetime.utcnow()
+        rows = [
+            {
+                "provider": email.get("provider") or default_provider(),
+                "recipient": email["recipient"],
+                "subject": email["subject"],
+                "body_html": email["html"],
+                "body_text": email.get("text"),
+                "status": "pending",
+                "attempts": 0,
+                "next_attempt_at": now,
+                "dedupe_key": email["dedupe_key"],
+            }
+            for email in emails
+        ]
+        # IGNORE still covers a concurrent insert of the same key
+        await db.execute(insert(self.model).prefix_with("IGNORE"), rows)
+        return [email["dedupe_key"] for email in emails]
+
+    async def claim(
+        self, db: AsyncSession, lease: str, limit: int, lease_seconds: int, max_attempts: int
+    ) -> Tuple[Dict[str, List[OutgoingEmail]], int]:
+        """
+        Lock up to `limit` due rows (SKIP LOCKED, so workers never block on
+        each other), mark them as sending under the lease token `lease` and
+        group them by provider. Rows whose lease expired (stalled or crashed
+        worker) are due again, unless they already used max_attempts: those
+        are dead-lettered so a message that keeps killing its worker cannot
+        loop forever. Returns the batches and the number of rows dead-lettered.
+        """
+        now = datetime.utcnow()
+        rows = (await db.execute(
+            select(
+                self.model.id, self.model.provider, self.model.recipient,
+                self.model.subject, self.model.body_html, self.model.body_text,
+                self.model.attempts,
+            )
+            .where(
+                or_(
+                    (self.model.status == "pending") & (self.model.next_attempt_at <= now),
+                    (self.model.status == "sending") & (self.model.locked_until <= now),
+                )
+            )
+            .order_by(self.model.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )).all()
+        if not rows:
+            await db.commit()
+            return {}, 0
+
+        exhausted = [row.id for row in rows if row.attempts >= max_attempts]
+        rows = [row for row in rows if row.attempts < max_attempts]
+        if exhausted:
+            await db.execute(
+                update(self.model)
+                .where(self.model.id.in_(exhausted))
+                .values(
+                    status="dead",
+                    locked_until=None,
+                    claimed_by=None,
+                    last_error=f"Gave up after {max_attempts} attempts (lease expired)",
+                )
+            )
+        if rows:
+            await db.execute(
+                update(self.model)
+                .where(self.model.id.in_([row.id for row in rows]))
+                .values(
+                    status="sending",
+                    attempts=self.model.attempts + 1,
+                    locked_until=now + timedelta(seconds=lease_seconds),
+                    claimed_by=lease,
+                )
+            )
+        await db.commit()
+
+        batches: Dict[str, List[OutgoingEmail]] = {}
+        for row in rows:
+            batches.setdefault(row.provider, []).append(
+                OutgoingEmail(
+                    id=row.id, recipient=row.recipient, subject=row.subject,
+                    html=row.body_html, text=row.body_text,
+                )
+            )
+        return batches, len(exhausted)
+
+    def _leased(self, ids: Sequence[int], lease: str):
+        # Rows re-claimed by another worker after our lease expired are theirs now
+        return (
+            self.model.id.in_(ids)
+            & (self.model.status == "sending")
+            & (self.model.claimed_by == lease)
+        )
+
+    async def mark_sent(self, db: AsyncSession, ids: Sequence[int], lease: str) -> int:
+        """Mark rows still held under `lease` as sent; returns how many were."""
+        if not ids:
+            return 0
+        result = await db.execute(
+            update(self.model)
+            .where(self._leased(ids, lease))
+            .values(
+                status="sent", sent_at=datetime.utcnow(),
+                locked_until=None, claimed_by=None, last_error=None,
+            )
+        )
+        return result.rowcount
+
+    async def mark_failed(
+        self,
+        db: AsyncSession,
+        failures: Dict[int, str],
+        lease: str,
+        max_attempts: int,
+        retry_base_seconds: int,
+    ) -> int:
+        """
+        Reschedule rows still held under `lease` with exponential backoff,
+        or dead-letter them at max_attempts. Rows sharing the same outcome
+        (error, retry time) are updated together, so a provider outage
+        costs a handful of UPDATEs. Returns the number dead-lettered.
+        """
+        if not failures:
+            return 0
+        rows = (await db.execute(
+            select(self.model.id, self.model.attempts)
+            .where(self._leased(list(failures), lease))
+            .with_for_update()
+        )).all()
+        now = datetime.utcnow()
+        groups: Dict[Tuple[str, str, Optional[datetime]], List[int]] = {}
+        dead = 0
+        for row in rows:
+            error = failures[row.id][:2000]
+            if row.attempts >= max_attempts:
+                dead += 1
+                key = ("dead", error, None)
+            else:
+                delay = retry_base_seconds * 2 ** (row.attempts - 1)
+                key = ("pending", error, now + timedelta(seconds=min(delay, 6 * 3600)))
+            groups.setdefault(key, []).append(row.id)
+
+        for (status, error, next_attempt_at), ids in groups.items():
+            values = {"status": status, "locked_until": None, "claimed_by": None, "last_error": error}
+            if next_attempt_at is not None:
+                values["next_attempt_at"] = next_attempt_at
+            await db.execute(update(self.model).where(self._leased(ids, lease)).values(**values))
+        return dead
+
+    async def requeue_dead(self, db: AsyncSession, ids: Optional[Sequence[int]] = None) -> int:
+        """Move dead-lettered rows back to pending (all of them, or `ids`)."""
+        query = update(self.model).where(self.model.status == "dead")
+        if ids:
+            query = query.where(self.model.id.in_(ids))
+        result = await db.execute(
+            query.values(status="pending", attempts=0, next_attempt_at=datetime.utcnow())
+        )
+        await db.commit()
+        return result.rowcount
+
+    async def counts(self, db: AsyncSession) -> Dict[str, int]:
+        rows = (await db.execute(
+            select(self.model.status, func.count()).group_by(self.model.status)
+        )).all()
+        return {status: count for status, count in rows}
+
+
+email_outbox_crud = CRUDEmailOutbox()
@@ -0,0 +1,259 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import delete, insert, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..core.config import settings
+from ..models.meeting_occurrences import MeetingOccurrence, MeetingOccurrenceOverride
+from ..models.meetings import Meeting
+from ..utils.recurrence import OccurrenceChange, RecurrenceRule, expand_occurrences
+
+
+@dataclass(frozen=True)
+class Occurrence:
+    """One occurrence on a calendar: a one-off meeting or one instance of a series."""
+
+    meeting_uuid: str
+    user_uuid: str
+    title: str
+    starts_at: datetime
+    ends_at: datetime
+    original_start: Optional[datetime] = None
+
+
+def _covered(meeting: Any, original: datetime) -> bool:
+    """Whether meeting_occurrences holds the occurrence with this original start."""
+    return (
+        meeting.materialized_from is not None
+        and meeting.materialized_from <= original < meeting.materialized_until
+    )
+
+
+class CRUDMeetingOccurrence:
+    """
+    Occurrences of recurring meetings. Each series keeps its next
+    `cache_weeks` of occurrences materialized in meeting_occurrences (read
+    with plain index range scans); anything outside that window is
+    expanded lazily from the rule, only for the window asked for.
+    """
+
+    def __init__(self, model=MeetingOccurrence, cache_weeks: int = 8):
+        self.model = model
+        self.cache_weeks = cache_weeks
+
+    async def get_changes(
+        self, db: AsyncSession, meeting_uuids: Sequence[str]
+    ) -> Dict[str, Dict[datetime, OccurrenceChange]]:
+        """Exceptions of several series in one query: {meeting_uuid: {original_start: change}}."""
+        if not meeting_uuids:
+            return {}
+        rows = (await db.execute(
+            select(MeetingOccurrenceOverride).where(MeetingOccurrenceOverride.meeting_uuid.in_(list(meeting_uuids)))
+        )).scalars().all()
+        changes: Dict[str, Dict[datetime, OccurrenceChange]] = {}
+        for row in rows:
+            changes.setdefault(row.meeting_uuid, {})[row.original_start] = OccurrenceChange(
+                cancelled=row.cancelled, starts_at=row.starts_at, duration=row.duration, title=row.title
+            )
+        return changes
+
+    async def materialize(
+        self, db: AsyncSession, meeting: Meeting, now: Optional[datetime] = None
+    ) -> List[Occurrence]:
+        """
+        Rebuild the cached occurrences of one series: originals from the
+        start of today to `cache_weeks` ahead, exceptions applied. Returns
+        them; does not commit.
+        """
+        await db.execute(delete(self.model).where(self.model.meeting_uuid == meeting.uuid))
+        if not meeting.recurrence_rule:
+            meeting.materialized_from = meeting.materialized_until = None
+            return []
+
+        now = now or datetime.utcnow()
+        window_from = max(meeting.starts_at, now.replace(hour=0, minute=0, second=0, microsecond=0))
+        window_until = now + timedelta(weeks=self.cache_weeks)
+        rule = RecurrenceRule.parse(meeting.recurrence_rule)
+        changes = (await self.get_changes(db, [meeting.uuid])).get(meeting.uuid, {})
+        duration = timedelta(minutes=meeting.duration)
+
+        occurrences = []
+        for original in rule.iter_starts(meeting.starts_at, after=window_from):
+            if original >= window_until:
+                break
+            change = changes.get(original)
+            if change is not None and change.cancelled:
+                continue
+            starts_at = change.starts_at if change and change.starts_at else original
+            length = timedelta(minutes=change.duration) if change and change.duration else duration
+            occurrences.append(Occurrence(
+                meeting.uuid, meeting.user_uuid, (change.title if change else None) or meeting.title,
+                starts_at, starts_at + length, original,
+            ))
+        if occurrences:
+            await db.execute(insert(self.model), [
+                {
+                    "meeting_uuid": occurrence.meeting_uuid,
+                    "user_uuid": occurrence.user_uuid,
+                    "original_start": occurrence.original_start,
+                    "starts_at": occurrence.starts_at,
+                    "ends_at": occurrence.ends_at,
+                    "title": occurrence.title if occurrence.title != meeting.title else None,
+                }
+                for occurrence in occurrences
+            ])
+        meeting.materialized_from = window_from
+        meeting.materialized_until = max(window_from, window_until)
+        return occurrences
+
+    async def get_stale_series(self, db: AsyncSession, limit: int = 500, now: Optional[datetime] = None) -> List[Meeting]:
+        """Series whose cache ends less than a week from now (and which are still running)."""
+        now = now or datetime.utcnow()
+        result = await db.execute(
+            select(Meeting)
+            .where(
+                Meeting.recurring.is_(True),
+                or_(Meeting.recurrence_until.is_(None), Meeting.recurrence_until > now),
+                or_(
+                    Meeting.materialized_until.is_(None),
+                    Meeting.materialized_until < now + timedelta(weeks=max(self.cache_weeks - 1, 1)),
+                ),
+            )
+            .order_by(Meeting.materialized_until)
+            .limit(limit)
+        )
+        return result.scalars().all()
+
+    async def expand_uncovered(
+        self,
+        db: AsyncSession,
+        start: datetime,
+        end: datetime,
+        series_clauses: Iterable[Any] = (),
+    ) -> List[Occurrence]:
+        """
+        Occurrences overlapping [start, end) that are not in the cache,
+        for the series matching `series_clauses`. Series fully covered for
+        the window are filtered out in SQL, so inside the cached weeks this
+        is one index lookup returning nothing.
+        """
+        series = (await db.execute(
+            select(
+                Meeting.uuid, Meeting.user_uuid, Meeting.title, Meeting.starts_at, Meeting.duration,
+                Meeting.recurrence_rule, Meeting.materialized_from, Meeting.materialized_until,
+            )
+            .where(
+                Meeting.recurring.is_(True),
+                Meeting.starts_at < end,
+                or_(Meeting.recurrence_until.is_(None), Meeting.recurrence_until > start),
+                or_(
+                    Meeting.materialized_until.is_(None),
+                    Meeting.materialized_until < end,
+                    Meeting.materialized_from > start - timedelta(days=1),
+                ),
+                *series_clauses,
+            )
+        )).all()
+        if not series:
+            return []
+
+        changes = await self.get_changes(db, [row.uuid for row in series])
+        found: List[Occurrence] = []
+        for row in series:
+            rule = RecurrenceRule.parse(row.recurrence_rule)
+            for original, starts_at, ends_at, title in expand_occurrences(
+                row.starts_at, row.duration, rule, start, end, changes.get(row.uuid)
+            ):
+                if not _covered(row, original):
+                    found.append(Occurrence(row.uuid, row.user_uuid, title or row.title, starts_at, ends_at, original))
+        return found
+
+    async def resolve(
+        self, db: AsyncSession, keys: Sequence[Tuple[str, datetime]]
+    ) -> Dict[Tuple[str, datetime], Occurrence]:
+        """
+        Current state of specific occurrences, by (meeting_uuid, original
+        start): cached rows in one query, the rest expanded from their
+        series. Cancelled or unknown occurrences are missing from the result.
+        """
+        if not keys:
+            return {}
+        keys = list(dict.fromkeys(keys))
+        found: Dict[Tuple[str, datetime], Occurrence] = {}
+        rows = (await db.execute(
+            select(self.model, Meeting.title)
+            .join(Meeting, Meeting.uuid == self.model.meeting_uuid)
+            .where(tuple_(self.model.meeting_uuid, self.model.original_start).in_(keys))
+        )).all()
+        for row, series_title in rows:
+            found[(row.meeting_uuid, row.original_start)] = Occurrence(
+                row.meeting_uuid, row.user_uuid, row.title or series_title, row.starts_at, row.ends_at, row.original_start
+            )
+
+        missing = [key for key in keys if key not in found]
+        if missing:
+            series = {
+                meeting.uuid: meeting
+                for meeting in (await db.execute(
+                    select(Meeting).where(Meeting.uuid.in_({meeting_uuid for meeting_uuid, _ in missing}))
+                )).scalars()
+            }
+            changes = await self.get_changes(db, list(series))
+            for meeting_uuid, original in missing:
+                meeting = series.get(meeting_uuid)
+                if meeting is None or not meeting.recurrence_rule or _covered(meeting, original):
+                    continue  # deleted, no longer recurring, or cached and cancelled
+                rule = RecurrenceRule.parse(meeting.recurrence_rule)
+                if next(rule.iter_starts(meeting.starts_at, after=original), None) != original:
+                    continue  # not an occurrence of the current rule
+                change = changes.get(meeting_uuid, {}).get(original)
+                if change is not None and change.cancelled:
+                    continue
+                starts_at = change.starts_at if change and change.starts_at else original
+                length = change.duration if change and change.duration else meeting.duration
+                found[(meeting_uuid, original)] = Occurrence(
+                    meeting_uuid, meeting.user_uuid, (change.title if change else None) or meeting.title,
+                    starts_at, starts_at + timedelta(minutes=length), original,
+                )
+        return found
+
+    # Exceptions
+    async def set_override(
+        self, db: AsyncSession, meeting: Meeting, original_start: datetime, **values: Any
+    ) -> List[Occurrence]:
+        """Create or replace the exception for one occurrence, then rebuild the cache. Commits."""
+        rule = RecurrenceRule.parse(meeting.recurrence_rule) if meeting.recurrence_rule else None
+        if rule is None or next(rule.iter_starts(meeting.starts_at, after=original_start), None) != original_start:
+            raise ValueError("original_start is not an occurrence of this meeting")
+        existing = (await db.execute(
+            select(MeetingOccurrenceOverride).where(
+                MeetingOccurrenceOverride.meeting_uuid == meeting.uuid,
+                MeetingOccurrenceOverride.original_start == original_start,
+            )
+        )).scalars().first()
+        if existing is None:
+            existing = MeetingOccurrenceOverride(meeting_uuid=meeting.uuid, original_start=original_start)
+            db.add(existing)
+        for field in ("cancelled", "starts_at", "duration", "title"):
+            setattr(existing, field, values.get(field, False if field == "cancelled" else None))
+        await db.flush()
+        occurrences = await self.materialize(db, meeting)
+        await db.commit()
+        return occurrences
+
+    async def remove_override(self, db: AsyncSession, meeting: Meeting, original_start: datetime) -> List[Occurrence]:
+        """Restore an occurrence to what the rule generates. Commits."""
+        await db.execute(
+            delete(MeetingOccurrenceOverride).where(
+                MeetingOccurrenceOverride.meeting_uuid == meeting.uuid,
+                MeetingOccurrenceOverride.original_start == original_start,
+            )
+        )
+        occurrences = await self.materialize(db, meeting)
+        await db.commit()
+        return occurrences
+
+
+crud_meeting_occurrence = CRUDMeetingOccurrence(cache_weeks=settings.MEETING_OCCURRENCE_CACHE_WEEKS)
@@ -0,0 +1,551 @@
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+from pydantic import BaseModel
+from sqlalchemy import DateTime, delete, func, insert, null, or_, type_coerce, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from .base import CRUDBase
+from .meeting_occurrences import Occurrence, crud_meeting_occurrence
+from ..core.calendar_versions import calendar_feed_versions
+from ..core.reminders import meeting_reminders
+from ..models.meeting_occurrences import MeetingOccurrence
+from ..models.meeting_participants import MeetingParticipant
+from ..models.meetings import MAX_MEETING_DURATION_MINUTES, Meeting
+from ..models.users import User
+from ..schemas.meetings import MeetingCreateSchema, MeetingFilters, MeetingUpdateSchema
+from ..utils.intervals import ScheduleIndex
+from ..utils.recurrence import RecurrenceRule, expand_occurrences
+from ..utils.slot_finder import SlotPreferences, SlotSuggestion, find_free_slots
+from ..utils.responses import conflict_response
+
+
+def to_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """starts_at / ends_at are naive UTC; normalise aware datetimes."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def overlap_clauses(start: Optional[datetime], end: Optional[datetime], model: Any = Meeting) -> List[Any]:
+    """
+    Meetings (or meeting_occurrences rows) overlapping [start, end). The
+    extra lower bound on starts_at is implied by the maximum duration; it
+    lets (user_uuid, starts_at) and (starts_at) bound the index range on
+    both sides.
+    """
+    start, end = to_utc_naive(start), to_utc_naive(end)
+    clauses = []
+    if end is not None:
+        clauses.append(model.starts_at < end)
+    if start is not None:
+        clauses.append(model.starts_at > start - timedelta(minutes=MAX_MEETING_DURATION_MINUTES))
+        clauses.append(model.ends_at > start)
+    return clauses
+
+
+def meeting_window(scheduled_for: date, scheduled_at: time, duration: int) -> Tuple[datetime, datetime]:
+    """Same computation as the starts_at / ends_at generated columns."""
+    starts_at = datetime.combine(scheduled_for, scheduled_at)
+    return starts_at, starts_at + timedelta(minutes=duration)
+
+
+_EMAIL_SPLIT = re.compile(r"[,;\s]+")
+_MAX_EMAIL_LENGTH = MeetingParticipant.__table__.c.email.type.length
+
+
+def parse_participant_emails(participant: Optional[str]) -> List[str]:
+    """Emails from the free-text participant field (names are ignored)."""
+    emails = []
+    for token in _EMAIL_SPLIT.split(participant or ""):
+        token = token.strip().strip("<>").lower()
+        if "@" in token and len(token) <= _MAX_EMAIL_LENGTH and token not in emails:
+            emails.append(token)
+    return emails
+
+
+async def resolve_user_emails(db: AsyncSession, emails: Iterable[str]) -> Dict[str, str]:
+    """{email: user_uuid} for the registered users among `emails`, in one query."""
+    emails = list(emails)
+    if not emails:
+        return {}
+    rows = (await db.execute(select(User.email, User.uuid).where(User.email.in_(emails)))).all()
+    return {email.lower(): user_uuid for email, user_uuid in rows}
+
+
+def attendance_query(
+    users: Any, start: Optional[datetime], end: Optional[datetime], exclude_uuid: Optional[str] = None
+):
+    """
+    (user_uuid, meeting_uuid, organizer_uuid, title, starts_at, ends_at,
+    original_start) for one-off meetings and cached occurrences of recurring ones that
+    `users` organize or are invited to, overlapping [start, end). Four
+    index-range selects glued with UNION ALL rather than an OR, so each
+    keeps its own index: (user_uuid, starts_at) on meetings and on
+    meeting_occurrences, (user_uuid, meeting_uuid) on meeting_participants.
+    """
+    columns = (
+        Meeting.uuid.label("meeting_uuid"),
+        Meeting.user_uuid.label("organizer_uuid"),
+        Meeting.title,
+        Meeting.starts_at,
+        Meeting.ends_at,
+        type_coerce(null(), DateTime).label("original_start"),
+    )
+    organized = select(Meeting.user_uuid.label("user_uuid"), *columns).where(
+        Meeting.user_uuid.in_(users), Meeting.recurring.is_(False), *overlap_clauses(start, end)
+    )
+    invited = (
+        select(MeetingParticipant.user_uuid.label("user_uuid"), *columns)
+        .join(Meeting, Meeting.uuid == MeetingParticipant.meeting_uuid)
+        .where(MeetingParticipant.user_uuid.in_(users), Meeting.recurring.is_(False), *overlap_clauses(start, end))
+    )
+
+    occurrence_columns = (
+        MeetingOccurrence.meeting_uuid,
+        MeetingOccurrence.user_uuid.label("organizer_uuid"),
+        func.coalesce(MeetingOccurrence.title, Meeting.title).label("title"),
+        MeetingOccurrence.starts_at,
+        MeetingOccurrence.ends_at,
+        MeetingOccurrence.original_start,
+    )
+    organized_occurrences = (
+        select(MeetingOccurrence.user_uuid.label("user_uuid"), *occurrence_columns)
+        .join(Meeting, Meeting.uuid == MeetingOccurrence.meeting_uuid)
+        .where(MeetingOccurrence.user_uuid.in_(users), *overlap_clauses(start, end, MeetingOccurrence))
+    )
+    invited_occurrences = (
+        select(MeetingParticipant.user_uuid, *occurrence_columns)
+        .join(MeetingOccurrence, MeetingOccurrence.meeting_uuid == MeetingParticipant.meeting_uuid)
+        .join(Meeting, Meeting.uuid == MeetingOccurrence.meeting_uuid)
+        .where(MeetingParticipant.user_uuid.in_(users), *overlap_clauses(start, end, MeetingOccurrence))
+    )
+
+    selects = [organized, invited, organized_occurrences, invited_occurrences]
+    if exclude_uuid:
+        selects = [query.where(Meeting.uuid != exclude_uuid) for query in selects]
+    return union_all(*selects).subquery("attendance")
+
+
+@dataclass(frozen=True)
+class MeetingConflict:
+    user_uuid: str
+    meeting_uuid: str
+    title: str
+    starts_at: datetime
+    ends_at: datetime
+
+
+class CRUDMeeting(CRUDBase[Meeting, MeetingCreateSchema, MeetingUpdateSchema]):
+    """
+    CRUD operations for meetings, with time-range queries served by the
+    (user_uuid, starts_at) and (starts_at) indexes.
+    """
+
+    async def get_in_range(
+        self,
+        db: AsyncSession,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        user_uuid: Optional[str] = None,
+        skip: int = 0,
+        limit: Optional[int] = 100,
+    ) -> List[Meeting]:
+        """
+        Meetings overlapping [start, end), optionally for one organizer.
+        A recurring series is one row here (its first occurrence); use
+        get_calendar for expanded occurrences.
+        """
+        query = select(Meeting).where(*overlap_clauses(start, end))
+        if user_uuid:
+            query = query.where(Meeting.user_uuid == user_uuid)
+        query = query.order_by(Meeting.starts_at).offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def get_starting_between(
+        self,
+        db: AsyncSession,
+        start: datetime,
+        end: datetime,
+        limit: Optional[int] = None,
+    ) -> List[Meeting]:
+        """Meetings whose start falls in [start, end), e.g. the next 15 minutes."""
+        query = (
+            select(Meeting)
+            .where(Meeting.starts_at >= to_utc_naive(start), Meeting.starts_at < to_utc_naive(end))
+            .order_by(Meeting.starts_at)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def get_by_filters(self, db: AsyncSession, filters: MeetingFilters) -> List[Meeting]:
+        query = select(Meeting).where(*overlap_clauses(filters.time_from, filters.time_to))
+        for field in ("title", "scheduled_for", "scheduled_at", "duration", "platform", "user_uuid"):
+            value = getattr(filters, field)
+            if value is not None:
+                query = query.where(getattr(Meeting, field) == value)
+        if filters.participant:
+            emails = parse_participant_emails(filters.participant)
+            if emails:
+                query = query.where(Meeting.uuid.in_(
+                    select(MeetingParticipant.meeting_uuid).where(MeetingParticipant.email.in_(emails))
+                ))
+            else:
+                query = query.where(Meeting.participant.ilike(f"%{filters.participant}%"))
+
+        field, _, direction = (filters.sort or "starts_at:asc").partition(":")
+        column = Meeting.__table__.columns.get(field, Meeting.__table__.c.starts_at)
+        query = query.order_by(column.desc() if direction == "desc" else column.asc())
+        query = query.offset(filters.skip or 0).limit(filters.limit or 10)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    # Calendars
+    async def get_attendance(
+        self,
+        db: AsyncSession,
+        users: Any,
+        start: datetime,
+        end: datetime,
+        exclude_uuid: Optional[str] = None,
+    ) -> List[Tuple[str, Occurrence]]:
+        """
+        (user_uuid, occurrence) for everything `users` (a list or a
+        subquery of user uuids) organize or are invited to in [start,
+        end), recurring meetings expanded. Cached occurrences come from
+        attendance_query; only series not cached for the window are
+        expanded in Python, so the work stays proportional to the window.
+        """
+        start, end = to_utc_naive(start), to_utc_naive(end)
+        attendance = attendance_query(users, start, end, exclude_uuid)
+        rows = (await db.execute(select(attendance).distinct().order_by(attendance.c.starts_at))).all()
+        found = [
+            (user_uuid, Occurrence(meeting_uuid, organizer_uuid, title, starts_at, ends_at, original_start))
+            for user_uuid, meeting_uuid, organizer_uuid, title, starts_at, ends_at, original_start in rows
+        ]
+
+        series_clauses = [or_(
+            Meeting.user_uuid.in_(users),
+            Meeting.uuid.in_(select(MeetingParticipant.meeting_uuid).where(MeetingParticipant.user_uuid.in_(users))),
+        )]
+        if exclude_uuid:
+            series_clauses.append(Meeting.uuid != exclude_uuid)
+        uncovered = await crud_meeting_occurrence.expand_uncovered(db, start, end, series_clauses)
+        if uncovered:
+            series = list({occurrence.meeting_uuid for occurrence in uncovered})
+            members = union_all(
+                select(Meeting.uuid, Meeting.user_uuid).where(Meeting.uuid.in_(series), Meeting.user_uuid.in_(users)),
+                select(MeetingParticipant.meeting_uuid, MeetingParticipant.user_uuid)
+                .where(MeetingParticipant.meeting_uuid.in_(series), MeetingParticipant.user_uuid.in_(users)),
+            )
+            attendees: Dict[str, set] = {}
+            for meeting_uuid, user_uuid in (await db.execute(members)).all():
+                attendees.setdefault(meeting_uuid, set()).add(user_uuid)
+            found.extend(
+                (user_uuid, occurrence)
+                for occurrence in uncovered
+                for user_uuid in attendees.get(occurrence.meeting_uuid, ())
+            )
+            found.sort(key=lambda item: item[1].starts_at)
+        return found
+
+    async def get_calendar(
+        self,
+        db: AsyncSession,
+        user_uuid: str,
+        start: datetime,
+        end: datetime,
+    ) -> List[Occurrence]:
+        """Meetings a user organizes or is invited to in [start, end), recurring meetings expanded."""
+        occurrences = {}
+        for _, occurrence in await self.get_attendance(db, [user_uuid], start, end):
+            occurrences.setdefault((occurrence.meeting_uuid, occurrence.original_start), occurrence)
+        return list(occurrences.values())
+
+    # Conflict detection
+    async def find_conflicts(
+        self,
+        db: AsyncSession,
+        organizer_uuid: str,
+        participant: Optional[str],
+        start: datetime,
+        end: datetime,
+        exclude_uuid: Optional[str] = None,
+        recurrence_rule: Optional[str] = None,
+    ) -> List[MeetingConflict]:
+        """
+        Meetings the organizer or any participant that resolves to a user
+        organizes or is invited to, overlapping [start, end). Participant
+        resolution is a subquery of the same statement.
+
+        With a recurrence rule, [start, end) is the first occurrence and
+        every occurrence within the occurrence cache window is checked
+        against one in-memory schedule of the attendees.
+        """
+        emails = parse_participant_emails(participant)
+        users = select(User.uuid).where(
+            or_(User.uuid == organizer_uuid, User.email.in_(emails)) if emails else User.uuid == organizer_uuid
+        )
+        if not recurrence_rule:
+            return [
+                MeetingConflict(user_uuid, occurrence.meeting_uuid, occurrence.title, occurrence.starts_at, occurrence.ends_at)
+                for user_uuid, occurrence in await self.get_attendance(db, users, start, end, exclude_uuid)
+            ]
+
+        now = datetime.utcnow()
+        window_start = max(start, now)
+        window_end = now + timedelta(weeks=crud_meeting_occurrence.cache_weeks)
+        duration = int((end - start) / timedelta(minutes=1))
+        planned = expand_occurrences(start, duration, RecurrenceRule.parse(recurrence_rule), window_start, window_end)
+        if not planned:
+            return []
+        attendance = await self.get_attendance(db, users, planned[0][1], planned[-1][2], exclude_uuid)
+        schedule = ScheduleIndex().load(
+            (user_uuid, occurrence.starts_at, occurrence.ends_at, occurrence) for user_uuid, occurrence in attendance
+        )
+        attendees = {user_uuid for user_uuid, _ in attendance}
+        conflicts = []
+        for _, occurrence_start, occurrence_end, _ in planned:
+            for user_uuid, items in schedule.conflicts(attendees, occurrence_start, occurrence_end).items():
+                conflicts.extend(
+                    MeetingConflict(user_uuid, other.meeting_uuid, other.title, other.starts_at, other.ends_at)
+                    for _, _, other in items
+                )
+        return conflicts
+
+    async def ensure_no_conflicts(self, db: AsyncSession, **kwargs: Any) -> None:
+        conflicts = await self.find_conflicts(db, **kwargs)
+        if conflicts:
+            first = conflicts[0]
+            return conflict_response(
+                f"Meeting overlaps {len(conflicts)} existing meeting(s), first: "
+                f"'{first.title}' {first.starts_at:%Y-%m-%d %H:%M}-{first.ends_at:%H:%M} UTC"
+            )
+
+    async def create(
+        self, db: AsyncSession, obj_in: MeetingCreateSchema, check_conflicts: bool = True
+    ) -> Meeting:
+        start, end = meeting_window(obj_in.scheduled_for, obj_in.scheduled_at, obj_in.duration)
+        if check_conflicts:
+            await self.ensure_no_conflicts(
+                db,
+                organizer_uuid=obj_in.user_uuid,
+                participant=obj_in.participant,
+                start=start,
+                end=end,
+                recurrence_rule=obj_in.recurrence_rule,
+            )
+        db_obj = Meeting(**obj_in.dict(exclude_unset=True))
+        if db_obj.recurrence_rule:
+            db_obj.recurrence_until = RecurrenceRule.parse(db_obj.recurrence_rule).last_end(start, end - start)
+        db.add(db_obj)
+        await db.flush()
+        await self.sync_participants(db, db_obj.uuid, db_obj.participant)
+        occurrences = []
+        if db_obj.recurrence_rule:
+            await db.refresh(db_obj, ["starts_at", "ends_at"])
+            occurrences = await crud_meeting_occurrence.materialize(db, db_obj)
+        feed_users = await self.feed_users(db, db_obj)
+        await db.commit()
+        await calendar_feed_versions.touch(feed_users)
+        await db.refresh(db_obj)
+        await self._schedule_reminders(db_obj, occurrences)
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        db_obj: Meeting,
+        obj_in: Union[MeetingUpdateSchema, Dict[str, Any]],
+        check_conflicts: bool = True,
+    ) -> Meeting:
+        obj_data = obj_in.dict(exclude_unset=True) if isinstance(obj_in, BaseModel) else obj_in
+        timing = ("scheduled_for", "scheduled_at", "duration", "participant", "user_uuid", "recurrence_rule")
+        if check_conflicts and any(field in obj_data for field in timing):
+            merged = {field: obj_data.get(field, getattr(db_obj, field)) for field in timing}
+            start, end = meeting_window(merged["scheduled_for"], merged["scheduled_at"], merged["duration"])
+            await self.ensure_no_conflicts(
+                db,
+                organizer_uuid=merged["user_uuid"],
+                participant=merged["participant"],
+                start=start,
+                end=end,
+                exclude_uuid=db_obj.uuid,
+                recurrence_rule=merged["recurrence_rule"],
+            )
+        feed_users = await self.feed_users(db, db_obj)
+        if "participant" in obj_data:
+            await self.sync_participants(db, db_obj.uuid, obj_data["participant"])
+        for field, value in obj_data.items():
+            setattr(db_obj, field, value)
+
+        # The series changed shape: new bound, rebuilt occurrence cache
+        series = ("scheduled_for", "scheduled_at", "duration", "user_uuid", "recurrence_rule")
+        occurrences = None
+        if any(field in obj_data for field in series) and (db_obj.recurrence_rule or db_obj.materialized_until):
+            start, end = meeting_window(db_obj.scheduled_for, db_obj.scheduled_at, db_obj.duration)
+            db_obj.recurrence_until = (
+                RecurrenceRule.parse(db_obj.recurrence_rule).last_end(start, end - start)
+                if db_obj.recurrence_rule else None
+            )
+            await db.flush()
+            await db.refresh(db_obj, ["starts_at", "ends_at"])
+            occurrences = await crud_meeting_occurrence.materialize(db, db_obj)
+        db.add(db_obj)
+        feed_users |= await self.feed_users(db, db_obj)
+        await db.commit()
+        await calendar_feed_versions.touch(feed_users)
+        await db.refresh(db_obj)
+        if any(field in obj_data for field in ("scheduled_for", "scheduled_at", "recurrence_rule")):
+            await self._schedule_reminders(db_obj, occurrences or [])
+        return db_obj
+
+    async def remove(self, db: AsyncSession, db_obj: Meeting) -> Meeting:
+        meeting_uuid = db_obj.uuid
+        feed_users = await self.feed_users(db, db_obj)
+        db_obj = await super().remove(db, db_obj)
+        await calendar_feed_versions.touch(feed_users)
+        await meeting_reminders.cancel(meeting_uuid)
+        return db_obj
+
+    async def feed_users(self, db: AsyncSession, meeting: Meeting) -> Set[str]:
+        """Users whose calendar feed shows the meeting: organizer and resolved invitees."""
+        invitees = await db.execute(
+            select(MeetingParticipant.user_uuid).where(
+                MeetingParticipant.meeting_uuid == meeting.uuid, MeetingParticipant.user_uuid.is_not(None)
+            )
+        )
+        return {meeting.user_uuid, *invitees.scalars()}
+
+    async def _schedule_reminders(self, meeting: Meeting, occurrences: List[Occurrence]) -> None:
+        if meeting.recurrence_rule:
+            await meeting_reminders.cancel(meeting.uuid)
+            await meeting_reminders.schedule_occurrences(occurrences)
+        else:
+            await meeting_reminders.schedule(meeting.uuid, meeting.starts_at)
+
+    # Recurring meetings
+    async def set_occurrence_override(
+        self, db: AsyncSession, meeting: Meeting, original_start: datetime, **values: Any
+    ) -> List[Occurrence]:
+        """Cancel, move or retitle one occurrence of a series (see MeetingOccurrenceOverrideSchema)."""
+        occurrences = await crud_meeting_occurrence.set_override(db, meeting, to_utc_naive(original_start), **values)
+        await calendar_feed_versions.touch(await self.feed_users(db, meeting))
+        await meeting_reminders.schedule_occurrences(occurrences)
+        return occurrences
+
+    async def remove_occurrence_override(
+        self, db: AsyncSession, meeting: Meeting, original_start: datetime
+    ) -> List[Occurrence]:
+        occurrences = await crud_meeting_occurrence.remove_override(db, meeting, to_utc_naive(original_start))
+        await calendar_feed_versions.touch(await self.feed_users(db, meeting))
+        await meeting_reminders.schedule_occurrences(occurrences)
+        return occurrences
+
+    # Participants
+    async def sync_participants(self, db: AsyncSession, meeting_uuid: str, participant: Optional[str]) -> None:
+        """
+        Bring meeting_participants in line with the participant text:
+        delete removed emails, insert added ones with their users resolved
+        in one query. Does not commit.
+        """
+        emails = parse_participant_emails(participant)
+        existing = set((await db.execute(
+            select(MeetingParticipant.email).where(MeetingParticipant.meeting_uuid == meeting_uuid)
+        )).scalars().all())
+        removed = existing.difference(emails)
+        added = [email for email in emails if email not in existing]
+        if removed:
+            await db.execute(
+                delete(MeetingParticipant).where(
+                    MeetingParticipant.meeting_uuid == meeting_uuid, MeetingParticipant.email.in_(removed)
+                )
+            )
+        if added:
+            users = await resolve_user_emails(db, added)
+            await db.execute(
+                insert(MeetingParticipant),
+                [{"meeting_uuid": meeting_uuid, "email": email, "user_uuid": users.get(email)} for email in added],
+            )
+
+    async def get_invitee_calendar(
+        self,
+        db: AsyncSession,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        user_uuid: Optional[str] = None,
+        email: Optional[str] = None,
+        skip: int = 0,
+        limit: Optional[int] = 100,
+    ) -> List[Meeting]:
+        """Meetings a user (or an unregistered email address) is invited to, overlapping [start, end)."""
+        if user_uuid:
+            invited = MeetingParticipant.user_uuid == user_uuid
+        elif email:
+            invited = MeetingParticipant.email == email.lower()
+        else:
+            raise ValueError("user_uuid or email is required")
+        query = (
+            select(Meeting)
+            .join(MeetingParticipant, MeetingParticipant.meeting_uuid == Meeting.uuid)
+            .where(invited, *overlap_clauses(start, end))
+            .order_by(Meeting.starts_at)
+            .offset(skip)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def load_schedule(
+        self,
+        db: AsyncSession,
+        user_uuids: Iterable[str],
+        start: datetime,
+        end: datetime,
+        exclude_uuid: Optional[str] = None,
+    ) -> ScheduleIndex:
+        """Busy intervals of many users, recurring meetings expanded, as an in-memory index."""
+        attendance = await self.get_attendance(db, list(user_uuids), start, end, exclude_uuid)
+        return ScheduleIndex().load(
+            (user_uuid, occurrence.starts_at, occurrence.ends_at, occurrence.meeting_uuid)
+            for user_uuid, occurrence in attendance
+        )
+
+    # Slot suggestions
+    async def get_busy_intervals(
+        self, db: AsyncSession, user_uuids: Iterable[str], start: datetime, end: datetime
+    ) -> List[Tuple[str, datetime, datetime]]:
+        attendance = await self.get_attendance(db, list(user_uuids), start, end)
+        return [(user_uuid, occurrence.starts_at, occurrence.ends_at) for user_uuid, occurrence in attendance]
+
+    async def suggest_slots(
+        self,
+        db: AsyncSession,
+        required: List[str],
+        start: datetime,
+        end: datetime,
+        duration_minutes: int,
+        optional: Optional[List[str]] = None,
+        granularity: int = 15,
+        preferences: Optional[SlotPreferences] = None,
+        limit: int = 10,
+    ) -> List[SlotSuggestion]:
+        """Common free windows for `required` users (one query, then NumPy grids)."""
+        optional = [user_uuid for user_uuid in optional or [] if user_uuid not in required]
+        start, end = to_utc_naive(start), to_utc_naive(end)
+        busy = await self.get_busy_intervals(db, required + optional, start, end)
+        return find_free_slots(
+            busy, required, start, end, duration_minutes,
+            optional=optional, granularity=granularity, preferences=preferences, limit=limit,
+        )
+
+
+crud_meeting = CRUDMeeting(Meeting)
@@ -0,0 +1,118 @@
+import hmac
+from datetime import datetime, timezone
+from enum import Enum
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from .base import CRUDBase
+from ..models.codes import VerificationCode
+from ..schemas.verification_codes import (
+    VerificationCodeCreateSchema,
+    VerificationCodeUpdateSchema,
+)
+
+
+class OTPStatus(str, Enum):
+    VERIFIED = "verified"
+    INVALID = "invalid"
+    LOCKED = "locked"
+    EXPIRED = "expired"
+
+
+class CRUDVerificationCode(
+    CRUDBase[VerificationCode, VerificationCodeCreateSchema, VerificationCodeUpdateSchema]
+):
+    """
+    Database-backed OTP codes. At most one live row exists per (user, type):
+    issuing replaces the previous code and verification deletes the row
+    once it is used or locked, so the table does not grow with every send.
+    """
+
+    async def issue(
+        self,
+        db: AsyncSession,
+        user_uuid: str,
+        type: str,
+        code: str,
+        expires_at: datetime,
+    ) -> VerificationCode:
+        await db.execute(
+            delete(VerificationCode).where(
+                VerificationCode.user_uuid == user_uuid,
+                VerificationCode.type == type,
+            )
+        )
+        db_obj = VerificationCode(
+            user_uuid=user_uuid, type=type, code=code, expires_at=expires_at
+        )
+        db.add(db_obj)
+        await db.commit()
+        return db_obj
+
+    async def consume(
+        self,
+        db: AsyncSession,
+        user_uuid: str,
+        type: str,
+        code: str,
+        max_attempts: int,
+    ) -> OTPStatus:
+        """Check a code against the live row (user_uuid, type, expires_at index)."""
+        now = datetime.now(tz=timezone.utc)
+        result = await db.execute(
+            select(VerificationCode)
+            .where(
+                VerificationCode.user_uuid == user_uuid,
+                VerificationCode.type == type,
+                VerificationCode.expires_at > now,
+            )
+            .order_by(VerificationCode.expires_at.desc())
+            .limit(1)
+            .with_for_update()
+        )
+        db_obj = result.scalars().first()
+        if db_obj is None:
+            await db.rollback()
+            return OTPStatus.EXPIRED
+
+        if hmac.compare_digest(db_obj.code.encode("utf-8"), code.encode("utf-8")):
+            await db.delete(db_obj)
+            await db.commit()
+            return OTPStatus.VERIFIED
+
+        db_obj.attempts += 1
+        if db_obj.attempts >= max_attempts:
+            await db.delete(db_obj)
+            await db.commit()
+            return OTPStatus.LOCKED
+        await db.commit()
+        return OTPStatus.INVALID
+
+    async def revoke(self, db: AsyncSession, user_uuid: str, type: str) -> None:
+        await db.execute(
+            delete(VerificationCode).where(
+                VerificationCode.user_uuid == user_uuid,
+                VerificationCode.type == type,
+            )
+        )
+        await db.commit()
+
+    async def purge_expired(self, db: AsyncSession, batch_size: int = 5000) -> int:
+        """Delete expired rows in batches; returns the number removed."""
+        now = datetime.now(tz=timezone.utc)
+        removed = 0
+        while True:
+            ids = (await db.execute(
+                select(VerificationCode.id)
+                .where(VerificationCode.expires_at <= now)
+                .limit(batch_size)
+            )).scalars().all()
+            if not ids:
+                return removed
+            await db.execute(delete(VerificationCode).where(VerificationCode.id.in_(ids)))
+            await db.commit()
+            removed += len(ids)
+
+
+verification_code_crud = CRUDVerificationCode(VerificationCode)
@@ -1,7 +1,10 @@
+import time
 from typing import AsyncGenerator
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from ..core.config import settings
+from ..core.log_context import record_db_time
 
 # Use the dynamically set DATABASE_URL
 DATABASE_URL = settings.DATABASE_URL
@@ -17,6 +20,17 @@ if "sqlite" not in DATABASE_URL:
 # Create the engine with appropriate options
 engine = create_async_engine(DATABASE_URL, **engine_options)
 
+# Accumulate per-request DB time into the log context
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    record_db_time(time.perf_counter() - context._query_started)
+
+
 # Configure the sessionmaker
 AsyncSessionLocal = sessionmaker(
     engine,
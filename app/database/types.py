@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+import uuid as py_uuid
+from typing import Any, Optional
+from sqlalchemy import BINARY, String
+from sqlalchemy.types import TypeDecorator
+
+from app.core.config import settings
+
+
+# UUIDv7 (RFC 9562): 48-bit Unix ms timestamp, version, 12-bit counter,
+# variant, 62 random bits. Keys generated later sort later, so InnoDB
+# inserts append to the right edge of the clustered index.
+_uuid7_lock = threading.Lock()
+_uuid7_last_ms = 0
+_uuid7_counter = 0
+
+
+def uuid7() -> py_uuid.UUID:
+    global _uuid7_last_ms, _uuid7_counter
+    with _uuid7_lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _uuid7_last_ms:
+            _uuid7_last_ms = now_ms
+            _uuid7_counter = int.from_bytes(os.urandom(2), "big") & 0x3FF
+        else:
+            # Same (or clock went back) ms: keep monotonic via the counter
+            _uuid7_counter += 1
+            if _uuid7_counter > 0xFFF:
+                _uuid7_last_ms += 1
+                _uuid7_counter = 0
+        timestamp, counter = _uuid7_last_ms, _uuid7_counter
+
+    random_bits = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (
+        (timestamp & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | random_bits
+    )
+    return py_uuid.UUID(int=value)
+
+
+def uuid7_str() -> str:
+    return str(uuid7())
+
+
+class UUIDType(TypeDecorator):
+    """
+    UUID column that is always a canonical string in Python (and so at the
+    API boundary, see UUIDStr). Stored as BINARY(16) when DB_UUID_STORAGE
+    is "binary", otherwise as the legacy CHAR-like String(36).
+    """
+
+    impl = String(36)
+    cache_ok = True
+
+    def __init__(self, binary: Optional[bool] = None):
+        super().__init__()
+        self.binary = settings.DB_UUID_STORAGE == "binary" if binary is None else binary
+
+    def load_dialect_impl(self, dialect):
+        if self.binary:
+            return dialect.type_descriptor(BINARY(16))
+        return dialect.type_descriptor(String(36))
+
+    def process_bind_param(self, value: Any, dialect) -> Any:
+        if value is None:
+            return None
+        if not self.binary:
+            return str(value)
+        if isinstance(value, py_uuid.UUID):
+            return value.bytes
+        if isinstance(value, (bytes, bytearray)) and len(value) == 16:
+            return bytes(value)
+        return py_uuid.UUID(str(value)).bytes
+
+    def process_result_value(self, value: Any, dialect) -> Optional[str]:
+        if value is None:
+            return None
+        if isinstance(value, (bytes, bytearray)):
+            return str(py_uuid.UUID(bytes=bytes(value)))
+        return str(value)
@@ -0,0 +1,47 @@
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+
+from .api.v1.router import api_router
+from .core.config import settings
+from .core.email_outbox import email_outbox_worker
+from .core.log_context import LogContextMiddleware
+from .core.notifications import notification_hub
+from .core.permissions import permission_resolver
+from .core.reminders import meeting_reminders
+from .core.security import principal_cache
+from .core.token_revocation import revocation_list
+from .utils.password_util import aconfigure_password_hashing
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pick the bcrypt cost for this host before serving logins
+    await aconfigure_password_hashing()
+    # Follow RBAC cache invalidations from other workers
+    await permission_resolver.start()
+    await principal_cache.start()
+    await revocation_list.start()
+    # Deliver notifications published by any worker to this worker's sockets
+    await notification_hub.start()
+    if settings.EMAIL_OUTBOX_WORKER:
+        await email_outbox_worker.start()
+    if settings.MEETING_REMINDER_WORKER:
+        # Every worker competes for the leader lease; one of them polls
+        await meeting_reminders.start()
+    yield
+    await meeting_reminders.stop()
+    await email_outbox_worker.stop()
+    await notification_hub.stop()
+    await revocation_list.stop()
+    await principal_cache.stop()
+    await permission_resolver.stop()
+
+
+app = FastAPI(
+    title=settings.APP_NAME,
+    version=settings.API_VERSION,
+    lifespan=lifespan,
+)
+
+app.add_middleware(LogContextMiddleware)
+app.include_router(api_router, prefix="/api/v1")
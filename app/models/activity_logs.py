@@ -2,6 +2,7 @@ from typing import Union, Optional
 from sqlalchemy import ForeignKey, String, Boolean, JSON, Text, DateTime
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from ..database.base_class import Base
+from ..database.types import UUIDType
 from .base_mixins import BaseIDModelMixin
 from typing import TYPE_CHECKING
 from datetime import datetime
@@ -19,7 +20,7 @@ class ActivityLog(BaseIDModelMixin, Base):
 
     # The user who performed the action
     user_uuid: Mapped[Optional[str]] = mapped_column(
-        String(36), ForeignKey("users.uuid"), nullable=True
+        UUIDType(), ForeignKey("users.uuid"), nullable=True
     )
 
     # The type of entity affected (e.g., "Meeting", "Message", "User")
@@ -0,0 +1,64 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, String, UniqueConstraint, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+from ..database.base_class import Base
+
+
+class ActivityRollupMixin:
+    """Shared columns for pre-aggregated activity counters."""
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    # Start of the hour / day this counter covers (UTC, naive)
+    bucket: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    entity: Mapped[str] = mapped_column(String(50), nullable=False)
+    action: Mapped[str] = mapped_column(String(50), nullable=False)
+
+    # Empty string for anonymous actions so the unique key stays effective
+    user_uuid: Mapped[str] = mapped_column(String(36), nullable=False, default="")
+
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class ActivityRollupHourly(ActivityRollupMixin, Base):
+    """Hourly activity counters by (entity, action, user_uuid)."""
+
+    __tablename__ = "activity_rollups_hourly"
+    __table_args__ = (
+        UniqueConstraint(
+            "bucket", "entity", "action", "user_uuid",
+            name="uq_activity_rollups_hourly_key",
+        ),
+        Index("ix_activity_rollups_hourly_user_bucket", "user_uuid", "bucket"),
+    )
+
+
+class ActivityRollupDaily(ActivityRollupMixin, Base):
+    """Daily activity counters by (entity, action, user_uuid)."""
+
+    __tablename__ = "activity_rollups_daily"
+    __table_args__ = (
+        UniqueConstraint(
+            "bucket", "entity", "action", "user_uuid",
+            name="uq_activity_rollups_daily_key",
+        ),
+        Index("ix_activity_rollups_daily_user_bucket", "user_uuid", "bucket"),
+    )
+
+
+class RollupWatermark(Base):
+    """Highest source row id already folded into a rollup pipeline."""
+
+    __tablename__ = "rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    last_id: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=text("CURRENT_TIMESTAMP"),
+        onupdate=text("CURRENT_TIMESTAMP"),
+    )
+
+    def __str__(self) -> str:
+        return f"RollupWatermark(name={self.name}, last_id={self.last_id})"
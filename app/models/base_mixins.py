@@ -1,9 +1,9 @@
 from typing import Any, Dict, Optional
-import uuid as py_uuid
 from sqlalchemy import DateTime, String, BigInteger, text
 from sqlalchemy.sql.sqltypes import Boolean
 from sqlalchemy.orm import mapped_column, Mapped
 from app.core.config import settings
+from app.database.types import UUIDType, uuid7_str
 
 
 class BaseModelMixin:
@@ -79,16 +79,16 @@ def create_base_uuid_model_mixin():
             )
         elif settings.DB_ENGINE == "mysql":
             uuid: Mapped[str] = mapped_column(
-                String(36),
+                UUIDType(),
                 primary_key=True,
-                default=lambda: str(py_uuid.uuid4()),
+                default=uuid7_str,
                 nullable=False,
             )
         else:
             uuid: Mapped[str] = mapped_column(
-                String(36),
+                UUIDType(),
                 primary_key=True,
-                default=lambda: str(py_uuid.uuid4()),
+                default=uuid7_str,
                 nullable=False,
             )
 
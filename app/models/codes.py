@@ -1,7 +1,8 @@
 from datetime import datetime, timedelta, timezone
-from sqlalchemy import String, DateTime, ForeignKey
+from sqlalchemy import String, DateTime, ForeignKey, Index, Integer
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from ..database.base_class import Base
+from ..database.types import UUIDType
 from app.utils.codes import generate_verification_code
 from .base_mixins import BaseIDModelMixin
 from typing import TYPE_CHECKING
@@ -16,6 +17,10 @@ class VerificationCode(BaseIDModelMixin, Base):
     """Stores OTP / Verification codes for users."""
 
     __tablename__ = "verification_codes"
+    __table_args__ = (
+        # Lookup of the live code for (user, type) is a single index range scan
+        Index("ix_verification_codes_user_type_expires", "user_uuid", "type", "expires_at"),
+    )
 
     # 6–8 digit generated code (email verification, password reset, etc.)
     code: Mapped[str] = mapped_column(
@@ -38,9 +43,12 @@ class VerificationCode(BaseIDModelMixin, Base):
         default="confirm_email",
     )
 
+    # Failed verification attempts (code is discarded at OTP_MAX_ATTEMPTS)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
     # Link to User
     user_uuid: Mapped[str] = mapped_column(
-        String(36),
+        UUIDType(),
         ForeignKey("users.uuid"),
         nullable=False,
         index=True,
@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text, text
+from sqlalchemy.orm import Mapped, mapped_column
+from ..database.base_class import Base
+
+
+DEDUPE_KEY_LENGTH = 191
+
+class EmailOutbox(Base):
+    """
+    Transactional outbox for outgoing email. Rows are added in the same
+    transaction as the change that triggers the email and delivered later
+    by the outbox worker.
+
+    status: pending -> sending -> sent, or dead after the last attempt.
+    """
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Claim query: status = 'pending' AND next_attempt_at <= now
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    provider: Mapped[str] = mapped_column(String(20), nullable=False)
+    recipient: Mapped[str] = mapped_column(String(255), nullable=False)
+    subject: Mapped[str] = mapped_column(String(255), nullable=False)
+    body_html: Mapped[str] = mapped_column(Text, nullable=False)
+    body_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=text("CURRENT_TIMESTAMP")
+    )
+    # Lease end of a claimed batch; expired leases are claimed again
+    locked_until: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # Lease token of the claiming worker cycle; results are only settled
+    # while the row still carries it
+    claimed_by: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Idempotency key: a second enqueue with the same key is ignored
+    dedupe_key: Mapped[Optional[str]] = mapped_column(String(DEDUPE_KEY_LENGTH), unique=True, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=text("CURRENT_TIMESTAMP"), nullable=False
+    )
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from ..database.base_class import Base
+from ..database.types import UUIDType
+
+if TYPE_CHECKING:
+    from .meetings import Meeting
+else:
+    Meeting = "Meeting"
+
+
+class MeetingOccurrence(Base):
+    """
+    Materialized occurrences of a recurring meeting, with exceptions
+    applied, for the next few weeks (up to Meeting.materialized_until).
+    Rebuilt whenever the series or one of its exceptions changes; later
+    occurrences are expanded on demand.
+    """
+
+    __tablename__ = "meeting_occurrences"
+    __table_args__ = (
+        UniqueConstraint("meeting_uuid", "original_start", name="uq_meeting_occurrences_meeting_original"),
+        Index("ix_meeting_occurrences_user_starts_at", "user_uuid", "starts_at"),
+        Index("ix_meeting_occurrences_meeting_starts_at", "meeting_uuid", "starts_at"),
+        Index("ix_meeting_occurrences_starts_at", "starts_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    meeting_uuid: Mapped[str] = mapped_column(
+        UUIDType(), ForeignKey("meetings.uuid", ondelete="CASCADE"), nullable=False
+    )
+    # Organizer, copied from the series so per-user range scans need no join
+    user_uuid: Mapped[str] = mapped_column(UUIDType(), ForeignKey("users.uuid", ondelete="CASCADE"), nullable=False)
+    original_start: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    starts_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    ends_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    title: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+
+    def __str__(self) -> str:
+        return f"MeetingOccurrence(meeting={self.meeting_uuid}, starts_at={self.starts_at})"
+
+
+class MeetingOccurrenceOverride(Base):
+    """
+    Exception to one occurrence of a series, identified by its original
+    start (iCalendar RECURRENCE-ID): cancelled, or moved / resized /
+    retitled.
+    """
+
+    __tablename__ = "meeting_occurrence_overrides"
+    __table_args__ = (
+        UniqueConstraint("meeting_uuid", "original_start", name="uq_meeting_occurrence_overrides_meeting_original"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    meeting_uuid: Mapped[str] = mapped_column(
+        UUIDType(), ForeignKey("meetings.uuid", ondelete="CASCADE"), nullable=False
+    )
+    original_start: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    cancelled: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    starts_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    duration: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    title: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+
+    meeting: Mapped["Meeting"] = relationship("Meeting", back_populates="occurrence_overrides")
+
+    def __str__(self) -> str:
+        return f"MeetingOccurrenceOverride(meeting={self.meeting_uuid}, original_start={self.original_start})"
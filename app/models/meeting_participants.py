@@ -0,0 +1,58 @@
+from typing import TYPE_CHECKING, Optional
+from sqlalchemy import BigInteger, ForeignKey, Index, String, UniqueConstraint, update
+from sqlalchemy import event
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from ..database.base_class import Base
+from ..database.types import UUIDType
+from .users import User
+
+if TYPE_CHECKING:
+    from .meetings import Meeting
+else:
+    Meeting = "Meeting"
+
+
+class MeetingParticipant(Base):
+    """
+    One invitee of a meeting, parsed from Meeting.participant. user_uuid is
+    set when the email belongs to a registered user (at write time, or
+    later when that user signs up).
+    """
+
+    __tablename__ = "meeting_participants"
+    __table_args__ = (
+        UniqueConstraint("meeting_uuid", "email", name="uq_meeting_participants_meeting_email"),
+        # Invitee calendar: meetings of one user / one email address
+        Index("ix_meeting_participants_user_meeting", "user_uuid", "meeting_uuid"),
+        Index("ix_meeting_participants_email_meeting", "email", "meeting_uuid"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    meeting_uuid: Mapped[str] = mapped_column(
+        UUIDType(), ForeignKey("meetings.uuid", ondelete="CASCADE"), nullable=False
+    )
+    email: Mapped[str] = mapped_column(String(100), nullable=False)
+    user_uuid: Mapped[Optional[str]] = mapped_column(
+        UUIDType(), ForeignKey("users.uuid", ondelete="SET NULL"), nullable=True
+    )
+
+    meeting: Mapped["Meeting"] = relationship("Meeting", back_populates="participants")
+
+    def __str__(self) -> str:
+        return f"MeetingParticipant(meeting={self.meeting_uuid}, email={self.email})"
+
+
+@event.listens_for(User, "after_insert")
+def link_invitations(mapper, connection, target: User) -> None:
+    """Attach invitations sent before the user registered."""
+    if target.email:
+        connection.execute(
+            update(MeetingParticipant.__table__)
+            .where(
+                MeetingParticipant.__table__.c.email == target.email.lower(),
+                MeetingParticipant.__table__.c.user_uuid.is_(None),
+            )
+            .values(user_uuid=target.uuid)
+        )
@@ -1,19 +1,33 @@
 from datetime import date, datetime, time
-from sqlalchemy import String, ForeignKey, Date, Text, Boolean, Integer, DateTime, Time
+from sqlalchemy import String, ForeignKey, Date, Text, Boolean, Integer, DateTime, Time, Computed, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from ..database.base_class import Base
+from ..database.types import UUIDType
 from .base_mixins import BaseUUIDModelMixin
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from .users import User
+    from .meeting_participants import MeetingParticipant
+    from .meeting_occurrences import MeetingOccurrenceOverride
 else:
     User = "User"
+    MeetingParticipant = "MeetingParticipant"
+    MeetingOccurrenceOverride = "MeetingOccurrenceOverride"
 
 
+# Upper bound on duration; lets range queries bound starts_at on both sides
+MAX_MEETING_DURATION_MINUTES = 24 * 60
+
 
 class Meeting(Base, BaseUUIDModelMixin):
     __tablename__ = "meetings"
+    __table_args__ = (
+        Index("ix_meetings_user_starts_at", "user_uuid", "starts_at"),
+        Index("ix_meetings_starts_at", "starts_at"),
+        # Recurring series of a user; one-off meetings are recurring = 0
+        Index("ix_meetings_recurring_user_starts_at", "recurring", "user_uuid", "starts_at"),
+    )
 
     title: Mapped[str] = mapped_column(String(100), nullable=False)
     scheduled_for: Mapped[date] = mapped_column(Date, nullable=False)
@@ -23,9 +37,35 @@ class Meeting(Base, BaseUUIDModelMixin):
     participant: Mapped[str] = mapped_column(Text, nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
 
-    user_uuid: Mapped[str] = mapped_column(String(36), ForeignKey("users.uuid", ondelete="CASCADE"), nullable=False)
+    # UTC start / end derived by MySQL from the fields above (stored, indexed)
+    starts_at: Mapped[datetime] = mapped_column(
+        DateTime, Computed("TIMESTAMP(scheduled_for, scheduled_at)", persisted=True)
+    )
+    ends_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        Computed("TIMESTAMP(scheduled_for, scheduled_at) + INTERVAL duration MINUTE", persisted=True),
+    )
+
+    # Recurrence: an RRULE subset (see utils.recurrence); starts_at / ends_at
+    # are then the first occurrence. recurrence_until bounds the end of the
+    # last occurrence (NULL: never ends). meeting_occurrences holds the
+    # occurrences whose original start is in [materialized_from,
+    # materialized_until); the rest are expanded on demand.
+    recurrence_rule: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    recurring: Mapped[bool] = mapped_column(Boolean, Computed("recurrence_rule IS NOT NULL", persisted=True))
+    recurrence_until: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    materialized_from: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    materialized_until: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    user_uuid: Mapped[str] = mapped_column(UUIDType(), ForeignKey("users.uuid", ondelete="CASCADE"), nullable=False)
 
     user: Mapped["User"] = relationship("User", back_populates="meetings")
+    participants: Mapped[list["MeetingParticipant"]] = relationship(
+        "MeetingParticipant", back_populates="meeting", cascade="all, delete-orphan", passive_deletes=True
+    )
+    occurrence_overrides: Mapped[list["MeetingOccurrenceOverride"]] = relationship(
+        "MeetingOccurrenceOverride", back_populates="meeting", cascade="all, delete-orphan", passive_deletes=True
+    )
 
 def __str__(self) -> str:
     return f"Meeting(title={self.title}, date={self.scheduled_on}, time={self.scheduled_at})"
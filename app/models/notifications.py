@@ -1,8 +1,9 @@
-from sqlalchemy import Boolean, String, ForeignKey
+from sqlalchemy import Boolean, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import TYPE_CHECKING
 
 from ..database.base_class import Base
+from ..database.types import UUIDType
 from .base_mixins import BaseUUIDModelMixin
 
 if TYPE_CHECKING:
@@ -21,6 +22,6 @@ class NotificationSettings(Base, BaseUUIDModelMixin):
     meeting_reminders: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
  
-    user_uuid: Mapped[str] = mapped_column(String(36), ForeignKey("users.uuid", ondelete="CASCADE"), unique=True, nullable=False)
+    user_uuid: Mapped[str] = mapped_column(UUIDType(), ForeignKey("users.uuid", ondelete="CASCADE"), unique=True, nullable=False)
 
     user: Mapped["User"] = relationship("User", back_populates="notification_settings")
@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING, Optional
-from sqlalchemy import String
+from sqlalchemy import Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..database.base_class import Base
@@ -24,6 +24,9 @@ class Permission(Base, BaseUUIDModelMixin):
         String(2), default="I", nullable=False
     )  
 
+    # Stable position of this permission in per-user permission bitsets
+    bit_index: Mapped[Optional[int]] = mapped_column(Integer, unique=True, nullable=True)
+
     # Relationships
     role_permissions: Mapped[list["RolePermission"]] = relationship(
         "RolePermission", back_populates="permission"
@@ -3,6 +3,7 @@ from sqlalchemy.orm import relationship, Mapped, mapped_column
 from typing import TYPE_CHECKING
 
 from ..database.base_class import Base
+from ..database.types import UUIDType
 from .base_mixins import BaseUUIDModelMixin
 
 if TYPE_CHECKING:
@@ -17,7 +18,7 @@ class Profile(Base, BaseUUIDModelMixin):
     email: Mapped[str] = mapped_column(String(100), nullable= False)
     department: Mapped[str] = mapped_column(String(100), nullable=True)
     bio: Mapped[str] = mapped_column(Text, nullable=True)    
-    user_uuid: Mapped[str] = mapped_column(String(36), ForeignKey("users.uuid", ondelete="CASCADE"), unique=True, nullable=False)
+    user_uuid: Mapped[str] = mapped_column(UUIDType(), ForeignKey("users.uuid", ondelete="CASCADE"), unique=True, nullable=False)
 
     users: Mapped["User"] = relationship("User", back_populates="profile")
 
@@ -1,8 +1,9 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..database.base_class import Base
+from ..database.types import UUIDType
 from .base_mixins import BaseUUIDModelMixin
 
 if TYPE_CHECKING:
@@ -17,8 +18,8 @@ class RolePermission(Base, BaseUUIDModelMixin):
     __tablename__ = "role_permissions"
 
     # Foreign keys
-    role_uuid: Mapped[str] = mapped_column(String(36), ForeignKey("roles.uuid"), nullable=False, index=True)
-    permission_uuid: Mapped[str] = mapped_column(String(36), ForeignKey("permissions.uuid"), nullable=False, index=True)
+    role_uuid: Mapped[str] = mapped_column(UUIDType(), ForeignKey("roles.uuid"), nullable=False, index=True)
+    permission_uuid: Mapped[str] = mapped_column(UUIDType(), ForeignKey("permissions.uuid"), nullable=False, index=True)
 
     # Relationships
     role: Mapped["Role"] = relationship(
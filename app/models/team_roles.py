@@ -1,10 +1,10 @@
-import uuid
 from datetime import datetime
 
 from sqlalchemy import String, Text, DateTime, ForeignKey, Table, Column
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..database.base_class import Base
+from ..database.types import UUIDType, uuid7_str
 from .base_mixins import BaseUUIDModelMixin
 
 
@@ -13,8 +13,8 @@ from .base_mixins import BaseUUIDModelMixin
 team_members_table = Table(
     "team_members",
     Base.metadata,
-    Column("user_uuid", String(36), ForeignKey("users.uuid", ondelete="CASCADE")),
-    Column("role_id", String(36), ForeignKey("teamroles.id", ondelete="CASCADE")),
+    Column("user_uuid", UUIDType(), ForeignKey("users.uuid", ondelete="CASCADE")),
+    Column("role_id", UUIDType(), ForeignKey("teamroles.id", ondelete="CASCADE")),
 )
 
 
@@ -22,7 +22,7 @@ class TeamRole(Base):
     __tablename__ = "teamroles"
 
     id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
+        UUIDType(), primary_key=True, default=uuid7_str
     )
 
     name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
@@ -42,11 +42,11 @@ class TeamInvite(Base, BaseUUIDModelMixin):
     __tablename__ = "teaminvites"
 
     email: Mapped[str] = mapped_column(String(120), nullable=False, index=True)
-    role_id: Mapped[str] = mapped_column(String(36), ForeignKey("teamroles.id", ondelete="SET NULL"))
+    role_id: Mapped[str] = mapped_column(UUIDType(), ForeignKey("teamroles.id", ondelete="SET NULL"))
     role = relationship("TeamRole")
 
     # The user who sent the invitation
-    invited_by_uuid: Mapped[str] = mapped_column(String(36), ForeignKey("users.uuid", ondelete="SET NULL"))
+    invited_by_uuid: Mapped[str] = mapped_column(UUIDType(), ForeignKey("users.uuid", ondelete="SET NULL"))
     invited_by = relationship("User", foreign_keys=[invited_by_uuid])
 
     # Invitation status
@@ -1,8 +1,9 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..database.base_class import Base
+from ..database.types import UUIDType
 from .base_mixins import BaseUUIDModelMixin
 
 if TYPE_CHECKING:
@@ -17,8 +18,8 @@ class UserRole(Base, BaseUUIDModelMixin):
     __tablename__ = "user_roles"
 
     # Foreign keys
-    role_uuid: Mapped[str] = mapped_column(String(36), ForeignKey("roles.uuid"), index=True, nullable=False)
-    user_uuid: Mapped[str] = mapped_column(String(36), ForeignKey("users.uuid"), index=True, nullable=False)
+    role_uuid: Mapped[str] = mapped_column(UUIDType(), ForeignKey("roles.uuid"), index=True, nullable=False)
+    user_uuid: Mapped[str] = mapped_column(UUIDType(), ForeignKey("users.uuid"), index=True, nullable=False)
 
     # Relationships
     role: Mapped["Role"] = relationship(
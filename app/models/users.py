@@ -43,6 +43,9 @@ class User(Base, BaseUUIDModelMixin, SoftDeleteMixin):
     is_active: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[Optional[DateTime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
+    # Mixed into the calendar feed token; replaced to revoke a feed URL
+    calendar_feed_salt: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+
     # Relationships
     verification_codes: Mapped[list["VerificationCode"]] = relationship("VerificationCode", back_populates="user")
     user_roles: Mapped[list["UserRole"]] = relationship("UserRole", back_populates="user", overlaps="roles")
@@ -0,0 +1,38 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, ConfigDict
+from .base_schema import BaseResponseSchema
+
+
+class ActivityRollupSchema(BaseModel):
+    bucket: datetime = Field(..., description="Start of the hour or day this counter covers (UTC)")
+    entity: str = Field(..., description="The type of entity affected, e.g., 'Meeting'")
+    action: str = Field(..., description="Type of action performed, e.g., 'create'")
+    count: int = Field(..., description="Number of actions in the bucket")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ActiveUserSchema(BaseModel):
+    user_uuid: str = Field(..., description="UUID of the user")
+    count: int = Field(..., description="Number of actions performed in the window")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ActivityRollupListResponseSchema(BaseResponseSchema):
+    data: Optional[List[ActivityRollupSchema]] = None
+
+
+class ActiveUserListResponseSchema(BaseResponseSchema):
+    data: Optional[List[ActiveUserSchema]] = None
+
+
+class ActivityRollupFilters(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    start_date: datetime = Field(..., description="Include buckets starting from this date")
+    end_date: datetime = Field(..., description="Include buckets before this date")
+    granularity: Literal["hour", "day"] = Field("day", description="Bucket size of the counters")
+    entity: Optional[str] = Field(None, description="Filter counters by entity type")
+    action: Optional[str] = Field(None, description="Filter counters by action type")
+    limit: Optional[int] = Field(10, ge=1, le=100, description="Maximum number of users for top-user charts")
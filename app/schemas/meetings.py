@@ -1,8 +1,11 @@
 from datetime import date, time, datetime
 from typing import Optional, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from .base_schema import BaseUUIDSchema, BaseResponseSchema, BaseTotalCountResponseSchema, BaseSchema
 from .base_filters import BaseFilters
+from ..models.meetings import MAX_MEETING_DURATION_MINUTES
+from ..utils.recurrence import RecurrenceRule
+from ..utils.responses import bad_request_response
 
 
 
@@ -12,11 +15,23 @@ class MeetingBaseSchema(BaseModel):
     title: str = Field(..., description="Title of the meeting")
     scheduled_for: date = Field(..., description="Date when the meeting is scheduled")
     scheduled_at: time = Field(..., description="Time when the meeting is scheduled")
-    duration: int = Field(..., description="Duration of the meeting in minutes")
+    duration: int = Field(..., gt=0, le=MAX_MEETING_DURATION_MINUTES, description="Duration of the meeting in minutes")
     platform: str = Field(..., description="Platform used for the meeting (e.g., Zoom, Teams)")
     participant: str = Field(..., description="Participants of the meeting, usually comma-separated emails or names")
     description: str = Field(..., description="Description or agenda of the meeting")
     user_uuid: str = Field(..., description="UUID of the user who created the meeting")
+    recurrence_rule: Optional[str] = Field(
+        None, description="Recurrence as an RRULE subset, e.g. FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10"
+    )
+
+    @field_validator("recurrence_rule")
+    def validate_recurrence_rule(cls, value):
+        if not value:
+            return None
+        try:
+            return str(RecurrenceRule.parse(value))
+        except ValueError as exc:
+            return bad_request_response(f"Invalid recurrence rule: {exc}")
 
 
 class MeetingCreateSchema(MeetingBaseSchema):
@@ -28,7 +43,26 @@ class MeetingUpdateSchema(MeetingBaseSchema):
 
 
 class MeetingSchema(MeetingBaseSchema, BaseUUIDSchema):
-    pass
+    starts_at: Optional[datetime] = Field(None, description="Start of the meeting (UTC)")
+    ends_at: Optional[datetime] = Field(None, description="End of the meeting (UTC)")
+    recurrence_until: Optional[datetime] = Field(None, description="End of the last occurrence (UTC); empty if the series never ends")
+
+
+class MeetingOccurrenceSchema(BaseModel):
+    meeting_uuid: str = Field(..., description="UUID of the meeting (the series for recurring meetings)")
+    user_uuid: str = Field(..., description="UUID of the organizer")
+    title: str = Field(..., description="Title of this occurrence")
+    starts_at: datetime = Field(..., description="Start of this occurrence (UTC)")
+    ends_at: datetime = Field(..., description="End of this occurrence (UTC)")
+    original_start: Optional[datetime] = Field(None, description="Unmoved start of a recurring occurrence (RECURRENCE-ID)")
+
+
+class MeetingOccurrenceOverrideSchema(BaseModel):
+    original_start: datetime = Field(..., description="Start of the occurrence as generated by the rule (UTC)")
+    cancelled: bool = Field(False, description="Cancel this occurrence")
+    starts_at: Optional[datetime] = Field(None, description="New start (UTC)")
+    duration: Optional[int] = Field(None, gt=0, le=MAX_MEETING_DURATION_MINUTES, description="New duration in minutes")
+    title: Optional[str] = Field(None, description="New title for this occurrence")
 
 
 class MeetingResponseSchema(BaseResponseSchema):
@@ -43,6 +77,14 @@ class MeetingTotalCountListResponseSchema(BaseTotalCountResponseSchema):
     data: Optional[List[MeetingSchema]] = None
 
 
+class CalendarFeedURLSchema(BaseModel):
+    url: str = Field(..., description="Subscription URL of the user's iCalendar feed")
+
+
+class CalendarFeedURLResponseSchema(BaseResponseSchema):
+    data: Optional[CalendarFeedURLSchema] = None
+
+
 class MeetingFilters(BaseFilters):
     title: Optional[str] = Field(None, description="Filter by meeting title")
     scheduled_for: Optional[date] = Field(None, description="Filter by scheduled date")
@@ -51,3 +93,6 @@ class MeetingFilters(BaseFilters):
     platform: Optional[str] = Field(None, description="Filter by meeting platform")
     participant: Optional[str] = Field(None, description="Filter by participants")
     user_uuid: Optional[str] = Field(None, description="Filter by UUID of the user who created the meeting")
+    # Meetings overlapping [time_from, time_to) (UTC); either bound may be omitted
+    time_from: Optional[datetime] = Field(None, description="Only meetings ending after this time (UTC)")
+    time_to: Optional[datetime] = Field(None, description="Only meetings starting before this time (UTC)")
@@ -20,7 +20,7 @@ class PermissionUpdateSchema(PermissionBaseSchema):
 
 
 class PermissionSchema(PermissionBaseSchema, BaseUUIDSchema):
-    pass
+    bit_index: Optional[int] = Field(None, description="Position of the permission in resolved permission bitsets")
 
 
 class PermissionResponseSchema(BaseResponseSchema):
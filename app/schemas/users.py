@@ -1,6 +1,5 @@
 from datetime import date, datetime
 from typing import List, Optional, Literal, Annotated
-import dns.resolver
 from pydantic import BaseModel, EmailStr, Field, constr, field_validator
 from .base_schema import BaseResponseSchema, BaseUUIDSchema, BaseTotalCountResponseSchema
 from .validate_uuid import UUIDStr
@@ -30,18 +29,13 @@ class UserBaseSchema(BaseModel):
 
 
 class EmailValidationSchema(BaseModel):
-    email: EmailStr = Field(..., description="Email to validate")
+    """
+    Syntax only. The MX check is async and runs as a route dependency
+    (`require_email_domain` in app.core.email_domains), so validation
+    never blocks the event loop on DNS.
+    """
 
-    @field_validator("email")
-    def validate_email(cls, value):
-        domain = value.split("@")[1]
-        try:
-            answers = dns.resolver.resolve(domain, "MX")
-            if not answers:
-                return bad_request_response(f"Email domain {domain} has no MX records")
-        except Exception:
-            return bad_request_response(f"Email domain {domain} has no MX records")
-        return value
+    email: EmailStr = Field(..., description="Email to validate")
 
 
 class SendVerificationEmailSchema(EmailValidationSchema):
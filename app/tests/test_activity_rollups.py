@@ -0,0 +1,31 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.cruds.activity_rollups import activity_rollup_crud, day_bucket, hour_bucket
+
+
+def test_buckets_convert_aware_values_to_utc():
+    value = datetime(2024, 3, 1, 0, 30, tzinfo=timezone(timedelta(hours=2)))
+    assert hour_bucket(value) == datetime(2024, 2, 29, 22)
+    assert day_bucket(value) == datetime(2024, 2, 29)
+    assert hour_bucket(datetime(2024, 3, 1, 0, 30)) == datetime(2024, 3, 1, 0)
+
+
+def test_aggregate_counts_per_bucket():
+    created = datetime(2024, 3, 1, 10, 5, tzinfo=timezone.utc)
+    counters = activity_rollup_crud.aggregate([
+        (created, "Meeting", "create", "u1"),
+        (created + timedelta(minutes=10), "Meeting", "create", "u1"),
+        (created + timedelta(hours=1), "Meeting", "create", None),
+    ])
+    assert counters["hour"][(datetime(2024, 3, 1, 10), "Meeting", "create", "u1")] == 2
+    assert counters["day"][(datetime(2024, 3, 1), "Meeting", "create", "")] == 1
+
+
+def test_catch_up_refuses_unbounded_run_in_inline_mode(monkeypatch):
+    monkeypatch.setattr(settings, "ACTIVITY_ROLLUP_INLINE", True)
+    with pytest.raises(ValueError, match="until_id"):
+        asyncio.run(activity_rollup_crud.catch_up(db=None))
@@ -0,0 +1,23 @@
+import asyncio
+
+import pytest
+
+from app.core.activity_stream import activity_stream_hub, is_stream_id
+
+
+@pytest.mark.parametrize("value", ["1700000000000-0", "1700000000000", "0-1"])
+def test_stream_ids_are_accepted(value):
+    assert is_stream_id(value)
+
+
+@pytest.mark.parametrize("value", ["", "-", "+", "(1-0", "1-", "1-0\n", "1-0-0", "$"])
+def test_other_values_are_rejected(value):
+    assert not is_stream_id(value)
+
+
+def test_tail_rejects_invalid_last_event_id():
+    async def first():
+        return await activity_stream_hub.tail({}, "(0").__anext__()
+
+    with pytest.raises(ValueError):
+        asyncio.run(first())
@@ -0,0 +1,64 @@
+import asyncio
+
+from app.core.email_domains import MXChecker, StaticMXResolver
+
+
+def _checker(resolver, **kwargs):
+    return MXChecker(resolver=resolver, allowlist={"gmail.com"}, use_redis=False, **kwargs)
+
+
+def test_allowlisted_domain_skips_lookup():
+    resolver = StaticMXResolver({})
+    checker = _checker(resolver)
+    assert asyncio.run(checker.check_email("someone@Gmail.com"))
+    assert resolver.calls == 0
+
+
+def test_positive_and_negative_answers_are_cached():
+    resolver = StaticMXResolver({"example.com": True})
+    checker = _checker(resolver)
+
+    async def check():
+        return [await checker.has_mx(domain) for domain in ("example.com", "nomx.test", "example.com", "nomx.test")]
+
+    assert asyncio.run(check()) == [True, False, True, False]
+    assert resolver.calls == 2
+
+
+def test_timeout_fails_open_and_is_not_cached():
+    resolver = StaticMXResolver({}, delay=0.2)
+    checker = _checker(resolver, timeout=0.01)
+
+    async def check():
+        return [await checker.has_mx("slow.test"), await checker.has_mx("slow.test")]
+
+    assert asyncio.run(check()) == [True, True]
+    assert resolver.calls == 2
+
+
+def test_concurrent_callers_share_one_lookup():
+    resolver = StaticMXResolver({"example.com": True}, delay=0.05)
+    checker = _checker(resolver)
+
+    async def check():
+        return await asyncio.gather(*[checker.has_mx("example.com") for _ in range(20)])
+
+    assert asyncio.run(check()) == [True] * 20
+    assert resolver.calls == 1
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    resolver = StaticMXResolver({"example.com": True}, delay=0.05)
+    checker = _checker(resolver)
+
+    async def check():
+        first = asyncio.create_task(checker.has_mx("example.com"))
+        second = asyncio.create_task(checker.has_mx("example.com"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await asyncio.gather(first, second, return_exceptions=True)
+
+    first, second = asyncio.run(check())
+    assert isinstance(first, asyncio.CancelledError)
+    assert second is True
+    assert resolver.calls == 1
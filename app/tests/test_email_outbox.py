@@ -0,0 +1,155 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import DeclarativeBase, Session
+
+from app.core import email_outbox
+from app.core.email_outbox import EmailOutboxWorker
+from app.core.mailer import LocalSMTPServer, MemorySender, SMTPSender
+from app.cruds.email_outbox import CRUDEmailOutbox
+from app.models import email_outbox as models
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+# Mapped apart from the app's models, whose relationships need every model imported
+class EmailOutbox(_Base):
+    __table__ = models.EmailOutbox.__table__.to_metadata(_Base.metadata)
+
+
+email_outbox_crud = CRUDEmailOutbox(EmailOutbox)
+
+
+@pytest.fixture(autouse=True)
+def _crud(monkeypatch):
+    monkeypatch.setattr(email_outbox, "email_outbox_crud", email_outbox_crud)
+
+
+class SQLiteSession:
+    """Just enough AsyncSession over a synchronous SQLite session for the outbox CRUD."""
+
+    def __init__(self, engine):
+        self.session = Session(engine)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.session.close()
+
+    def add(self, obj):
+        self.session.add(obj)
+
+    async def execute(self, statement, params=None):
+        return self.session.execute(statement, params)
+
+    async def commit(self):
+        self.session.commit()
+
+
+def _outbox(*recipients):
+    engine = create_engine("sqlite://")
+    EmailOutbox.__table__.create(engine)
+    with Session(engine) as session:
+        # BIGINT keys do not autoincrement on SQLite
+        for id, recipient in enumerate(recipients, 1):
+            session.add(EmailOutbox(
+                id=id, provider="memory", recipient=recipient, subject="Hi", body_html="<p>Hi</p>",
+                status="pending", attempts=0, next_attempt_at=datetime.utcnow() - timedelta(seconds=1),
+            ))
+        session.commit()
+    return engine
+
+
+def _rows(engine):
+    with Session(engine) as session:
+        return {row.recipient: row for row in session.execute(select(EmailOutbox)).scalars()}
+
+
+def _worker(engine, sender, **kwargs):
+    return EmailOutboxWorker(
+        sender_factory=lambda provider: sender, session_factory=lambda: SQLiteSession(engine), **kwargs
+    )
+
+
+def test_claimed_rows_are_sent():
+    engine = _outbox("a@example.com", "b@example.com")
+    sender = MemorySender()
+    assert asyncio.run(_worker(engine, sender).run_once()) == 2
+
+    rows = _rows(engine)
+    assert {row.status for row in rows.values()} == {"sent"}
+    assert {row.claimed_by for row in rows.values()} == {None}
+    assert sorted(message.recipient for message in sender.sent) == ["a@example.com", "b@example.com"]
+
+
+def test_failures_are_retried_then_dead_lettered():
+    engine = _outbox("ok@example.com", "bad@example.com")
+    worker = _worker(engine, MemorySender(fail_recipients={"bad@example.com"}), max_attempts=2)
+
+    asyncio.run(worker.run_once())
+    bad = _rows(engine)["bad@example.com"]
+    assert (bad.status, bad.attempts, bad.last_error) == ("pending", 1, "rejected")
+    assert bad.next_attempt_at > datetime.utcnow()
+
+    with Session(engine) as session:
+        session.execute(update(EmailOutbox).values(next_attempt_at=datetime.utcnow() - timedelta(seconds=1)))
+        session.commit()
+    asyncio.run(worker.run_once())
+    assert _rows(engine)["bad@example.com"].status == "dead"
+    assert _rows(engine)["ok@example.com"].status == "sent"
+    assert worker.stats == {"sent": 1, "failed": 2, "dead": 1}
+
+
+def test_results_of_a_lost_lease_are_not_settled():
+    engine = _outbox("a@example.com")
+
+    async def run():
+        async with SQLiteSession(engine) as db:
+            batches, _ = await email_outbox_crud.claim(db, "first", 10, 60, 8)
+        with Session(engine) as session:
+            # The lease expired and another worker claimed the row
+            session.execute(update(EmailOutbox).values(claimed_by="second"))
+            session.commit()
+        async with SQLiteSession(engine) as db:
+            settled = await email_outbox_crud.mark_sent(db, [batches["memory"][0].id], "first")
+            dead = await email_outbox_crud.mark_failed(db, {batches["memory"][0].id: "late"}, "first", 1, 30)
+            await db.commit()
+        return settled, dead
+
+    assert asyncio.run(run()) == (0, 0)
+    row = _rows(engine)["a@example.com"]
+    assert (row.status, row.claimed_by, row.last_error) == ("sending", "second", None)
+
+
+def test_sender_that_cannot_be_created_fails_its_rows():
+    engine = _outbox("a@example.com")
+
+    def broken(provider):
+        raise RuntimeError("missing credentials")
+
+    worker = EmailOutboxWorker(sender_factory=broken, session_factory=lambda: SQLiteSession(engine))
+    assert asyncio.run(worker.run_once()) == 1
+    row = _rows(engine)["a@example.com"]
+    assert (row.status, row.last_error) == ("pending", "sender: missing credentials")
+
+
+def test_delivery_through_local_smtp_server():
+    engine = _outbox("a@example.com", "b@example.com", "c@example.com")
+
+    async def run():
+        server = LocalSMTPServer(port=0)
+        await server.start()
+        sender = SMTPSender(host=server.host, port=server.port, from_addr="outbox@automeet.local", start_tls=False)
+        try:
+            await _worker(engine, sender).run_once()
+        finally:
+            await server.stop()
+        return server.received
+
+    assert asyncio.run(run()) == 3
+    assert {row.status for row in _rows(engine).values()} == {"sent"}
@@ -0,0 +1,102 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Integer, String
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from app.utils.generate_slugs import save_with_unique_slug
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class Thing(_Base):
+    __tablename__ = "things"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    slug: Mapped[str] = mapped_column(String(255), index=True, unique=True)
+
+
+def _duplicate(slug: str) -> IntegrityError:
+    return IntegrityError("INSERT", {}, Exception(1062, f"Duplicate entry '{slug}' for key 'things.ix_things_slug'"))
+
+
+class RepeatableReadSession:
+    """
+    Plays one transaction under REPEATABLE READ: plain reads see the
+    snapshot taken at the first read, locking reads see committed rows.
+    A concurrent writer commits each slug in `races` just before the
+    flush that would use it.
+    """
+
+    def __init__(self, committed, races=()):
+        self.committed = set(committed)
+        self.snapshot = None
+        self.races = set(races)
+        self.flushed = []
+        self.locking_reads = 0
+
+    def _highest(self, slugs, base):
+        suffixes = [0 if slug == base else int(slug[len(base) + 1:]) for slug in slugs
+                    if slug == base or (slug.startswith(base + "-") and slug[len(base) + 1:].isdigit())]
+        return max(suffixes, default=None)
+
+    async def execute(self, query):
+        if self.snapshot is None:
+            self.snapshot = set(self.committed)
+        locking = query._for_update_arg is not None
+        self.locking_reads += locking
+        rows = self.committed if locking else self.snapshot
+        return SimpleNamespace(scalar=lambda: self._highest(rows, "team-sync"))
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+    def add(self, obj):
+        self.obj = obj
+
+    async def flush(self):
+        slug = self.obj.slug
+        if slug in self.races:
+            self.races.discard(slug)
+            self.committed.add(slug)
+        if slug in self.committed:
+            raise _duplicate(slug)
+        self.committed.add(slug)
+        self.flushed.append(slug)
+
+
+def _save(db, attempts=5):
+    crud = SimpleNamespace(model=Thing)
+    return asyncio.run(save_with_unique_slug(db, crud, Thing(), "Team Sync", attempts=attempts))
+
+
+def test_first_free_suffix():
+    db = RepeatableReadSession({"team-sync", "team-sync-1", "team-sync-review"})
+    assert _save(db).slug == "team-sync-2"
+    assert db.locking_reads == 0
+
+
+def test_retry_moves_past_a_concurrent_winner():
+    db = RepeatableReadSession({"team-sync"}, races={"team-sync-1", "team-sync-2"})
+    assert _save(db).slug == "team-sync-3"
+    assert db.locking_reads == 2
+
+
+def test_other_integrity_errors_propagate():
+    class ForeignKeySession(RepeatableReadSession):
+        async def flush(self):
+            raise IntegrityError("INSERT", {}, Exception(1452, "Cannot add or update a child row"))
+
+    with pytest.raises(IntegrityError):
+        _save(ForeignKeySession(set()))
+
+
+def test_gives_up_after_attempts():
+    db = RepeatableReadSession(set(), races={"team-sync", "team-sync-1"})
+    with pytest.raises(ValueError):
+        _save(db, attempts=2)
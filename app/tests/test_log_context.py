@@ -0,0 +1,22 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.log_context import LogContextMiddleware, get_log_context
+
+
+def test_route_is_the_matched_template():
+    seen = {}
+    app = FastAPI()
+    app.add_middleware(LogContextMiddleware)
+
+    @app.get("/meetings/{meeting_uuid}")
+    async def meeting(meeting_uuid: str):
+        seen["context"] = get_log_context()
+        return {}
+
+    with TestClient(app) as client:
+        client.get("/meetings/0b7d", headers={"X-Request-ID": "req-1"})
+
+    assert seen["context"]["request_id"] == "req-1"
+    assert seen["context"]["route"] == "GET /meetings/{meeting_uuid}"
+    assert seen["context"]["status"] == 200
@@ -0,0 +1,96 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.log_search import LogSearchError, SQLiteLogSearchClient, build_search_params, compile_filter
+
+
+@pytest.fixture
+def index():
+    index = SQLiteLogSearchClient(":memory:").index("logs")
+    index.add_documents([
+        {"id": "1", "timestamp": 100, "level": "ERROR", "logger": "database", "message": "deadlock found"},
+        {"id": "2", "timestamp": 200, "level": "WARNING", "logger": "app", "message": "slow request"},
+        {"id": "3", "timestamp": 300, "level": "WARNING", "logger": "database", "message": "slow query"},
+        {"id": "4", "timestamp": 400, "level": "INFO", "logger": "app", "message": "user signed in", "user_uuid": "u1"},
+    ])
+    return index
+
+
+def ids(result):
+    return sorted(hit["id"] for hit in result["hits"])
+
+
+def test_and_binds_tighter_than_or(index):
+    result = index.search("", {"filter": "level = ERROR OR level = WARNING AND logger = app"})
+    assert ids(result) == ["1", "2"]
+
+
+def test_parenthesised_groups(index):
+    result = index.search("", {"filter": "(level = ERROR AND logger = database) OR level = INFO"})
+    assert ids(result) == ["1", "4"]
+    result = index.search("", {"filter": "(level = ERROR OR level = WARNING) AND logger = database"})
+    assert ids(result) == ["1", "3"]
+    result = index.search("", {"filter": "logger = app AND (level = INFO OR (level = WARNING AND timestamp < 300))"})
+    assert ids(result) == ["2", "4"]
+
+
+def test_not_in_and_ranges(index):
+    assert ids(index.search("", {"filter": "NOT level IN [ERROR, WARNING]"})) == ["4"]
+    assert ids(index.search("", {"filter": "level NOT IN [ERROR, INFO]"})) == ["2", "3"]
+    assert ids(index.search("", {"filter": "timestamp 150 TO 300"})) == ["2", "3"]
+    # Documents without the field match a negation, as in Meilisearch
+    assert ids(index.search("", {"filter": "user_uuid != u1"})) == ["1", "2", "3"]
+
+
+def test_array_filter_is_and_of_or(index):
+    result = index.search("", {"filter": [["level = ERROR", "level = INFO"], "logger = app"]})
+    assert ids(result) == ["4"]
+
+
+def test_quoted_values():
+    assert compile_filter('logger = "my \\"app\\""') == ("logger = ?", ['my "app"'])
+
+
+@pytest.mark.parametrize("expression", [
+    "level = ",
+    "(level = ERROR",
+    "level = ERROR)",
+    "level = ERROR logger = app",
+    "level IN [ERROR",
+])
+def test_malformed_filters_are_rejected(expression):
+    with pytest.raises(LogSearchError):
+        compile_filter(expression)
+
+
+def test_unknown_attribute_is_rejected():
+    with pytest.raises(LogSearchError, match="not filterable"):
+        compile_filter("action = login")
+
+
+def test_build_search_params_maps_filters(index):
+    filters = SimpleNamespace(
+        skip=0, limit=10, sort="timestamp:asc", search="slow",
+        start_date=datetime.fromtimestamp(150, tz=timezone.utc), end_date=None,
+        logger="database", user_uuid=None,
+    )
+    query, params = build_search_params(filters)
+    assert ids(index.search(query, params)) == ["3"]
+
+    query, params = build_search_params(SimpleNamespace(user_uuid="u1", sort=None))
+    assert ids(index.search(query, params)) == ["4"]
+
+
+def test_build_search_params_rejects_unsupported_filters():
+    with pytest.raises(LogSearchError, match="action, entity"):
+        build_search_params(SimpleNamespace(user_uuid="u1", action="login", entity="meeting", sort=None))
+
+
+def test_readding_a_document_replaces_its_search_tokens(index):
+    index.add_documents([{"id": "3", "timestamp": 300, "level": "WARNING", "logger": "database", "message": "lock timeout"}])
+    assert ids(index.search("slow")) == ["2"]
+    assert ids(index.search("lock")) == ["3"]
+    fts_rows = index.client.reader().execute("SELECT COUNT(*) FROM logs_fts WHERE logs_fts MATCH 'query'").fetchone()
+    assert fts_rows == (0,)
@@ -0,0 +1,40 @@
+import logging
+import os
+import time
+
+from app.core.loggers import TimedRotatingFileHandlerWithSize
+
+
+def _handler(tmp_path, **kwargs):
+    handler = TimedRotatingFileHandlerWithSize(str(tmp_path / "app.log"), compress=False, **kwargs)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    return handler
+
+
+def _emit(handler, message="x" * 20):
+    handler.emit(logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None))
+
+
+def test_size_rollover_keeps_the_time_rollover(tmp_path):
+    handler = _handler(tmp_path, when="H", maxBytes=50)
+    # Ten minutes into the hour
+    rollover_at = handler.rolloverAt = int(time.time()) + 3000
+    for _ in range(10):
+        _emit(handler)
+    handler.close()
+
+    assert handler.rolloverAt == rollover_at
+    rotated = sorted(name for name in os.listdir(tmp_path) if name != "app.log")
+    assert len(rotated) == 3
+    assert rotated[0] + ".1" in rotated and rotated[0] + ".2" in rotated
+
+
+def test_time_rollover_moves_to_the_next_period(tmp_path):
+    handler = _handler(tmp_path, when="H")
+    _emit(handler)
+    handler.rolloverAt = int(time.time()) - 1
+    _emit(handler)
+    handler.close()
+
+    assert handler.rolloverAt > time.time()
+    assert len(os.listdir(tmp_path)) == 2
@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+from app.core import notifications
+from app.core.notifications import WS_CLOSE_POLICY_VIOLATION, NotificationHub
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.closed = asyncio.Event()
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def receive(self):
+        await self.closed.wait()
+        return {"type": "websocket.disconnect"}
+
+    async def send_text(self, text):
+        pass
+
+    async def close(self, code=1000, reason=""):
+        self.close_code = code
+        self.closed.set()
+
+
+def _serve(claims, **kwargs):
+    hub = NotificationHub(channel="test", **kwargs)
+    websocket = FakeWebSocket()
+
+    async def run():
+        await asyncio.wait_for(hub.serve(websocket, "u1", claims), timeout=2)
+
+    asyncio.run(run())
+    return hub, websocket
+
+
+def test_socket_is_closed_when_the_token_expires():
+    hub, websocket = _serve({"sub": "u1", "exp": time.time() + 0.05})
+    assert websocket.close_code == WS_CLOSE_POLICY_VIOLATION
+    assert hub.stats["auth_closed"] == 1
+    assert hub.connection_count == 0
+
+
+def test_socket_is_closed_when_the_token_is_revoked(monkeypatch):
+    checks = []
+
+    async def is_revoked(claims):
+        checks.append(claims["jti"])
+        return len(checks) >= 2
+
+    monkeypatch.setattr(notifications.revocation_list, "is_revoked", is_revoked)
+    _, websocket = _serve({"sub": "u1", "jti": "t1", "exp": time.time() + 60}, auth_recheck_interval=0.02)
+    assert websocket.close_code == WS_CLOSE_POLICY_VIOLATION
+    assert checks == ["t1", "t1"]
+
+
+def test_malformed_recipient_lists_are_dropped():
+    hub = NotificationHub(channel="test")
+    assert hub.deliver('{"event": {"kind": "x"}}') == 0
+    assert hub.deliver('{"event": {"kind": "x"}, "users": 5}') == 0
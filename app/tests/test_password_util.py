@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+from app.core.config import settings
+from app.utils import password_util
+from app.utils.password_util import UnknownUserCache, averify_password, calibrate_bcrypt_rounds
+
+# Cheapest bcrypt cost, so the tests time the pool and not the hash
+_HASH = password_util.pwd_context.handler("bcrypt").using(rounds=4).hash("correct horse")
+
+
+def _verify_many(count):
+    async def run():
+        return await asyncio.gather(*[averify_password("correct horse", _HASH) for _ in range(count)])
+
+    return asyncio.run(run())
+
+
+def test_pool_caps_callers_on_every_event_loop(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 1)
+    calls = password_util.hash_metrics.calls
+    # A second loop must not reuse the first loop's semaphore
+    assert _verify_many(4) == [True] * 4
+    assert _verify_many(4) == [True] * 4
+    assert password_util.hash_metrics.calls == calls + 8
+    assert password_util.hash_metrics.in_flight == 0
+
+
+def test_calibration_stays_within_bounds():
+    rounds, seconds = calibrate_bcrypt_rounds(0, min_rounds=4, max_rounds=8)
+    assert rounds == 4 and seconds > 0
+    rounds, _ = calibrate_bcrypt_rounds(10 ** 9, min_rounds=4, max_rounds=8)
+    assert rounds == 8
+
+
+def test_unknown_user_cache_normalizes_and_expires(monkeypatch):
+    cache = UnknownUserCache(max_size=10, ttl=60)
+    cache.add(" Someone@Example.com")
+    assert "someone@example.com" in cache
+
+    now = time.monotonic()
+    monkeypatch.setattr(password_util.time, "monotonic", lambda: now + 61)
+    assert "someone@example.com" not in cache
+
+
+def test_unknown_user_cache_evicts_least_recent():
+    cache = UnknownUserCache(max_size=2, ttl=60)
+    cache.add("a")
+    cache.add("b")
+    cache.add("a")
+    cache.add("c")
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    cache.discard("a")
+    assert "a" not in cache
@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.core.rate_limit import client_ip
+
+
+def _request(forwarded=None, peer="10.0.0.2"):
+    headers = {"x-forwarded-for": forwarded} if forwarded is not None else {}
+    return SimpleNamespace(headers=headers, client=SimpleNamespace(host=peer))
+
+
+@pytest.fixture
+def behind_proxies(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_FORWARDED", True)
+    return lambda count: monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", count)
+
+
+def test_forwarded_header_is_ignored_unless_trusted():
+    assert client_ip(_request("1.2.3.4")) == "10.0.0.2"
+
+
+def test_spoofed_entries_left_of_the_proxy_are_ignored(behind_proxies):
+    behind_proxies(1)
+    assert client_ip(_request("6.6.6.6, 203.0.113.7")) == "203.0.113.7"
+    behind_proxies(2)
+    assert client_ip(_request("6.6.6.6, 203.0.113.7, 10.0.0.9")) == "203.0.113.7"
+
+
+def test_short_header_falls_back_to_its_first_entry(behind_proxies):
+    behind_proxies(3)
+    assert client_ip(_request("203.0.113.7, 10.0.0.9")) == "203.0.113.7"
+    assert client_ip(_request(" , ")) == "10.0.0.2"
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+from itertools import islice
+
+import pytest
+
+from app.utils.recurrence import OccurrenceChange, RecurrenceRule, expand_occurrences
+
+# A Monday
+MONDAY = datetime(2026, 1, 5, 9, 0)
+
+
+def _starts(rule, dtstart, after=None, limit=10):
+    return list(islice(RecurrenceRule.parse(rule).iter_starts(dtstart, after=after), limit))
+
+
+def test_parse_round_trip_and_rejections():
+    rule = RecurrenceRule.parse("RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=FR,MO;UNTIL=20260301T000000Z")
+    assert str(rule) == "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,FR;UNTIL=20260301T000000Z"
+    for value in ("FREQ=YEARLY", "FREQ=DAILY;BYDAY=MO", "FREQ=DAILY;COUNT=2;UNTIL=20260101", "FREQ=MONTHLY;BYMONTHDAY=0"):
+        with pytest.raises(ValueError):
+            RecurrenceRule.parse(value)
+
+
+def test_weekly_by_day():
+    assert _starts("FREQ=WEEKLY;BYDAY=MO,WE,FR", MONDAY, limit=5) == [
+        MONDAY, MONDAY + timedelta(days=2), MONDAY + timedelta(days=4),
+        MONDAY + timedelta(days=7), MONDAY + timedelta(days=9),
+    ]
+    # Days of the first week before dtstart are not occurrences
+    wednesday = MONDAY + timedelta(days=2)
+    assert _starts("FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE", wednesday, limit=3) == [
+        wednesday, MONDAY + timedelta(days=14), MONDAY + timedelta(days=16),
+    ]
+
+
+def test_monthly_last_day_and_short_months():
+    last = datetime(2026, 1, 31, 9, 0)
+    assert _starts("FREQ=MONTHLY;BYMONTHDAY=-1", last, limit=4) == [
+        last, datetime(2026, 2, 28, 9, 0), datetime(2026, 3, 31, 9, 0), datetime(2026, 4, 30, 9, 0),
+    ]
+    # The 31st is skipped in months without one
+    assert _starts("FREQ=MONTHLY;BYMONTHDAY=31", last, limit=3) == [
+        last, datetime(2026, 3, 31, 9, 0), datetime(2026, 5, 31, 9, 0),
+    ]
+
+
+def test_count_and_until_end_the_series():
+    assert _starts("FREQ=DAILY;COUNT=3", MONDAY) == [MONDAY + timedelta(days=day) for day in range(3)]
+    # A date-only UNTIL includes that whole day
+    assert _starts("FREQ=DAILY;UNTIL=20260107", MONDAY) == [MONDAY + timedelta(days=day) for day in range(3)]
+
+    rule = RecurrenceRule.parse("FREQ=WEEKLY;BYDAY=MO,TH;COUNT=3")
+    assert rule.last_end(MONDAY, timedelta(hours=1)) == MONDAY + timedelta(days=7, hours=1)
+    # COUNT is counted from dtstart, even when starts before `after` are not yielded
+    assert list(rule.iter_starts(MONDAY, after=MONDAY + timedelta(days=1))) == [
+        MONDAY + timedelta(days=3), MONDAY + timedelta(days=7),
+    ]
+    assert RecurrenceRule.parse("FREQ=DAILY").last_end(MONDAY, timedelta(hours=1)) is None
+
+
+def test_far_windows_skip_to_their_period(monkeypatch):
+    periods = []
+    original = RecurrenceRule._period
+
+    def recording(self, dtstart, index):
+        periods.append(index)
+        return original(self, dtstart, index)
+
+    monkeypatch.setattr(RecurrenceRule, "_period", recording)
+    after = datetime(2030, 6, 1)
+    for rule, expected in (
+        ("FREQ=DAILY;INTERVAL=3", datetime(2030, 6, 1, 9, 0)),
+        ("FREQ=WEEKLY;BYDAY=TU", datetime(2030, 6, 4, 9, 0)),
+        ("FREQ=MONTHLY;INTERVAL=5;BYMONTHDAY=-1", datetime(2030, 8, 31, 9, 0)),
+    ):
+        periods.clear()
+        assert _starts(rule, MONDAY, after=after, limit=1) == [expected]
+        assert min(periods) > 0 and len(periods) <= 3
+
+
+def test_exceptions_moved_into_and_out_of_the_window():
+    rule = RecurrenceRule.parse("FREQ=WEEKLY")
+    week = timedelta(days=7)
+    window_start, window_end = MONDAY + 2 * week, MONDAY + 3 * week
+    changes = {
+        # From outside the window into it, with a new length and title
+        MONDAY + 4 * week: OccurrenceChange(starts_at=window_start + timedelta(days=3), duration=30, title="Moved in"),
+        # The window's own occurrence, moved out of it
+        MONDAY + 2 * week: OccurrenceChange(starts_at=MONDAY + 5 * week),
+        # Not an occurrence of the rule (a Tuesday): ignored
+        MONDAY + 4 * week + timedelta(days=1): OccurrenceChange(starts_at=window_start + timedelta(days=1)),
+    }
+    moved_in = window_start + timedelta(days=3)
+    assert expand_occurrences(MONDAY, 60, rule, window_start, window_end, changes) == [
+        (MONDAY + 4 * week, moved_in, moved_in + timedelta(minutes=30), "Moved in"),
+    ]
+
+    cancelled = {MONDAY + week: OccurrenceChange(cancelled=True)}
+    assert [item[0] for item in expand_occurrences(MONDAY, 60, rule, MONDAY, window_end, cancelled)] == [
+        MONDAY, MONDAY + 2 * week,
+    ]
+
+
+def test_occurrence_running_into_the_window_is_included():
+    rule = RecurrenceRule.parse("FREQ=DAILY")
+    window_start = MONDAY + timedelta(days=1, minutes=30)
+    found = expand_occurrences(MONDAY, 60, rule, window_start, window_start + timedelta(hours=1))
+    assert found == [(MONDAY + timedelta(days=1), MONDAY + timedelta(days=1), MONDAY + timedelta(days=1, hours=1), None)]
@@ -0,0 +1,169 @@
+import asyncio
+
+import pytest
+
+from app.core import token_revocation, token_sessions
+from app.core.security import decode_access_token
+from app.core.token_revocation import REVOKED_KEY, RevocationList
+from app.core.token_sessions import RefreshTokenError, RefreshTokenReuseError, TokenSessionStore
+
+
+class FakeRedis:
+    """The commands the session store and revocation list use, in memory (no expiry)."""
+
+    def __init__(self):
+        self.hashes, self.sets, self.zsets = {}, {}, {}
+        self.published = []
+        self.fail = False
+
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    async def srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(members)
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, ()))
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.hashes.pop(key, None)
+            self.sets.pop(key, None)
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zmscore(self, key, members):
+        if self.fail:
+            raise ConnectionError("Redis is down")
+        return [self.zsets.get(key, {}).get(member) for member in members]
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def register_script(self, script):
+        assert script == token_sessions._ROTATE_LUA
+        return self._rotate
+
+    async def _rotate(self, keys, args):
+        # Same steps as _ROTATE_LUA
+        state = self.hashes.get(keys[0])
+        if state is None:
+            return ["missing", ""]
+        if state["current"] != args[0]:
+            del self.hashes[keys[0]]
+            return ["reuse", state["user"]]
+        state["current"] = args[1]
+        return ["ok", state["user"]]
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append(getattr(self.redis, name)(*args, **kwargs))
+
+    async def execute(self):
+        return [await call for call in self.calls]
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(token_sessions, "redis_client", redis)
+    monkeypatch.setattr(token_revocation, "redis_client", redis)
+    return redis
+
+
+@pytest.fixture
+def revocations(monkeypatch, redis):
+    revocations = RevocationList(capacity=1000)
+    monkeypatch.setattr(token_sessions, "revocation_list", revocations)
+    return revocations
+
+
+@pytest.fixture
+def store(redis, revocations):
+    return TokenSessionStore(refresh_minutes=60, access_minutes=15)
+
+
+def test_rotation_replaces_the_refresh_token(store, revocations):
+    async def run():
+        first = await store.issue("u1")
+        second = await store.rotate(first.refresh_token)
+        third = await store.rotate(second.refresh_token)
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first.family == second.family == third.family
+    assert len({first.refresh_token, second.refresh_token, third.refresh_token}) == 3
+    claims = decode_access_token(third.access_token)
+    assert (claims["sub"], claims["fam"]) == ("u1", first.family)
+    assert not asyncio.run(revocations.is_revoked(claims))
+
+
+def test_reuse_revokes_the_family_and_its_access_tokens(store, revocations):
+    async def run():
+        first = await store.issue("u1")
+        second = await store.rotate(first.refresh_token)
+        with pytest.raises(RefreshTokenReuseError):
+            await store.rotate(first.refresh_token)
+        # The legitimate holder is signed out too
+        with pytest.raises(RefreshTokenError):
+            await store.rotate(second.refresh_token)
+        return [await revocations.is_revoked(decode_access_token(pair.access_token)) for pair in (first, second)]
+
+    assert asyncio.run(run()) == [True, True]
+
+
+def test_revoke_user_ends_every_session(store, revocations, redis):
+    async def run():
+        sessions = [await store.issue("u1"), await store.issue("u1")]
+        other = await store.issue("u2")
+        assert await store.revoke_user("u1") == 2
+        for pair in sessions:
+            with pytest.raises(RefreshTokenError):
+                await store.rotate(pair.refresh_token)
+        await store.rotate(other.refresh_token)
+        return [await revocations.is_revoked(decode_access_token(pair.access_token)) for pair in sessions + [other]]
+
+    assert asyncio.run(run()) == [True, True, False]
+    assert store._user_key("u1") not in redis.sets
+
+
+def test_bloom_false_positives_are_confirmed_in_redis(revocations, redis):
+    # Every lookup is a Bloom hit, as if the filter were saturated
+    revocations._bloom._bits = bytearray(b"\xff" * len(revocations._bloom._bits))
+    claims = {"sub": "u1", "jti": "not-revoked"}
+
+    assert not asyncio.run(revocations.is_revoked(claims))
+    assert revocations.confirmations == 1
+    redis.fail = True
+    assert asyncio.run(revocations.is_revoked(claims))
+
+
+def test_revoked_entries_are_forgotten_after_their_time(revocations, redis):
+    asyncio.run(revocations.revoke("jti:old", 1.0))
+    assert redis.zsets[REVOKED_KEY] == {"jti:old": 1.0}
+    assert not asyncio.run(revocations.is_revoked({"jti": "old"}))
+    assert revocations.confirmations == 1
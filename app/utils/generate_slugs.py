@@ -1,26 +1,107 @@
+import re
+from typing import TYPE_CHECKING, Any, Optional
 from slugify import slugify
+from sqlalchemy import Integer, case, cast, func, or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.cruds.base import CRUDBase
+from sqlalchemy.future import select
+
+if TYPE_CHECKING:
+    from app.cruds.base import CRUDBase
+
+# MySQL ER_DUP_ENTRY
+DUPLICATE_ENTRY = 1062
+# Room kept for "-<n>" so every candidate shares the same truncated base
+SUFFIX_RESERVE = 8
+
+
+def _base_slug(value: str, max_length: int) -> str:
+    return slugify(value)[:max_length - SUFFIX_RESERVE].rstrip("-")
+
+
+def _with_suffix(base_slug: str, counter: int) -> str:
+    return f"{base_slug}-{counter}"
+
+
+def _is_slug_conflict(exc: IntegrityError, model: Any) -> bool:
+    """True for a duplicate on the slug unique index, not any other constraint."""
+    args = getattr(exc.orig, "args", ())
+    if not args or args[0] != DUPLICATE_ENTRY:
+        return False
+    message = str(args[-1])
+    return f"ix_{model.__tablename__}_slug" in message or message.endswith("'slug'")
+
+
+async def _max_slug_suffix(
+    db: AsyncSession, model: Any, base_slug: str, lock: bool = False
+) -> Optional[int]:
+    """
+    Highest numeric suffix taken for base_slug in one query: 0 when only
+    the bare slug exists, None when neither it nor "<base>-<n>" exists.
+    The LIKE prefix keeps the scan on the slug index; REGEXP drops
+    lookalikes such as "<base>-review". With lock, the read is a locking
+    one (FOR UPDATE), which sees rows committed after the transaction's
+    REPEATABLE READ snapshot.
+    """
+    escaped = base_slug.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    suffix = cast(func.substr(model.slug, len(base_slug) + 2), Integer)
+    query = select(func.max(case((model.slug == base_slug, 0), else_=suffix))).where(
+        or_(
+            model.slug == base_slug,
+            model.slug.like(f"{escaped}-%", escape="\\")
+            & model.slug.regexp_match(f"^{re.escape(base_slug)}-[0-9]+$"),
+        )
+    )
+    if lock:
+        query = query.with_for_update()
+    return (await db.execute(query)).scalar()
 
 
 async def generate_unique_slug(
     db: AsyncSession, 
-    crud: CRUDBase, 
+    crud: "CRUDBase", 
     value: str, 
     max_length: int = 255
 ) -> str:
-    base_slug = slugify(value)[:max_length]
-    slug = base_slug
-    counter = 1
+    base_slug = _base_slug(value, max_length)
+    highest = await _max_slug_suffix(db, crud.model, base_slug)
+    if highest is None:
+        return base_slug
+    return _with_suffix(base_slug, highest + 1)
 
-    # Keep incrementing counter until slug is unique
-    while await crud.get(db=db, slug=slug) is not None:
-        suffix = f"-{counter}"
-        # Ensure the slug does not exceed max_length
-        slug = f"{base_slug[:max_length - len(suffix)]}{suffix}"
-        counter += 1
 
-    return slug
+async def save_with_unique_slug(
+    db: AsyncSession,
+    crud: "CRUDBase",
+    db_obj: Any,
+    value: str,
+    max_length: int = 255,
+    attempts: int = 5,
+) -> Any:
+    """
+    Assign a unique slug and flush db_obj. Two writers can pick the same
+    slug concurrently; the loser hits the unique index, its savepoint is
+    rolled back and it retries past both the slug it lost and whatever a
+    locking read now reports (a plain read would return the same stale
+    snapshot). Other integrity errors propagate. The caller commits.
+    """
+    base_slug = _base_slug(value, max_length)
+    tried: Optional[int] = None
+    for attempt in range(attempts):
+        highest = await _max_slug_suffix(db, crud.model, base_slug, lock=attempt > 0)
+        if tried is not None:
+            highest = tried if highest is None else max(highest, tried)
+        db_obj.slug = base_slug if highest is None else _with_suffix(base_slug, highest + 1)
+        try:
+            async with db.begin_nested():
+                db.add(db_obj)
+                await db.flush()
+            return db_obj
+        except IntegrityError as exc:
+            if not _is_slug_conflict(exc, crud.model):
+                raise
+            tried = 0 if highest is None else highest + 1
+    raise ValueError(f"Could not allocate a unique slug for {value!r}")
 
 
 """
@@ -29,4 +110,8 @@ Usage example in Automeet:
 from app.cruds.meetings import crud_meeting
 
 slug = await generate_unique_slug(db, crud_meeting, "Team Sync Meeting")
+
+# Race-free insert (retries on unique violations):
+meeting = await save_with_unique_slug(db, crud_meeting, Meeting(...), "Team Sync Meeting")
+await db.commit()
 """
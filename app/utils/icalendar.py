@@ -0,0 +1,101 @@
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+
+PRODID = "-//Automeet//Calendar Feed//EN"
+
+
+def escape_text(value: str) -> str:
+    """TEXT value escaping (RFC 5545 3.3.11)."""
+    return (
+        (value or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def format_utc(value: datetime) -> str:
+    """Naive UTC datetime -> 20260105T090000Z."""
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def fold(line: str) -> str:
+    """Fold a content line at 75 octets without splitting UTF-8 sequences, CRLF-terminated."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts: List[str] = []
+    start, limit = 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1  # do not cut inside a multi-byte character
+        parts.append(encoded[start:end].decode("utf-8"))
+        start, limit = end, 74  # continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def calendar_header(name: str) -> str:
+    return "".join(fold(line) for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+    ))
+
+
+def calendar_footer() -> str:
+    return fold("END:VCALENDAR")
+
+
+def vevent(
+    uid: str,
+    starts_at: datetime,
+    ends_at: datetime,
+    summary: str,
+    stamp: datetime,
+    description: Optional[str] = None,
+    location: Optional[str] = None,
+    organizer: Optional[str] = None,
+    attendees: Iterable[str] = (),
+    rrule: Optional[str] = None,
+    recurrence_id: Optional[datetime] = None,
+    cancelled: bool = False,
+    sequence: int = 0,
+) -> str:
+    """
+    One VEVENT. A recurring series carries its RRULE; an exception to one
+    occurrence repeats the series UID with RECURRENCE-ID (and STATUS
+    CANCELLED for a removed occurrence).
+    """
+    lines: List[Tuple[str, str]] = [
+        ("UID", uid),
+        ("DTSTAMP", format_utc(stamp)),
+        ("DTSTART", format_utc(starts_at)),
+        ("DTEND", format_utc(ends_at)),
+        ("SUMMARY", escape_text(summary)),
+        ("SEQUENCE", str(sequence)),
+    ]
+    if recurrence_id is not None:
+        lines.append(("RECURRENCE-ID", format_utc(recurrence_id)))
+    if rrule:
+        lines.append(("RRULE", rrule))
+    if description:
+        lines.append(("DESCRIPTION", escape_text(description)))
+    if location:
+        lines.append(("LOCATION", escape_text(location)))
+    if organizer:
+        lines.append(("ORGANIZER", f"mailto:{organizer}"))
+    for attendee in attendees:
+        lines.append(("ATTENDEE;ROLE=REQ-PARTICIPANT", f"mailto:{attendee}"))
+    lines.append(("STATUS", "CANCELLED" if cancelled else "CONFIRMED"))
+    return (
+        fold("BEGIN:VEVENT")
+        + "".join(fold(f"{name}:{value}") for name, value in lines)
+        + fold("END:VEVENT")
+    )
@@ -0,0 +1,86 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+Interval = Tuple[datetime, datetime, Any]
+
+
+class IntervalIndex:
+    """
+    In-memory index of [start, end) intervals for one user.
+
+    Intervals are kept sorted by start together with the longest length
+    seen. Every interval overlapping [start, end) therefore starts in
+    (start - longest, end), found by bisection, so a query costs
+    O(log n + candidates) instead of a scan of all n intervals.
+    """
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        self._items: List[Interval] = sorted(intervals, key=lambda item: (item[0], item[1]))
+        self._starts: List[datetime] = [item[0] for item in self._items]
+        self._longest = max((end - start for start, end, _ in self._items), default=timedelta(0))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, start: datetime, end: datetime, key: Any = None) -> None:
+        position = bisect_right(self._starts, start)
+        self._starts.insert(position, start)
+        self._items.insert(position, (start, end, key))
+        self._longest = max(self._longest, end - start)
+
+    def overlapping(self, start: datetime, end: datetime) -> List[Interval]:
+        low = bisect_right(self._starts, start - self._longest)
+        high = bisect_left(self._starts, end)
+        return [item for item in self._items[low:high] if item[1] > start]
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        low = bisect_right(self._starts, start - self._longest)
+        high = bisect_left(self._starts, end)
+        return not any(item[1] > start for item in self._items[low:high])
+
+
+class ScheduleIndex:
+    """
+    Interval indexes for many users, for bulk scheduling: load everyone's
+    busy time once, then check and book candidate slots in memory.
+    """
+
+    def __init__(self):
+        self._users: Dict[str, IntervalIndex] = defaultdict(IntervalIndex)
+
+    def load(self, rows: Iterable[Tuple[str, datetime, datetime, Any]]) -> "ScheduleIndex":
+        grouped: Dict[str, List[Interval]] = defaultdict(list)
+        for user_uuid, start, end, key in rows:
+            grouped[user_uuid].append((start, end, key))
+        for user_uuid, intervals in grouped.items():
+            self._users[user_uuid] = IntervalIndex(intervals)
+        return self
+
+    def conflicts(
+        self, user_uuids: Iterable[str], start: datetime, end: datetime
+    ) -> Dict[str, List[Interval]]:
+        found = {}
+        for user_uuid in user_uuids:
+            index = self._users.get(user_uuid)
+            overlapping = index.overlapping(start, end) if index is not None else []
+            if overlapping:
+                found[user_uuid] = overlapping
+        return found
+
+    def book(self, user_uuids: Iterable[str], start: datetime, end: datetime, key: Any = None) -> None:
+        for user_uuid in user_uuids:
+            self._users[user_uuid].add(start, end, key)
+
+    def try_book(
+        self, user_uuids: Iterable[str], start: datetime, end: datetime, key: Any = None
+    ) -> Optional[Dict[str, List[Interval]]]:
+        """Book the slot for everyone if nobody is busy; otherwise return the conflicts."""
+        user_uuids = list(user_uuids)
+        conflicts = self.conflicts(user_uuids, start, end)
+        if conflicts:
+            return conflicts
+        self.book(user_uuids, start, end, key)
+        return None
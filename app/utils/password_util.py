@@ -1,5 +1,13 @@
+import asyncio
+import hashlib
 import secrets
+import time
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
 from passlib.context import CryptContext
+from app.core.config import settings
 
 pwd_context = CryptContext(
     schemes=["bcrypt"],
@@ -19,3 +27,240 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def generate_secret_key(length: int = 32) -> str:
     return secrets.token_urlsafe(length)
+
+
+# Async hashing
+# bcrypt releases the GIL, so a small dedicated thread pool gives real
+# parallelism without blocking the event loop.
+class HashPoolMetrics:
+    """Queue-time (call -> worker start) and run-time stats for the hash pool."""
+
+    def __init__(self, window: int = 1024):
+        self.calls = 0
+        self.in_flight = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+        self._queue_times: deque = deque(maxlen=window)
+        self._run_times: deque = deque(maxlen=window)
+
+    def observe(self, queue_time: float, run_time: float) -> None:
+        self.calls += 1
+        self.queue_time_total += queue_time
+        self.queue_time_max = max(self.queue_time_max, queue_time)
+        self._queue_times.append(queue_time)
+        self._run_times.append(run_time)
+
+    @staticmethod
+    def _percentile(samples: deque, percentile: float) -> float:
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percentile))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "queue_time_avg_ms": (self.queue_time_total / self.calls * 1000) if self.calls else 0.0,
+            "queue_time_p99_ms": self._percentile(self._queue_times, 0.99) * 1000,
+            "queue_time_max_ms": self.queue_time_max * 1000,
+            "run_time_p50_ms": self._percentile(self._run_times, 0.50) * 1000,
+        }
+
+
+hash_metrics = HashPoolMetrics()
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+# One semaphore per event loop: a semaphore is bound to the loop that first
+# waits on it, and tests or commands may run several loops in turn
+_hash_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_hash_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots = _hash_slots.get(loop)
+    if slots is None:
+        slots = _hash_slots[loop] = asyncio.Semaphore(settings.PASSWORD_HASH_MAX_PENDING)
+    return slots
+
+
+async def _run_in_hash_pool(fn: Callable[..., Any], *args: Any) -> Any:
+    # Callers beyond the cap wait here on the loop, not as queued threads
+    submitted = time.perf_counter()
+    async with _get_hash_slots():
+        hash_metrics.in_flight += 1
+
+        def job():
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                hash_metrics.observe(started - submitted, time.perf_counter() - started)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(_hash_executor, job)
+        finally:
+            hash_metrics.in_flight -= 1
+
+
+async def ahash_password(password: str) -> str:
+    if not password or len(password) < 8:
+        raise ValueError("Password must be at least 8 characters long")
+
+    return await _run_in_hash_pool(pwd_context.hash, password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool(pwd_context.verify, plain_password, hashed_password)
+
+
+# Cost calibration
+# Estimated duration of one hash at the configured cost (seconds)
+_hash_duration: float = 0.25
+
+
+def calibrate_bcrypt_rounds(
+    target_ms: float, min_rounds: int = 10, max_rounds: int = 16
+) -> Tuple[int, float]:
+    """
+    Pick the highest bcrypt cost whose hashing time on this CPU fits
+    target_ms. Each extra round doubles the work, so one timed hash at
+    min_rounds is enough to extrapolate. Returns (rounds, seconds).
+    """
+    handler = pwd_context.handler("bcrypt").using(rounds=min_rounds)
+    sample = secrets.token_urlsafe(16)
+    started = time.perf_counter()
+    handler.hash(sample)
+    elapsed = time.perf_counter() - started
+
+    rounds = min_rounds
+    while rounds < max_rounds and elapsed * 2 * 1000 <= target_ms:
+        rounds += 1
+        elapsed *= 2
+    return rounds, elapsed
+
+
+def configure_password_hashing() -> int:
+    """
+    Apply PASSWORD_HASH_ROUNDS, or calibrate against PASSWORD_HASH_TARGET_MS
+    when it is 0. Hashes below the chosen cost are then reported by
+    needs_update() and upgraded on the next successful login.
+    """
+    global _hash_duration
+    rounds = settings.PASSWORD_HASH_ROUNDS
+    if rounds:
+        handler = pwd_context.handler("bcrypt").using(rounds=rounds)
+        started = time.perf_counter()
+        handler.hash(secrets.token_urlsafe(16))
+        _hash_duration = time.perf_counter() - started
+    else:
+        rounds, _hash_duration = calibrate_bcrypt_rounds(
+            settings.PASSWORD_HASH_TARGET_MS,
+            min_rounds=settings.PASSWORD_HASH_MIN_ROUNDS,
+        )
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+    return rounds
+
+
+async def aconfigure_password_hashing() -> int:
+    """Run configure_password_hashing in the hash pool (for app startup)."""
+    return await _run_in_hash_pool(configure_password_hashing)
+
+
+# Transparent rehash
+_rehash_tasks: Set[asyncio.Task] = set()
+
+
+async def _rehash(plain_password: str, persist: Callable[[str], Awaitable[Any]]) -> None:
+    try:
+        new_hash = await _run_in_hash_pool(pwd_context.hash, plain_password)
+        await persist(new_hash)
+    except Exception:
+        # The old hash keeps working; try again on the next login
+        pass
+
+
+async def averify_password_and_rehash(
+    plain_password: str,
+    hashed_password: str,
+    persist: Callable[[str], Awaitable[Any]],
+) -> bool:
+    """
+    Verify a password; when it matches a hash created with an outdated
+    cost or scheme, re-hash and persist it in a background task so the
+    login response is not delayed.
+    """
+    if not await averify_password(plain_password, hashed_password):
+        return False
+
+    if pwd_context.needs_update(hashed_password):
+        task = asyncio.create_task(_rehash(plain_password, persist))
+        _rehash_tasks.add(task)
+        task.add_done_callback(_rehash_tasks.discard)
+    return True
+
+
+# Unknown-user pre-check
+class UnknownUserCache:
+    """
+    Bounded TTL set of login identifiers with no matching user.
+    Repeat attempts skip bcrypt but still wait for one hash duration, so
+    response timing does not reveal whether an account exists.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl: float = 600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+
+    @staticmethod
+    def _key(identifier: str) -> str:
+        return hashlib.sha256(identifier.strip().lower().encode("utf-8")).hexdigest()
+
+    def __contains__(self, identifier: str) -> bool:
+        key = self._key(identifier)
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return False
+        return True
+
+    def add(self, identifier: str) -> None:
+        key = self._key(identifier)
+        self._entries[key] = time.monotonic() + self.ttl
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, identifier: str) -> None:
+        self._entries.pop(self._key(identifier), None)
+
+
+unknown_user_cache = UnknownUserCache(
+    max_size=settings.PASSWORD_UNKNOWN_USER_CACHE_SIZE,
+    ttl=settings.PASSWORD_UNKNOWN_USER_CACHE_TTL,
+)
+_dummy_hash: Optional[str] = None
+
+
+async def averify_unknown_user(identifier: str) -> bool:
+    """
+    Burn (or, when cached, imitate) one verification for a login whose
+    user does not exist. Always returns False.
+    """
+    global _dummy_hash
+    if settings.PASSWORD_UNKNOWN_USER_CACHE_SIZE and identifier in unknown_user_cache:
+        await asyncio.sleep(_hash_duration)
+        return False
+
+    if _dummy_hash is None:
+        _dummy_hash = await _run_in_hash_pool(pwd_context.hash, secrets.token_urlsafe(16))
+    await averify_password(secrets.token_urlsafe(16), _dummy_hash)
+    if settings.PASSWORD_UNKNOWN_USER_CACHE_SIZE:
+        unknown_user_cache.add(identifier)
+    return False
@@ -0,0 +1,232 @@
+import calendar
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY")
+MAX_COUNT = 10_000
+# A rule whose periods stay empty this long never matches (e.g. BYMONTHDAY=31 every 12 months from February)
+_MAX_EMPTY_PERIODS = 120
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """
+    The subset of RFC 5545 RRULE supported for meetings:
+    FREQ=DAILY|WEEKLY|MONTHLY, INTERVAL, BYDAY (weekly, plain weekdays),
+    BYMONTHDAY (monthly, 1..31 or -31..-1), COUNT and UNTIL. Weeks start
+    on Monday. Times are naive UTC, like Meeting.starts_at.
+    """
+
+    freq: str
+    interval: int = 1
+    by_day: Tuple[int, ...] = ()
+    by_month_day: Tuple[int, ...] = ()
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+
+    @classmethod
+    def parse(cls, value: str) -> "RecurrenceRule":
+        parts: Dict[str, str] = {}
+        for part in value.strip().removeprefix("RRULE:").split(";"):
+            if not part:
+                continue
+            key, sep, item = part.partition("=")
+            if not sep or not item:
+                raise ValueError(f"Malformed recurrence rule part '{part}'")
+            parts[key.strip().upper()] = item.strip().upper()
+
+        unsupported = set(parts) - {"FREQ", "INTERVAL", "BYDAY", "BYMONTHDAY", "COUNT", "UNTIL", "WKST"}
+        if unsupported:
+            raise ValueError(f"Unsupported recurrence rule parts: {', '.join(sorted(unsupported))}")
+        freq = parts.get("FREQ")
+        if freq not in FREQUENCIES:
+            raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+        if parts.get("WKST", "MO") != "MO":
+            raise ValueError("Only WKST=MO is supported")
+
+        interval = int(parts.get("INTERVAL", "1"))
+        if interval < 1:
+            raise ValueError("INTERVAL must be positive")
+
+        by_day: Tuple[int, ...] = ()
+        if "BYDAY" in parts:
+            if freq != "WEEKLY":
+                raise ValueError("BYDAY is only supported with FREQ=WEEKLY")
+            try:
+                by_day = tuple(sorted({WEEKDAYS.index(day) for day in parts["BYDAY"].split(",")}))
+            except ValueError:
+                raise ValueError("BYDAY takes plain weekdays, e.g. MO,WE,FR")
+
+        by_month_day: Tuple[int, ...] = ()
+        if "BYMONTHDAY" in parts:
+            if freq != "MONTHLY":
+                raise ValueError("BYMONTHDAY is only supported with FREQ=MONTHLY")
+            by_month_day = tuple(sorted({int(day) for day in parts["BYMONTHDAY"].split(",")}))
+            if any(day == 0 or not -31 <= day <= 31 for day in by_month_day):
+                raise ValueError("BYMONTHDAY days must be in 1..31 or -31..-1")
+
+        count = int(parts["COUNT"]) if "COUNT" in parts else None
+        if count is not None and not 1 <= count <= MAX_COUNT:
+            raise ValueError(f"COUNT must be between 1 and {MAX_COUNT}")
+        until = _parse_until(parts["UNTIL"]) if "UNTIL" in parts else None
+        if count is not None and until is not None:
+            raise ValueError("COUNT and UNTIL cannot be combined")
+        return cls(freq, interval, by_day, by_month_day, count, until)
+
+    def __str__(self) -> str:
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.by_day:
+            parts.append("BYDAY=" + ",".join(WEEKDAYS[day] for day in self.by_day))
+        if self.by_month_day:
+            parts.append("BYMONTHDAY=" + ",".join(str(day) for day in self.by_month_day))
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until:%Y%m%dT%H%M%SZ}")
+        return ";".join(parts)
+
+    # Expansion
+    def _first_period(self, dtstart: datetime, after: datetime) -> int:
+        """A period index at or before the one containing `after`."""
+        if after <= dtstart:
+            return 0
+        if self.freq == "DAILY":
+            return max(0, (after - dtstart).days // self.interval - 1)
+        if self.freq == "WEEKLY":
+            return max(0, (after - dtstart).days // (7 * self.interval) - 1)
+        months = (after.year - dtstart.year) * 12 + after.month - dtstart.month
+        return max(0, months // self.interval - 1)
+
+    def _period(self, dtstart: datetime, index: int) -> List[datetime]:
+        """Candidate starts of period `index` (before filtering by dtstart)."""
+        if self.freq == "DAILY":
+            return [dtstart + timedelta(days=index * self.interval)]
+        if self.freq == "WEEKLY":
+            week = dtstart - timedelta(days=dtstart.weekday()) + timedelta(weeks=index * self.interval)
+            return [week + timedelta(days=day) for day in (self.by_day or (dtstart.weekday(),))]
+        month_index = dtstart.month - 1 + index * self.interval
+        year, month = dtstart.year + month_index // 12, month_index % 12 + 1
+        length = calendar.monthrange(year, month)[1]
+        days = []
+        for day in self.by_month_day or (dtstart.day,):
+            day = day if day > 0 else length + day + 1
+            if 1 <= day <= length:
+                days.append(day)
+        return [dtstart.replace(year=year, month=month, day=day) for day in sorted(set(days))]
+
+    def iter_starts(self, dtstart: datetime, after: Optional[datetime] = None) -> Iterator[datetime]:
+        """
+        Occurrence starts in order, lazily; starts before `after` are not
+        yielded. Without COUNT the generator jumps straight to the period
+        containing `after` instead of walking from dtstart.
+        """
+        index = self._first_period(dtstart, after) if after is not None and self.count is None else 0
+        produced = empty = 0
+        while True:
+            starts = [start for start in self._period(dtstart, index) if start >= dtstart]
+            empty = 0 if starts else empty + 1
+            if empty > _MAX_EMPTY_PERIODS:
+                return
+            for start in starts:
+                if self.until is not None and start > self.until:
+                    return
+                produced += 1
+                if after is None or start >= after:
+                    yield start
+                if self.count is not None and produced >= self.count:
+                    return
+            index += 1
+
+    def last_end(self, dtstart: datetime, duration: timedelta) -> Optional[datetime]:
+        """Upper bound on the end of the last occurrence; None if the series never ends."""
+        if self.until is not None:
+            return self.until + duration
+        if self.count is not None:
+            last = dtstart
+            for last in self.iter_starts(dtstart):
+                pass
+            return last + duration
+        return None
+
+
+def _parse_until(value: str) -> datetime:
+    for pattern in ("%Y%m%dT%H%M%SZ", "%Y%m%dT%H%M%S", "%Y%m%d"):
+        try:
+            parsed = datetime.strptime(value, pattern)
+        except ValueError:
+            continue
+        # A date-only UNTIL includes that whole day
+        return parsed + timedelta(days=1, microseconds=-1) if pattern == "%Y%m%d" else parsed
+    raise ValueError(f"Invalid UNTIL value '{value}'")
+
+
+@dataclass(frozen=True)
+class OccurrenceChange:
+    """An exception to one occurrence (RECURRENCE-ID): cancelled, moved or retitled."""
+
+    cancelled: bool = False
+    starts_at: Optional[datetime] = None
+    duration: Optional[int] = None
+    title: Optional[str] = None
+
+
+ExpandedOccurrence = Tuple[datetime, datetime, datetime, Optional[str]]
+
+
+def expand_occurrences(
+    dtstart: datetime,
+    duration_minutes: int,
+    rule: RecurrenceRule,
+    start: datetime,
+    end: datetime,
+    changes: Optional[Mapping[datetime, OccurrenceChange]] = None,
+) -> List[ExpandedOccurrence]:
+    """
+    (original start, start, end, title override) of the occurrences
+    overlapping [start, end), with exceptions applied, sorted by start.
+    Only the requested window is generated; moved occurrences are taken
+    from `changes`, so an occurrence moved into the window from outside it
+    is included and one moved out of it is not.
+    """
+    changes = changes or {}
+    duration = timedelta(minutes=duration_minutes)
+    found: List[ExpandedOccurrence] = []
+    seen = set()
+    for original in rule.iter_starts(dtstart, after=start - duration):
+        if original >= end:
+            break
+        seen.add(original)
+        change = changes.get(original)
+        if change is None:
+            if original + duration > start:
+                found.append((original, original, original + duration, None))
+            continue
+        occurrence = _changed(original, duration, change)
+        if occurrence is not None and occurrence[1] < end and occurrence[2] > start:
+            found.append(occurrence)
+
+    for original, change in changes.items():
+        if original in seen or change.cancelled or change.starts_at is None:
+            continue
+        occurrence = _changed(original, duration, change)
+        if occurrence[1] < end and occurrence[2] > start and _is_occurrence(rule, dtstart, original):
+            found.append(occurrence)
+    found.sort(key=lambda item: item[1])
+    return found
+
+
+def _changed(original: datetime, duration: timedelta, change: OccurrenceChange) -> Optional[ExpandedOccurrence]:
+    if change.cancelled:
+        return None
+    starts_at = change.starts_at or original
+    length = timedelta(minutes=change.duration) if change.duration else duration
+    return original, starts_at, starts_at + length, change.title
+
+
+def _is_occurrence(rule: RecurrenceRule, dtstart: datetime, original: datetime) -> bool:
+    return next(rule.iter_starts(dtstart, after=original), None) == original
@@ -0,0 +1,163 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+BusyInterval = Tuple[str, datetime, datetime]
+
+
+@dataclass(frozen=True)
+class SlotPreferences:
+    """
+    Hard limits (working days / hours) and soft preferences used to rank
+    free windows. Hours are local to utc_offset_minutes.
+    """
+
+    working_days: Tuple[int, ...] = (0, 1, 2, 3, 4)  # Monday = 0
+    working_hours: Tuple[int, int] = (9, 17)
+    preferred_hours: Tuple[int, int] = (10, 16)
+    utc_offset_minutes: int = 0
+    # Score weights
+    optional_weight: float = 2.0
+    preferred_weight: float = 0.5
+    earliness_weight: float = 1.0
+
+
+@dataclass(frozen=True)
+class SlotSuggestion:
+    start: datetime
+    end: datetime
+    score: float
+    optional_available: int = 0
+
+
+@dataclass
+class SlotGrid:
+    """
+    Time grid over [start, end) with one cell per `granularity` minutes.
+    Busy intervals are rasterised with a difference array (one
+    np.add.at per boundary set), so cost is linear in intervals + cells.
+    """
+
+    start: datetime
+    end: datetime
+    granularity: int = 15
+    cells: int = field(init=False)
+
+    def __post_init__(self):
+        self.cells = max(0, int((self.end - self.start) / timedelta(minutes=self.granularity)))
+
+    def _bounds(self, intervals: Sequence[Tuple[datetime, datetime]]) -> Tuple[np.ndarray, np.ndarray]:
+        if not intervals:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        step = self.granularity * 60
+        origin = self.start
+        starts = np.fromiter(((s - origin).total_seconds() for s, _ in intervals), dtype=np.float64, count=len(intervals))
+        ends = np.fromiter(((e - origin).total_seconds() for _, e in intervals), dtype=np.float64, count=len(intervals))
+        # A cell is busy if any part of it is busy
+        first = np.clip(np.floor(starts / step), 0, self.cells).astype(np.int64)
+        last = np.clip(np.ceil(ends / step), 0, self.cells).astype(np.int64)
+        return first, last
+
+    def busy_count(self, intervals: Sequence[Tuple[datetime, datetime]]) -> np.ndarray:
+        """Number of intervals covering each cell."""
+        first, last = self._bounds(intervals)
+        diff = np.zeros(self.cells + 1, dtype=np.int32)
+        np.add.at(diff, first, 1)
+        np.add.at(diff, last, -1)
+        return np.cumsum(diff[:-1])
+
+    def person_grid(self, busy: Iterable[BusyInterval], people: Sequence[str]) -> np.ndarray:
+        """Boolean (people x cells) grid: person p is busy in cell c."""
+        rows = {person: index for index, person in enumerate(people)}
+        per_person: dict = {}
+        for user_uuid, start, end in busy:
+            if user_uuid in rows:
+                per_person.setdefault(user_uuid, []).append((start, end))
+        grid = np.zeros((len(people), self.cells), dtype=bool)
+        for person, intervals in per_person.items():
+            grid[rows[person]] = self.busy_count(intervals) > 0
+        return grid
+
+    def allowed(self, preferences: SlotPreferences) -> Tuple[np.ndarray, np.ndarray]:
+        """(working-time mask, preferred-hours mask) in local time."""
+        offsets = np.arange(self.cells, dtype=np.int64) * self.granularity
+        local_start = self.start + timedelta(minutes=preferences.utc_offset_minutes)
+        minutes = (local_start.hour * 60 + local_start.minute + offsets) % (24 * 60)
+        days = (local_start.weekday() + (local_start.hour * 60 + local_start.minute + offsets) // (24 * 60)) % 7
+        hour_start, hour_end = preferences.working_hours
+        working = np.isin(days, preferences.working_days) & (minutes >= hour_start * 60) & (minutes < hour_end * 60)
+        preferred_start, preferred_end = preferences.preferred_hours
+        preferred = (minutes >= preferred_start * 60) & (minutes < preferred_end * 60)
+        return working, preferred
+
+
+def find_free_slots(
+    busy: Iterable[BusyInterval],
+    required: Sequence[str],
+    start: datetime,
+    end: datetime,
+    duration_minutes: int,
+    optional: Sequence[str] = (),
+    granularity: int = 15,
+    preferences: Optional[SlotPreferences] = None,
+    limit: int = 10,
+) -> List[SlotSuggestion]:
+    """
+    Windows of `duration_minutes` in [start, end) where every required
+    person is free, inside working time, ranked by optional attendees
+    available, preferred hours and earliness. Suggestions do not overlap.
+    """
+    preferences = preferences or SlotPreferences()
+    grid = SlotGrid(start, end, granularity)
+    length = -(-duration_minutes // granularity)
+    if grid.cells < length:
+        return []
+
+    busy = list(busy)
+    required_set = set(required)
+    blocked = grid.busy_count([(s, e) for user, s, e in busy if user in required_set]) > 0
+    working, preferred = grid.allowed(preferences)
+    usable = (~blocked & working).astype(np.int32)
+
+    # Window i is valid when all `length` cells from i are usable
+    totals = np.concatenate(([0], np.cumsum(usable)))
+    window_ok = (totals[length:] - totals[:-length]) == length
+    candidates = np.flatnonzero(window_ok)
+    if candidates.size == 0:
+        return []
+
+    scores = preferences.earliness_weight * (1.0 - candidates / max(grid.cells, 1))
+    scores = scores + preferences.preferred_weight * preferred[candidates]
+    optional_free = np.zeros(candidates.size, dtype=np.int32)
+    if optional:
+        # An optional attendee counts only if free for the whole window
+        grid_optional = grid.person_grid(busy, list(optional))
+        busy_totals = np.concatenate(
+            (np.zeros((len(optional), 1), dtype=np.int32), np.cumsum(grid_optional, axis=1, dtype=np.int32)),
+            axis=1,
+        )
+        busy_in_window = (busy_totals[:, candidates + length] - busy_totals[:, candidates]) > 0
+        optional_free = len(optional) - busy_in_window.sum(axis=0, dtype=np.int32)
+        scores = scores + preferences.optional_weight * optional_free / len(optional)
+
+    chosen: List[SlotSuggestion] = []
+    taken = np.zeros(grid.cells, dtype=bool)
+    for index in np.argsort(-scores, kind="stable"):
+        cell = int(candidates[index])
+        if taken[cell:cell + length].any():
+            continue
+        taken[cell:cell + length] = True
+        slot_start = start + timedelta(minutes=cell * granularity)
+        chosen.append(SlotSuggestion(
+            start=slot_start,
+            end=slot_start + timedelta(minutes=duration_minutes),
+            score=round(float(scores[index]), 4),
+            optional_available=int(optional_free[index]),
+        ))
+        if len(chosen) >= limit:
+            break
+    return chosen